@@ -0,0 +1,175 @@
+"""
+Timing and peak-memory benchmarks of reading, converting and printing synthetic DMN files.
+
+For every scenario a DMN file is generated (see benchmarks.generator) and the following stages are measured:
+read_tables, the convert of every converter (including consuming the lazily generated lines) and print_idp of the
+converted lines. Times are the best of several repeats, peak memory is measured in a separate run with tracemalloc.
+Results are written as JSON and can be compared with the results of an earlier run, returning a non-zero exit code
+when a stage became slower than the given factor. Run from the repository root:
+    python -m benchmarks.bench_converters -o results.json
+    python -m benchmarks.bench_converters -o new.json --compare results.json --factor 1.5
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generator import write_dmn
+from dmnconverter.learning.tablelearner import TableLearner
+from dmnconverter.read.XML import read_tables
+from dmnconverter.tools.fragments import materialize
+from dmnconverter.tools.print import print_idp
+from dmnconverter.transform.implicative import ImplicativeConverter
+from dmnconverter.transform.inductive import InductiveConverter
+from dmnconverter.transform.meta import MetaConverter
+from dmnconverter.verify.coverage import Coverage
+from dmnconverter.verify.unique_policy import VerifyUniquePolicy
+from dmnconverter.verify.verification import Verification
+
+ONTOLOGY = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}'
+
+CONVERTERS = {'inductive': InductiveConverter,
+              'implicative': ImplicativeConverter,
+              'meta': MetaConverter,
+              'coverage': Coverage,
+              'verify': Verification,
+              'unique': VerifyUniquePolicy,
+              'learn': TableLearner}
+
+# arguments of generator.generate_dmn by scenario name
+SCENARIOS = {'small': dict(amount_rules=50, amount_inputs=3),
+             'rules': dict(amount_rules=5000, amount_inputs=4),
+             'wide': dict(amount_rules=500, amount_inputs=30),
+             'strings': dict(amount_rules=2000, amount_inputs=5, type_mix={'string': 1}, amount_values=50),
+             'integers': dict(amount_rules=2000, amount_inputs=5, type_mix={'integer': 1},
+                              entry_kinds={'comparison': 1, 'range': 1, 'list': 1, 'any': 1}),
+             'outputs': dict(amount_rules=1000, amount_inputs=4, amount_outputs=3, hit_policy='FIRST'),
+             'network': dict(amount_rules=50, amount_inputs=4, amount_decisions=200, hit_policy='MIXED')}
+
+
+def timed(function, repeat: int) -> float:
+    """Returns the best time of running a function in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def peak_memory(function) -> int:
+    """Returns the peak of memory allocated while running a function in bytes"""
+    tracemalloc.start()
+    try:
+        function()
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(function, repeat: int) -> dict:
+    """
+Measures a stage, storing the error instead of failing when a converter does not support the generated tables
+    :param function: stage without arguments
+    :param repeat: amount of timed runs
+    :return: dictionary with seconds and peak_bytes, or with error
+    """
+    try:
+        return {'seconds': timed(function, repeat), 'peak_bytes': peak_memory(function)}
+    except Exception as error:
+        return {'error': type(error).__name__ + ': ' + str(error)}
+
+
+def run_scenario(file_name: str, idp_name: str, converters: [str], repeat: int) -> dict:
+    """
+Measures all stages on one DMN file
+    :param file_name: DMN file
+    :param idp_name: scratch file for print_idp
+    :param converters: keys of CONVERTERS
+    :param repeat: amount of timed runs per stage
+    :return: dictionary of results by stage
+    """
+    results = {'read_tables': measure(lambda: read_tables(file_name, ONTOLOGY), repeat)}
+    tables = read_tables(file_name, ONTOLOGY)
+    for name in converters:
+        converter = CONVERTERS[name]()
+        results['convert_' + name] = measure(
+            lambda: [materialize(section) for section in converter.convert(tables)], repeat)
+        if 'error' in results['convert_' + name]:
+            continue
+        sections = [materialize(section) for section in converter.convert(tables)]
+        results['print_idp_' + name] = measure(lambda: print_idp(idp_name, *sections), repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, factor: float) -> [str]:
+    """
+Lists the stages that became slower than factor times their time in the baseline
+    :param results: output of main
+    :param baseline: output of an earlier run
+    :param factor:
+    :return: list of descriptions of regressions
+    """
+    regressions = []
+    for (scenario, stages) in results['scenarios'].items():
+        for (stage, result) in stages['stages'].items():
+            try:
+                before = baseline['scenarios'][scenario]['stages'][stage]['seconds']
+            except KeyError:
+                continue
+            if 'seconds' in result and result['seconds'] > factor * before:
+                regressions.append(scenario + ' ' + stage + ': ' + '{:.4f}s'.format(result['seconds']) +
+                                   ' against ' + '{:.4f}s'.format(before))
+    return regressions
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark reading, converting and printing synthetic DMN files.')
+    parser.add_argument('-o', '--output', default='-', help='JSON file of the results, - for stdout')
+    parser.add_argument('-s', '--scenarios', default=','.join(SCENARIOS),
+                        help='comma separated scenarios, from ' + ', '.join(SCENARIOS))
+    parser.add_argument('-c', '--converters', default=','.join(CONVERTERS),
+                        help='comma separated converters, from ' + ', '.join(CONVERTERS))
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='amount of timed runs per stage')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', default=None, help='JSON file of an earlier run to compare with')
+    parser.add_argument('--factor', type=float, default=1.25, help='slowdown counted as regression')
+    arguments = parser.parse_args(argv)
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'seed': arguments.seed,
+               'repeat': arguments.repeat, 'scenarios': dict()}
+    converters = arguments.converters.split(',')
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario in arguments.scenarios.split(','):
+            parameters = dict(SCENARIOS[scenario], seed=arguments.seed)
+            file_name = os.path.join(directory, scenario + '.dmn')
+            write_dmn(file_name, **parameters)
+            stages = run_scenario(file_name, os.path.join(directory, scenario + '.idp'), converters, arguments.repeat)
+            results['scenarios'][scenario] = {'parameters': parameters, 'dmn_bytes': os.path.getsize(file_name),
+                                              'stages': stages}
+            print(scenario + ' done', file=sys.stderr)
+
+    if arguments.output == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), arguments.factor)
+        for regression in regressions:
+            print('Regression ' + regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the rule-entry parsing done in read.XML.read_rules.
+
+Compares the former per-entry regex approach with the compiled and cached parser of read.unary on a synthetic table,
+reporting parsed cells per second. Run from the repository root:
+    python -m benchmarks.bench_entry_parser [amount_rules]
+"""
+import random
+import re
+import sys
+import time
+import xml.etree.ElementTree as ElemTree
+
+from dmnconverter.read.unary import parse_entry
+from dmnconverter.tools.texttools import clean_text
+
+
+def legacy_structure_comparison(entry) -> (str, str):
+    """Entry parsing as it was done before read.unary existed, kept as reference point"""
+    cleaned = clean_text(entry)
+    if cleaned is None:
+        return cleaned
+    content_pattern = re.compile('[ \\w,]+')
+    content_match = re.search(content_pattern, cleaned)
+    content = content_match.group(0)
+    comparator = cleaned.replace(content, '')
+    if not comparator:
+        comparator = '='
+    elif comparator == '<=':
+        comparator = '=<'
+    content = content.strip('_')
+    content = content.title()
+    return comparator, content
+
+
+def synthetic_entries(amount_rules: int, amount_columns: int = 4, seed: int = 0) -> list:
+    """
+Builds the XML entries of a synthetic table, drawing every cell from a few hundred distinct entry texts
+    :param amount_rules:
+    :param amount_columns: entries per rule
+    :param seed:
+    :return: list of XML entry elements, each containing a single text element
+    """
+    rng = random.Random(seed)
+    texts = ['"Value ' + str(i) + '"' for i in range(100)]
+    texts += ['"Value ' + str(i) + '", "Value ' + str(i + 1) + '"' for i in range(50)]
+    texts += [comparator + ' ' + str(i) for comparator in ['<', '<=', '>', '>='] for i in range(25)]
+    texts += [str(i) for i in range(50)]
+    texts += [None]
+    entries = []
+    for _ in range(amount_rules * amount_columns):
+        entry = ElemTree.Element('inputEntry')
+        ElemTree.SubElement(entry, 'text').text = rng.choice(texts)
+        entries.append(entry)
+    return entries
+
+
+def cells_per_second(function, entries: list) -> float:
+    start = time.perf_counter()
+    for entry in entries:
+        function(entry)
+    return len(entries) / (time.perf_counter() - start)
+
+
+def main(amount_rules: int = 100000) -> None:
+    entries = synthetic_entries(amount_rules)
+    parse_entry.cache_clear()
+    before = cells_per_second(legacy_structure_comparison, entries)
+    after = cells_per_second(lambda entry: parse_entry(entry[0].text), entries)
+    print('rules: ' + str(amount_rules) + ', cells: ' + str(len(entries)))
+    print('before: {:,.0f} cells/s'.format(before))
+    print('after:  {:,.0f} cells/s ({:.1f}x)'.format(after, after / before))
+    print(parse_entry.cache_info())
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
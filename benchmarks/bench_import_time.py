@@ -0,0 +1,93 @@
+"""
+Import-time regression check, based on the output of python -X importtime.
+
+Every module is imported in a fresh interpreter, several times to leave out the compilation of bytecode. The check
+fails when a module pulls in a module it should not need at import time, or when its cumulative import time exceeds
+the optional budget. Results are written as JSON. Run from the repository root:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time -o import_times.json --budget-ms 20
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# modules that must not be imported as a side effect of importing a module, by module
+FORBIDDEN = {'dmnconverter.converter': ['boltons', 'numpy', 'tracemalloc', 'xml.etree', 'dmnconverter.read',
+                                        'dmnconverter.transform', 'dmnconverter.verify', 'dmnconverter.learning',
+                                        'dmnconverter.evaluate'],
+             'dmnconverter.cli': ['boltons', 'numpy', 'dmnconverter.transform', 'dmnconverter.verify',
+                                  'dmnconverter.learning', 'dmnconverter.evaluate'],
+             'dmnconverter.read.XML': ['boltons', 'numpy', 'dmnconverter.transform', 'dmnconverter.verify'],
+             'dmnconverter.transform.inductive': ['boltons', 'numpy', 'xml.etree', 'dmnconverter.verify'],
+             'dmnconverter.transform.meta': ['boltons', 'numpy', 'xml.etree', 'dmnconverter.verify'],
+             'dmnconverter.tools.dedupe': ['boltons']}
+
+
+def import_times(module: str) -> dict:
+    """
+Imports a module in a new interpreter
+    :param module: name of the module
+    :return: dictionary of every imported module and its cumulative import time in microseconds
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            times[parts[2].strip()] = int(parts[1])
+        except ValueError:
+            # header line
+            continue
+    return times
+
+
+def check_module(module: str, forbidden: [str], repeat: int, budget_ms: float = None) -> dict:
+    """
+Measures the import of a module and checks it against the forbidden modules and the budget
+    :param module:
+    :param forbidden: names of modules or packages
+    :param repeat: amount of imports, the fastest one is kept
+    :param budget_ms: maximal cumulative import time in milliseconds, not checked if None
+    :return: dictionary with the import time, the amount of imported modules and the violations
+    """
+    runs = [import_times(module) for _ in range(repeat)]
+    fastest = min(runs, key=lambda times: times.get(module, 0))
+    milliseconds = fastest.get(module, 0) / 1000
+    violations = sorted(name for name in fastest
+                        if any(name == prefix or name.startswith(prefix + '.') for prefix in forbidden))
+    violations = ['imports ' + name for name in violations]
+    if budget_ms is not None and milliseconds > budget_ms:
+        violations.append('takes {:.1f}ms, budget is {:.1f}ms'.format(milliseconds, budget_ms))
+    return {'milliseconds': milliseconds, 'amount_modules': len(fastest), 'violations': violations}
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Check the import time of the dmnconverter modules.')
+    parser.add_argument('-o', '--output', default=None, help='JSON file of the results, - for stdout')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='amount of imports per module')
+    parser.add_argument('--budget-ms', type=float, default=None, help='maximal import time of every module')
+    arguments = parser.parse_args(argv)
+
+    results = {module: check_module(module, forbidden, arguments.repeat, arguments.budget_ms)
+               for module, forbidden in FORBIDDEN.items()}
+    for module, result in results.items():
+        print('{:<40} {:8.1f}ms {:4d} modules'.format(module, result['milliseconds'], result['amount_modules']),
+              file=sys.stderr)
+        for violation in result['violations']:
+            print('    ' + violation, file=sys.stderr)
+
+    if arguments.output == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+    return 1 if any(result['violations'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Memory report of the rule storage of a DecisionTable.
+
+Compares the former nested lists of (comparator, value) tuples, one fresh tuple and string per cell, with the columnar
+and interned DecisionTable. Sizes are measured with tracemalloc. Run from the repository root:
+    python -m benchmarks.bench_table_memory [amount_rules] [amount_columns]
+"""
+import random
+import sys
+import tracemalloc
+
+from dmnconverter.tools.decisiontable import DecisionTable, SymbolTable
+
+
+def synthetic_rules(amount_rules: int, amount_columns: int, seed: int = 0):
+    """
+Yields rules as the reader used to produce them: every cell is a new tuple holding new strings
+    :param amount_rules:
+    :param amount_columns:
+    :param seed:
+    """
+    rng = random.Random(seed)
+    comparators = ['=', '=', '=', '<', '=<', '>', '>=']
+    for _ in range(amount_rules):
+        rule = []
+        for _ in range(amount_columns):
+            if rng.random() < 0.2:
+                rule.append(None)
+            else:
+                value = ''.join(['Value_', str(rng.randrange(300))])
+                rule.append((''.join([rng.choice(comparators)]), value))
+        yield rule
+
+
+def measured(build) -> (object, int):
+    """Returns the built object and the amount of memory still allocated by building it"""
+    tracemalloc.start()
+    result = build()
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main(amount_rules: int = 100000, amount_columns: int = 10) -> None:
+    cells = amount_rules * amount_columns
+    labels = {'Input_' + str(i): ('string', '') for i in range(amount_columns)}
+
+    (nested, nested_size) = measured(lambda: list(synthetic_rules(amount_rules, amount_columns)))
+    del nested
+    (table, table_size) = measured(
+        lambda: DecisionTable('', 'Synthetic', 'unique', labels, dict(),
+                              synthetic_rules(amount_rules, amount_columns), [], SymbolTable()))
+
+    print('cells: {:,}'.format(cells))
+    print('nested lists: {:>12,} bytes ({:.1f} bytes/cell)'.format(nested_size, nested_size / cells))
+    print('DecisionTable: {:>11,} bytes ({:.1f} bytes/cell)'.format(table_size, table_size / cells))
+    print('symbols: ' + str(len(table.symbols)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
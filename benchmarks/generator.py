@@ -0,0 +1,168 @@
+"""
+Seeded generator of synthetic DMN files, in the XML format of the Camunda Modeler.
+
+Every decision gets its own input and output labels and every string column its own values, so decisions of one file
+never conflict. Comparators and ranges are only generated for integer columns, string and boolean columns get single
+values, lists and don't-cares.
+Run from the repository root to write a file:
+    python -m benchmarks.generator out.dmn --rules 1000 --inputs 5 --decisions 3 --seed 1
+"""
+import argparse
+import random
+from xml.sax.saxutils import escape
+
+DMN_NAMESPACE = 'http://www.omg.org/spec/DMN/20151101/dmn.xsd'
+TYPES = ('string', 'boolean', 'integer')
+ENTRY_KINDS = ('equal', 'comparison', 'range', 'list', 'any')
+HIT_POLICIES = ('UNIQUE', 'FIRST', 'PRIORITY')
+
+
+def generate_dmn(amount_rules: int = 100, amount_inputs: int = 3, amount_outputs: int = 1,
+                 amount_decisions: int = 1, type_mix: dict = None, entry_kinds: dict = None,
+                 hit_policy: str = 'UNIQUE', amount_values: int = 10, integer_stop: int = 100, seed: int = 0) -> str:
+    """
+Builds the XML of a synthetic DMN file
+    :param amount_rules: rules per decision
+    :param amount_inputs: input columns per decision
+    :param amount_outputs: output columns per decision
+    :param amount_decisions: decisions in the file
+    :param type_mix: relative weights of the input types, by type, e.g. {'string': 2, 'integer': 1}. Equal if None.
+    :param entry_kinds: relative weights of the kinds of input entries, by kind of ENTRY_KINDS. Equal if None.
+    Kinds that do not apply to the type of a column are left out for that column.
+    :param hit_policy: one of HIT_POLICIES, or 'MIXED' to draw the policy of every decision
+    :param amount_values: amount of values of string inputs and outputs
+    :param integer_stop: integers are drawn from 0 up to, but not including, this value
+    :param seed: seed of the random generator, equal arguments give equal files
+    :return: XML as string
+    """
+    rng = random.Random(seed)
+    type_mix = {type_ref: 1 for type_ref in TYPES} if type_mix is None else type_mix
+    entry_kinds = {kind: 1 for kind in ENTRY_KINDS} if entry_kinds is None else entry_kinds
+    for key in type_mix:
+        if key not in TYPES:
+            raise ValueError('Type ' + str(key) + ' not recognized, choose from ' + ', '.join(TYPES))
+    for key in entry_kinds:
+        if key not in ENTRY_KINDS:
+            raise ValueError('Entry kind ' + str(key) + ' not recognized, choose from ' + ', '.join(ENTRY_KINDS))
+    if hit_policy not in HIT_POLICIES + ('MIXED',):
+        raise ValueError('Hit policy ' + str(hit_policy) + ' not recognized')
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<definitions xmlns="' + DMN_NAMESPACE + '" id="definitions" name="definitions" '
+             'namespace="http://camunda.org/schema/1.0/dmn">']
+    for decision_nr in range(amount_decisions):
+        policy = rng.choice(HIT_POLICIES) if hit_policy == 'MIXED' else hit_policy
+        input_types = rng.choices(list(type_mix), list(type_mix.values()), k=amount_inputs)
+        lines.extend(__decision(rng, decision_nr, policy, input_types, amount_outputs, amount_rules, entry_kinds,
+                                amount_values, integer_stop))
+    lines.append('</definitions>')
+    return '\n'.join(lines) + '\n'
+
+
+def write_dmn(file_name: str, **kwargs) -> None:
+    """
+Writes a synthetic DMN file
+    :param file_name:
+    :param kwargs: arguments of generate_dmn
+    """
+    with open(file_name, 'w') as dmn_file:
+        dmn_file.write(generate_dmn(**kwargs))
+
+
+def __decision(rng: random.Random, decision_nr: int, hit_policy: str, input_types: [str], amount_outputs: int,
+               amount_rules: int, entry_kinds: dict, amount_values: int, integer_stop: int) -> [str]:
+    name = 'D' + str(decision_nr)
+    lines = ['  <decision id="decision' + str(decision_nr) + '" name="' + name + '">',
+             '    <decisionTable id="decisionTable' + str(decision_nr) + '" hitPolicy="' + hit_policy + '">']
+    for (input_nr, type_ref) in enumerate(input_types):
+        label = name + ' Input ' + str(input_nr)
+        lines.append('      <input id="' + name + '_input' + str(input_nr) + '" label="' + label + '">')
+        lines.append('        <inputExpression id="' + name + '_inputExpression' + str(input_nr) + '" typeRef="' +
+                     type_ref + '"><text>' + label.replace(' ', '') + '</text></inputExpression>')
+        if type_ref == 'string':
+            lines.append('        <inputValues><text>' + __string_values(label, amount_values) +
+                         '</text></inputValues>')
+        lines.append('      </input>')
+    # outputs are strings, except for the last one when there are several
+    output_types = ['string'] * amount_outputs
+    if amount_outputs > 1:
+        output_types[-1] = 'integer'
+    for (output_nr, type_ref) in enumerate(output_types):
+        label = name + ' Output ' + str(output_nr)
+        lines.append('      <output id="' + name + '_output' + str(output_nr) + '" label="' + label + '" name="' +
+                     label.replace(' ', '') + '" typeRef="' + type_ref + '">')
+        if type_ref == 'string':
+            lines.append('        <outputValues><text>' + __string_values(label, amount_values) +
+                         '</text></outputValues>')
+        lines.append('      </output>')
+
+    for rule_nr in range(amount_rules):
+        entries = ['<inputEntry><text>' + escape(__input_entry(rng, name + ' Input ' + str(input_nr), type_ref,
+                                                               entry_kinds, amount_values, integer_stop)) +
+                   '</text></inputEntry>' for (input_nr, type_ref) in enumerate(input_types)]
+        entries += ['<outputEntry><text>' + escape(__output_entry(rng, name + ' Output ' + str(output_nr), type_ref,
+                                                                  amount_values, integer_stop)) +
+                    '</text></outputEntry>' for (output_nr, type_ref) in enumerate(output_types)]
+        lines.append('      <rule id="' + name + '_rule' + str(rule_nr) + '">' + ''.join(entries) + '</rule>')
+    lines.extend(['    </decisionTable>', '  </decision>'])
+    return lines
+
+
+def __string_values(label: str, amount_values: int) -> str:
+    return ','.join('"' + __string_value(label, value_nr) + '"' for value_nr in range(amount_values))
+
+
+def __string_value(label: str, value_nr: int) -> str:
+    return label + ' V' + str(value_nr)
+
+
+def __input_entry(rng: random.Random, label: str, type_ref: str, entry_kinds: dict, amount_values: int,
+                  integer_stop: int) -> str:
+    if type_ref == 'integer':
+        kinds = entry_kinds
+    else:
+        kinds = {kind: weight for (kind, weight) in entry_kinds.items() if kind in ['equal', 'list', 'any']}
+        if not kinds:
+            kinds = {'equal': 1}
+    kind = rng.choices(list(kinds), list(kinds.values()))[0]
+    if kind == 'any':
+        return ''
+    if type_ref == 'boolean':
+        return rng.choice(['true', 'false'])
+    if type_ref == 'string':
+        amount = rng.randint(2, 3) if kind == 'list' else 1
+        values = rng.sample(range(amount_values), min(amount, amount_values))
+        return ', '.join('"' + __string_value(label, value) + '"' for value in values)
+    if kind == 'comparison':
+        return rng.choice(['<', '<=', '>', '>=']) + ' ' + str(rng.randrange(integer_stop))
+    if kind == 'range':
+        (start, stop) = sorted(rng.sample(range(integer_stop), 2))
+        return rng.choice('[]') + str(start) + '..' + str(stop) + rng.choice('[]')
+    if kind == 'list':
+        return ', '.join(str(value) for value in sorted(rng.sample(range(integer_stop), 3)))
+    return str(rng.randrange(integer_stop))
+
+
+def __output_entry(rng: random.Random, label: str, type_ref: str, amount_values: int, integer_stop: int) -> str:
+    if type_ref == 'integer':
+        return str(rng.randrange(integer_stop))
+    return '"' + __string_value(label, rng.randrange(amount_values)) + '"'
+
+
+def main(argv: [str] = None) -> None:
+    parser = argparse.ArgumentParser(description='Write a synthetic DMN file.')
+    parser.add_argument('file_name')
+    parser.add_argument('--rules', type=int, default=100)
+    parser.add_argument('--inputs', type=int, default=3)
+    parser.add_argument('--outputs', type=int, default=1)
+    parser.add_argument('--decisions', type=int, default=1)
+    parser.add_argument('--hit-policy', default='UNIQUE', choices=HIT_POLICIES + ('MIXED',))
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args(argv)
+    write_dmn(arguments.file_name, amount_rules=arguments.rules, amount_inputs=arguments.inputs,
+              amount_outputs=arguments.outputs, amount_decisions=arguments.decisions,
+              hit_policy=arguments.hit_policy, seed=arguments.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import sys
+
+from dmnconverter.cli import main
+
+sys.exit(main())
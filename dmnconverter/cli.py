@@ -0,0 +1,177 @@
+"""
+Command line interface to convert many DMN files in parallel.
+
+Example, writing the meta representation and coverage check of every DMN file in a directory with 8 processes:
+    python -m dmnconverter models/ -o meta,coverage -d out/ -j 8 --summary summary.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+import warnings
+
+from dmnconverter.converter import DMNConverter
+from dmnconverter.tools.cache import ConversionCache
+
+# name of every output on the command line and the DMNConverter method creating it
+OUTPUTS = {'inductive': 'print_inductive',
+           'implicative': 'print_implicative',
+           'meta': 'print_meta',
+           'coverage': 'verify_coverage',
+           'verify': 'verify_all',
+           'unique': 'verify_unique',
+           'learn': 'learn_table'}
+
+
+def main(argv: [str] = None) -> int:
+    """
+Runs the command line interface
+    :param argv: command line arguments, sys.argv[1:] if not given
+    :return: exit code, 1 if any file failed
+    """
+    arguments = build_parser().parse_args(argv)
+    outputs = arguments.outputs.split(',')
+    unknown = [output for output in outputs if output not in OUTPUTS]
+    if unknown:
+        raise SystemExit('Unknown output(s) ' + ', '.join(unknown) + ', choose from ' + ', '.join(OUTPUTS))
+
+    found = find_files(arguments.paths)
+    if arguments.output_dir is not None:
+        os.makedirs(arguments.output_dir, exist_ok=True)
+    jobs = [(file_name, outputs, arguments.output_dir, arguments.stream, arguments.cache_dir, sub_directory)
+            for (file_name, sub_directory) in found]
+    # fail before converting anything, workers writing the same file would overwrite each other
+    written = dict()
+    for (file_name, sub_directory) in found:
+        for output in outputs:
+            idp_name = os.path.normpath(output_name(file_name, output, arguments.output_dir, sub_directory))
+            if idp_name in written:
+                raise SystemExit('Files ' + written[idp_name] + ' and ' + file_name + ' both write ' + idp_name)
+            written[idp_name] = file_name
+
+    start = time.perf_counter()
+    if arguments.workers == 1:
+        results = [convert_file(job) for job in jobs]
+    else:
+        # not needed for a single worker, and slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+            results = list(executor.map(convert_file, jobs, chunksize=arguments.chunksize))
+    failed = [result for result in results if result['error'] is not None]
+
+    summary = {'files': results,
+               'amount_files': len(results),
+               'amount_failed': len(failed),
+               'workers': arguments.workers or os.cpu_count(),
+               'seconds': time.perf_counter() - start}
+    if arguments.summary == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    elif arguments.summary is not None:
+        with open(arguments.summary, 'w') as summary_file:
+            json.dump(summary, summary_file, indent=2)
+    for result in failed:
+        print('Failed ' + result['file'] + ': ' + result['error'].splitlines()[-1], file=sys.stderr)
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='dmnconverter', description='Convert DMN files into IDP code.')
+    parser.add_argument('paths', nargs='+', help='DMN files, directories (searched recursively) or glob patterns')
+    parser.add_argument('-o', '--outputs', default='inductive',
+                        help='comma separated outputs, from ' + ', '.join(OUTPUTS) + ' (default: inductive)')
+    parser.add_argument('-d', '--output-dir', default=None,
+                        help='directory of the IDP files (default: next to every DMN file)')
+    parser.add_argument('-j', '--workers', type=positive_int, default=None,
+                        help='amount of worker processes (default: amount of cores, 1 runs without pool)')
+    parser.add_argument('--chunksize', type=positive_int, default=1, help='amount of files handed to a worker at once')
+    parser.add_argument('--summary', default=None, help='file to write the JSON summary to, - for stdout')
+    parser.add_argument('--stream', action='store_true', help='stream the tables from the files, see DMNConverter.read')
+    parser.add_argument('--cache-dir', default=None,
+                        help='directory of a conversion cache shared by the workers, unchanged files are not converted')
+    return parser
+
+
+def positive_int(text: str) -> int:
+    """argparse type of the amount of workers and the chunk size"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid int value: ' + repr(text))
+    if value < 1:
+        raise argparse.ArgumentTypeError('must be at least 1, got ' + text)
+    return value
+
+
+def find_files(paths: [str]) -> [(str, str)]:
+    """
+Expands files, directories and glob patterns into a sorted list of DMN files
+    :param paths:
+    :return: list of tuples of a file name and its directory relative to the searched directory, '' for files and glob
+    patterns. Without duplicate file names.
+    """
+    file_names = dict()
+    for path in paths:
+        if os.path.isdir(path):
+            for name in glob.glob(os.path.join(path, '**', '*.dmn'), recursive=True):
+                file_names.setdefault(name, os.path.dirname(os.path.relpath(name, path)))
+        elif os.path.isfile(path):
+            file_names.setdefault(path, '')
+        else:
+            for name in glob.glob(path, recursive=True):
+                if os.path.isfile(name):
+                    file_names.setdefault(name, '')
+    return sorted(file_names.items())
+
+
+def output_name(file_name: str, output: str, output_dir: str = None, sub_directory: str = '') -> str:
+    """
+Name of the IDP file of one output of a DMN file
+    :param file_name: DMN file
+    :param output: key of OUTPUTS
+    :param output_dir: directory of the IDP files, the directory of the DMN file if None
+    :param sub_directory: directory of the DMN file relative to the searched directory, kept under output_dir so equal
+    file names in different directories do not collide
+    :return: file name
+    """
+    (directory, base_name) = os.path.split(file_name)
+    stem = os.path.splitext(base_name)[0]
+    if output_dir is not None:
+        directory = os.path.join(output_dir, sub_directory)
+    return os.path.join(directory, stem + '_' + output + '.idp')
+
+
+def convert_file(job: tuple) -> dict:
+    """
+Reads one DMN file and creates all requested outputs. Runs in the worker processes.
+    :param job: tuple of file name, list of outputs, output directory, whether to stream the tables, cache directory
+    and the directory of the file relative to the searched directory
+    :return: dictionary with timings in seconds, cache use, warnings and the error (traceback) if the conversion failed
+    """
+    (file_name, outputs, output_dir, stream, cache_dir, sub_directory) = job
+    result = {'file': file_name, 'read_seconds': None, 'outputs': dict(), 'warnings': [], 'error': None}
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        try:
+            start = time.perf_counter()
+            cache = None if cache_dir is None else ConversionCache(cache_dir)
+            converter = DMNConverter(cache)
+            converter.read(file_name, stream)
+            result['read_seconds'] = time.perf_counter() - start
+            for output in outputs:
+                start = time.perf_counter()
+                idp_name = output_name(file_name, output, output_dir, sub_directory)
+                if output_dir is not None:
+                    os.makedirs(os.path.dirname(idp_name), exist_ok=True)
+                getattr(converter, OUTPUTS[output])(idp_name)
+                result['outputs'][output] = {'file': idp_name, 'seconds': time.perf_counter() - start}
+            if cache is not None:
+                result['cache'] = {'hits': cache.stats.hits, 'misses': cache.stats.misses,
+                                   'bytes_saved': cache.stats.bytes_saved}
+        except Exception:
+            result['error'] = traceback.format_exc()
+    result['warnings'] = [str(warning.message) for warning in caught]
+    return result
@@ -2,79 +2,306 @@
 Converter for DMN code into IDP logic
 
 Program turns a DMN table (XML table in essence) into a txt file with IDP code.
+
+The reader, converters and verifiers are only imported when they are first used, to keep the start of short-lived
+processes fast. The classes can also be imported from this module, which resolves them on access as well, e.g.
+    from dmnconverter.converter import MetaConverter
 """
+import importlib
+
+from dmnconverter.tools.instrument import NULL_INSTRUMENT
+
+# module of every class that is imported on first use
+LAZY_CLASSES = {'InductiveConverter': 'dmnconverter.transform.inductive',
+                'ImplicativeConverter': 'dmnconverter.transform.implicative',
+                'MetaConverter': 'dmnconverter.transform.meta',
+                'Coverage': 'dmnconverter.verify.coverage',
+                'Verification': 'dmnconverter.verify.verification',
+                'VerifyUniquePolicy': 'dmnconverter.verify.unique_policy',
+                'TableLearner': 'dmnconverter.learning.tablelearner',
+                'TableEvaluator': 'dmnconverter.evaluate.engine',
+                'ConversionCache': 'dmnconverter.tools.cache'}
+
+
+def lazy_class(name: str) -> type:
+    """
+Imports the module of a class of LAZY_CLASSES and returns the class
+    :param name: name of the class
+    """
+    return getattr(importlib.import_module(LAZY_CLASSES[name]), name)
 
-import dmnconverter.read.XML
-import dmnconverter.transform.implicative
-import dmnconverter.transform.inductive
-import dmnconverter.transform.meta
-import dmnconverter.verify.coverage
-import dmnconverter.verify.unique_policy
-import dmnconverter.verify.verification
-import dmnconverter.learning.tablelearner
+
+def __getattr__(name: str):
+    if name in LAZY_CLASSES:
+        return lazy_class(name)
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
 
 
 class DMNConverter:
     # define used ontology
     ont = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}'
 
-    def __init__(self):
-        return
+    def __init__(self, cache: "ConversionCache" = None, incremental: bool = False, instrument=None, ranges: dict = None,
+                 compress: bool = None, abstract: bool = None, encode: bool = None):
+        """
+        :param cache: optional ConversionCache. When given, files are only read when a conversion is not cached yet.
+        :param incremental: reuse the converters, which keep the fragments of every table, so printing again after
+        reading a changed network only converts the changed tables (see transform.general.GeneralConverter)
+        :param instrument: tools.instrument.Instrument measuring reading, converting and writing, stage by stage
+        :param ranges: dictionary of integer labels and (start, stop) tuples, replacing the bounds the meta
+        representations and verifications infer from the rules (see tools.ranges.IntegerRanges)
+        :param compress: whether the meta representations and verifications only use one value of every class of
+        equivalent integers, the default of every converter if None
+        :param abstract: whether the verifications rewrite integer entries over classes of equivalent values (see
+        tools.abstraction.IntegerAbstraction), the default of every verification if None
+        :param encode: whether the meta representations, verifications and learner write labels, string values and
+        table names as integer codes (see tools.symbols), the default of every converter if None
+        """
+        self.cache = cache
+        self.incremental = incremental
+        self.instrument = NULL_INSTRUMENT if instrument is None else instrument
+        self.ranges = ranges
+        self.compress = compress
+        self.abstract = abstract
+        self.encode = encode
+        self.converters = dict()
+        self.file_name = None
+        self.stream = False
+        self._dmn_tables = None
+        self.minimized = False
+        self.evaluators = dict()
 
-    def read(self, file_name):
+    def read(self, file_name, stream: bool = False):
         """
 Read DMN table, extract labels and rules and store in this object
         :param file_name:
+        :param stream: if True, the tables are not kept in memory but streamed from the file (one decision at a time)
+        every time a representation is printed
         """
         try:
-            self.dmn_tables = dmnconverter.read.XML.read_tables(file_name)
+            self.file_name = file_name
+            self.stream = stream
+            self._dmn_tables = None
+            self.minimized = False
+            self.evaluators = dict()
+            if self.cache is None:
+                # parse right away, so errors in the file show up here
+                self._dmn_tables = self.__read_tables()
             self.TableRead = True
 
         except Exception:
             raise
 
-    def print_inductive(self, file_name):
+    @property
+    def dmn_tables(self):
+        """Tables of the read file, parsed on first use when a cache is used"""
+        if self._dmn_tables is None and self.file_name is not None:
+            self._dmn_tables = self.__read_tables()
+        return self._dmn_tables
+
+    @dmn_tables.setter
+    def dmn_tables(self, dmn_tables):
+        self._dmn_tables = dmn_tables
+        self.evaluators = dict()
+
+    def print_inductive(self, file_name, goals: [str] = None):
         """
 Create file for direct inductive representation of DMN table
         :param file_name:
+        :param goals: names of decisions or output labels, only the tables needed for them are converted if given
         """
-        dmnconverter.transform.inductive.InductiveConverter().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('InductiveConverter'), file_name, goals)
 
-    def print_implicative(self, file_name):
+    def print_implicative(self, file_name, goals: [str] = None):
         """
 Create file for direct implicative representation of DMN table
         :param file_name:
+        :param goals: names of decisions or output labels, only the tables needed for them are converted if given
         """
-        dmnconverter.transform.implicative.ImplicativeConverter().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('ImplicativeConverter'), file_name, goals)
 
-    def print_meta(self, file_name):
+    def print_meta(self, file_name, goals: [str] = None):
         """
 Create file for meta representation of DMN table
         :param file_name:
+        :param goals: names of decisions or output labels, only the tables needed for them are converted if given
         """
-        dmnconverter.transform.meta.MetaConverter().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('MetaConverter'), file_name, goals)
 
     def verify_coverage(self, file_name):
         """
 Create file to check that DMN table fully covers input space
         :param file_name:
         """
-        dmnconverter.verify.coverage.Coverage().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('Coverage'), file_name)
 
     def verify_all(self, file_name):
         """
 Create file to check that DMN table fully covers input space and has no output conflicts
         :param file_name:
         """
-        dmnconverter.verify.verification.Verification().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('Verification'), file_name)
 
     def verify_unique(self, file_name):
         """
 Create file to check that DMN table fully covers input space without overlap (for Unique hit policy)
         :param file_name:
         """
-        dmnconverter.verify.unique_policy.VerifyUniquePolicy().print_file(file_name, self.dmn_tables)
+        self.__print(self.__converter('VerifyUniquePolicy'), file_name)
+
+    def verify_network(self, file_name, workers: int = None) -> "NetworkReport":
+        """
+Create a verification file for every DMN table, suited for its hit policy, in parallel worker processes
+        :param file_name: the table name is appended to its stem for every file, e.g. 'bbq.idp' gives 'bbq_Dish.idp'
+        :param workers: amount of worker processes, os.cpu_count() if None
+        :return: NetworkReport of all tables
+        """
+        import dmnconverter.verify.network
+        options = {'ranges': self.ranges, 'compress': self.compress, 'abstract': self.abstract, 'encode': self.encode}
+        with self.instrument.stage('verify_network') as stage:
+            report = dmnconverter.verify.network.verify_network(self.dmn_tables, file_name, workers, options)
+            stage.count('tables', len(report.results))
+        return report
+
+    def verify_partitioned(self, file_name, table_name: str = None, label: str = None, parts: int = 4,
+                           workers: int = None) -> ("PartitionPlan", "NetworkReport"):
+        """
+Split the verification of a large DMN table along one of its inputs, with one file per part, in parallel processes
+        :param file_name: the table name and the part are appended to its stem, e.g. 'bbq_Dish_Season_Fall.idp'
+        :param table_name: name of the table to verify, the first table if not given
+        :param label: input to split along, the input giving the smallest parts if not given
+        :param parts: amount of sub-ranges of an integer input, string and boolean inputs are split in all their values
+        :param workers: amount of worker processes, os.cpu_count() if None
+        :return: PartitionPlan, to map the rules in the models back to the table, and NetworkReport of the parts
+        """
+        import dmnconverter.verify.partition
+        tables = [table for table in self.dmn_tables if table_name in [None, table.table_name]]
+        if not tables:
+            raise ValueError('No table with name ' + str(table_name))
+        options = {'compress': self.compress, 'abstract': self.abstract, 'encode': self.encode}
+        with self.instrument.stage('verify_partitioned', tables[0].table_name) as stage:
+            plan = dmnconverter.verify.partition.split_table(tables[0], label, parts, self.ranges)
+            report = dmnconverter.verify.partition.write_partitions(plan, file_name, workers, options)
+            stage.count('parts', len(report.results))
+        return plan, report
+
+    def verify_sweep(self, bounds: dict = None) -> list:
+        """
+Find all gaps and overlapping rules of every DMN table in python, without generating IDP code
+        :param bounds: optional dictionary of integer input labels and (start, stop) tuples limiting their values, the
+        ranges of this converter if None
+        :return: list of SweepReport objects, one per table
+        """
+        import dmnconverter.verify.sweep
+        bounds = self.ranges if bounds is None else bounds
+        return [dmnconverter.verify.sweep.verify_table(table, bounds) for table in self.dmn_tables]
+
+    def learn_table(self, file_name, warm_start: "DecisionTable" = None):
+        """
+Create file to learn the rules of the first DMN table with IDP
+        :param file_name:
+        :param warm_start: DecisionTable whose rules are given to IDP as certainly true, e.g. the table of induce. IDP
+        then only extends it with rules, it does not search for a smaller table.
+        """
+        converter = self.__converter('TableLearner')
+        converter.warm_start = warm_start
+        self.__print(converter, file_name)
+
+    def induce(self, examples, table_name: str = None) -> ("DecisionTable", "InductionReport"):
+        """
+Learn the missing rules of a DMN table from examples in python (see learning.induction), without solver
+        :param examples: iterable of (inputs, outputs) tuples, dictionaries of labels and their values
+        :param table_name: name of the table with the labels and given rules, the first table if not given
+        :return: DecisionTable with the given and the learned rules, and InductionReport
+        """
+        import dmnconverter.learning.induction
+        tables = [table for table in self.dmn_tables if table_name in [None, table.table_name]]
+        if not tables:
+            raise ValueError('No table with name ' + str(table_name))
+        return self.instrument.call('induce', tables[0].table_name, dmnconverter.learning.induction.induce_table,
+                                    tables[0], examples)
+
+    def decision_graph(self) -> "DecisionGraph":
+        """
+Dependency graph of the decisions of the DMN file, see tools.graph.DecisionGraph
+        """
+        import dmnconverter.tools.graph
+        return dmnconverter.tools.graph.DecisionGraph(self.dmn_tables)
+
+    def minimize(self) -> list:
+        """
+Merge and drop redundant rules of every DMN table (see transform.minimize), the representations printed afterwards
+are built from the minimized tables
+        :return: list of MinimizeReport objects, one per table
+        """
+        import dmnconverter.transform.minimize
+        results = [self.instrument.call('minimize', table.table_name, dmnconverter.transform.minimize.minimize_table,
+                                        table) for table in self.dmn_tables]
+        self.dmn_tables = [table for (table, _) in results]
+        self.minimized = True
+        return [report for (_, report) in results]
+
+    def evaluate(self, inputs: dict, table_name: str = None) -> dict:
+        """
+Evaluate a DMN table directly in python, without solver
+        :param inputs: dictionary of input labels and their values
+        :param table_name: name of the table to evaluate, the first table if not given
+        :return: dictionary of output labels and values, None if no rule is triggered
+        """
+        if table_name not in self.evaluators:
+            tables = [table for table in self.dmn_tables if table_name in [None, table.table_name]]
+            if not tables:
+                raise ValueError('No table with name ' + str(table_name))
+            self.evaluators[table_name] = lazy_class('TableEvaluator')(tables[0])
+        return self.evaluators[table_name].evaluate(inputs)
 
-    def learn_table(self, file_name):
-        dmnconverter.learning.tablelearner.TableLearner().print_file(file_name, self.dmn_tables)
+    def __read_tables(self):
+        import dmnconverter.read.XML
+        if self.stream:
+            return dmnconverter.read.XML.TableStream(self.file_name, self.ont, self.instrument)
+        with self.instrument.stage('read') as stage:
+            dmn_tables = dmnconverter.read.XML.read_tables(self.file_name, self.ont, self.instrument)
+            stage.count('tables', len(dmn_tables))
+        return dmn_tables
 
+    def __converter(self, class_name: str):
+        """
+New converter, or the converter of a previous print in incremental mode
+        :param class_name: name of a subclass of GeneralConverter in LAZY_CLASSES
+        """
+        from dmnconverter.transform.meta_language import MetaLanguageConverter
+        from dmnconverter.verify.verification import Verification
+        converter_class = lazy_class(class_name)
+        options = {'incremental': self.incremental, 'instrument': self.instrument}
+        if issubclass(converter_class, MetaLanguageConverter):
+            options.update(ranges=self.ranges, compress=self.compress, encode=self.encode)
+        if issubclass(converter_class, Verification):
+            options.update(abstract=self.abstract)
+        if not self.incremental:
+            return converter_class(**options)
+        if converter_class not in self.converters:
+            self.converters[converter_class] = converter_class(**options)
+        return self.converters[converter_class]
+
+    def __print(self, converter, file_name, goals: [str] = None) -> None:
+        """
+Print the tables with the given converter, going through the cache if there is one
+        :param converter: GeneralConverter
+        :param file_name: output file
+        :param goals: see GeneralConverter.print_file
+        """
+        with self.instrument.stage(type(converter).__name__) as stage:
+            # open files, e.g. sys.stdout, are written directly
+            if self.cache is None or self.file_name is None or hasattr(file_name, 'write'):
+                converter.print_file(file_name, self.dmn_tables, goals)
+                return
+            with open(self.file_name, 'rb') as dmn_file:
+                token = converter.cache_token() + (' minimized' if self.minimized else '')
+                if goals is not None:
+                    token += ' goals ' + repr(sorted(goals))
+                key = self.cache.key(dmn_file.read(), token)
+            if self.cache.fetch(key, file_name):
+                stage.count('cache_hits')
+            else:
+                converter.print_file(file_name, self.dmn_tables, goals)
+                self.cache.store(key, file_name)
@@ -0,0 +1,244 @@
+"""
+Vectorized evaluation of a decision table over many assignments of its inputs at once.
+
+Every input column is a numpy array: string and boolean columns are dictionary-encoded to integer codes, so every rule
+entry becomes a vectorized comparison on integers. String columns with entries other than equalities (e.g. '< "M"')
+are compared as strings instead, as in evaluate.engine. The comparisons give a (rules x rows) match matrix that is
+reduced according to the hit policy of the table. Requires numpy, which is only imported when this module is used.
+"""
+import operator
+
+try:
+    import numpy
+except ImportError:  # numpy is an optional dependency, only needed for batch evaluation
+    numpy = None
+
+from dmnconverter.evaluate import engine
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+# vectorized comparison of a column with the value of a rule entry, by comparator
+_COMPARISONS = {'=': operator.eq, '<': operator.lt, '=<': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+class BatchResult:
+    """"
+Outcome of a batch evaluation
+    :param rule_index: for every row, the index of the selected rule, -1 if no rule is selected
+    :param conflicts: for every row, whether more than one rule is triggered in a table with unique hit policy
+    :param outputs: dictionary of output labels and masked arrays of their values, masked where no rule is selected or
+    the selected rule gives no value for the label
+    """
+
+    def __init__(self, rule_index, conflicts, outputs: dict):
+        self.rule_index = rule_index
+        self.conflicts = conflicts
+        self.outputs = outputs
+
+
+class BatchEvaluator:
+    """"
+Compiled version of a DecisionTable to evaluate columns of inputs with numpy
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    """
+
+    def __init__(self, dmn_table: DecisionTable):
+        if numpy is None:
+            raise ImportError('Batch evaluation requires numpy')
+        if dmn_table.hit_policy not in engine.HIT_POLICIES:
+            raise ValueError('Hit policy ' + dmn_table.hit_policy + ' not yet implemented or not recognized.')
+        self.table_name = dmn_table.table_name
+        self.hit_policy = dmn_table.hit_policy
+        self.input_labels = dmn_table.input_labels
+        self.input_types = [type_ref for (type_ref, _) in dmn_table.input_label_dict.values()]
+        # string and boolean columns that are compared as strings, as their entries are not all equalities
+        self.ordered = [type_ref != 'integer' and any(entry is not None and entry[0] != '='
+                                                      for entry in dmn_table.input_rule_comp.column(column))
+                        for (column, type_ref) in enumerate(self.input_types)]
+        self.encodings = [self.__build_encoding(dmn_table, column) for column in range(len(self.input_labels))]
+        self.rules = [[(column, self.__compile_entry(column, entry)) for column, entry in enumerate(rule)
+                       if entry is not None] for rule in dmn_table.input_rule_comp]
+        # rule indices from highest to lowest priority, ties in rule order
+        ranks = engine.priority_ranks(dmn_table)
+        self.priority_order = numpy.array(sorted(range(len(ranks)), key=ranks.__getitem__), dtype=numpy.intp)
+        (self.output_values, self.output_present) = self.__build_output_values(dmn_table)
+
+    def evaluate(self, columns, chunk_size: int = 65536, strict: bool = True) -> BatchResult:
+        """
+Evaluates the table for every row of the given input columns
+        :param columns: dictionary of input labels and array-likes of equal length, or a numpy structured array
+        :param chunk_size: amount of rows for which a match matrix is built at once, bounds the memory use
+        :param strict: if True, raise a ValueError when rules overlap in a table with unique hit policy. Otherwise
+        these rows are flagged in the conflicts of the result and get no output.
+        :return: BatchResult
+        """
+        encoded = self.encode_columns(columns)
+        amount_rows = len(encoded[0]) if encoded else 0
+        rule_index = numpy.empty(amount_rows, dtype=numpy.intp)
+        conflicts = numpy.zeros(amount_rows, dtype=bool)
+        for start in range(0, amount_rows, chunk_size):
+            chunk = [column[start:start + chunk_size] for column in encoded]
+            (rule_index[start:start + chunk_size], conflicts[start:start + chunk_size]) = self.reduce(
+                self.match_matrix(chunk))
+        if strict and conflicts.any():
+            row = int(numpy.argmax(conflicts))
+            raise ValueError('Rules overlap for row ' + str(row) + ' of table ' + self.table_name +
+                             ', while its hit policy is unique')
+        rule_index[conflicts] = -1
+
+        no_output = rule_index < 0
+        outputs = dict()
+        for (label, values) in self.output_values.items():
+            # the last entry of values is a filler for rows without selected rule, rules without an entry for the
+            # label have a filler as well
+            present = self.output_present[label]
+            outputs[label] = numpy.ma.array(values[rule_index], mask=~present[rule_index] | no_output)
+        return BatchResult(rule_index, conflicts, outputs)
+
+    def match_matrix(self, encoded_columns: list):
+        """
+Compares every rule with every row
+        :param encoded_columns: list of encoded input columns, as returned by encode_columns
+        :return: boolean array of shape (rules, rows), True where the rule is triggered by the row
+        """
+        amount_rows = len(encoded_columns[0]) if encoded_columns else 0
+        matches = numpy.ones((len(self.rules), amount_rows), dtype=bool)
+        for rule_nr, rule in enumerate(self.rules):
+            row = matches[rule_nr]
+            for (column, test) in rule:
+                row &= test(encoded_columns[column])
+        return matches
+
+    def reduce(self, matches) -> tuple:
+        """
+Applies the hit policy to a match matrix
+        :param matches: boolean array of shape (rules, rows)
+        :return: tuple of the selected rule index for every row (-1 if none) and the unique policy conflicts
+        """
+        triggered = matches.any(axis=0)
+        conflicts = numpy.zeros(matches.shape[1], dtype=bool)
+        if not len(matches):
+            return numpy.full(matches.shape[1], -1, dtype=numpy.intp), conflicts
+        if self.hit_policy == 'priority':
+            rule_index = self.priority_order[matches[self.priority_order].argmax(axis=0)]
+        else:
+            rule_index = matches.argmax(axis=0)
+            if self.hit_policy == 'unique':
+                conflicts = matches.sum(axis=0) > 1
+        rule_index[~triggered] = -1
+        return rule_index, conflicts
+
+    def encode_columns(self, columns) -> list:
+        """
+Turns the given input columns into numpy arrays: integers for integer inputs and dictionary codes otherwise
+        :param columns: dictionary of input labels and array-likes, or a numpy structured array
+        :return: list of arrays ordered as the input labels
+        """
+        names = columns.dtype.names if hasattr(columns, 'dtype') else columns.keys()
+        encoded = []
+        for (label, type_ref, encoding, ordered) in zip(self.input_labels, self.input_types, self.encodings,
+                                                        self.ordered):
+            if label in names:
+                column = columns[label]
+            elif label.replace('_', ' ') in names:
+                column = columns[label.replace('_', ' ')]
+            else:
+                raise ValueError('No values given for input ' + label + ' of table ' + self.table_name)
+            if type_ref == 'integer':
+                encoded.append(numpy.asarray(column, dtype=numpy.int64))
+            elif ordered:
+                # normalize every distinct value once
+                (distinct, inverse) = numpy.unique(numpy.asarray(column), return_inverse=True)
+                values = numpy.array([conditions.normalize_input(type_ref, value) for value in distinct.tolist()],
+                                     dtype=str)
+                encoded.append(values[inverse.reshape(-1)])
+            else:
+                # normalize every distinct value once, unknown values get code -1
+                (distinct, inverse) = numpy.unique(numpy.asarray(column), return_inverse=True)
+                codes = numpy.array([encoding.get(conditions.normalize_input(type_ref, value), -1)
+                                     for value in distinct.tolist()], dtype=numpy.int64)
+                encoded.append(codes[inverse.reshape(-1)])
+        return encoded
+
+    def __compile_entry(self, column: int, entry: (str, str)) -> 'function':
+        """Compiles one rule entry into a vectorized test on an encoded column"""
+        type_ref = self.input_types[column]
+        if type_ref == 'integer':
+            intervals = conditions.integer_intervals(entry)
+            return lambda values: self.__in_intervals(values, intervals)
+        if self.ordered[column]:
+            cases = conditions.entry_cases(entry)
+            return lambda values: self.__in_cases(values, cases)
+        encoding = self.encodings[column]
+        codes = numpy.array(sorted(encoding[value] for value in conditions.value_set(entry)), dtype=numpy.int64)
+        if len(codes) == 1:
+            code = codes[0]
+            return lambda values: values == code
+        return lambda values: numpy.isin(values, codes)
+
+    @staticmethod
+    def __in_intervals(values, intervals: [(int, int)]):
+        result = numpy.zeros(len(values), dtype=bool)
+        for (start, stop) in intervals:
+            in_interval = numpy.ones(len(values), dtype=bool)
+            if start is not None:
+                in_interval &= values >= start
+            if stop is not None:
+                in_interval &= values <= stop
+            result |= in_interval
+        return result
+
+    @staticmethod
+    def __in_cases(values, cases: [[(str, str)]]):
+        """Whether every string in values matches one of the cases of an entry, see tools.conditions.entry_cases"""
+        result = numpy.zeros(len(values), dtype=bool)
+        for case in cases:
+            in_case = numpy.ones(len(values), dtype=bool)
+            for (comparator, value) in case:
+                in_case &= _COMPARISONS[comparator](values, value)
+            result |= in_case
+        return result
+
+    def __build_encoding(self, dmn_table: DecisionTable, column: int) -> dict:
+        """Dictionary of codes for the values of a string or boolean input, from its domain and the rule entries"""
+        type_ref = self.input_types[column]
+        if type_ref == 'integer' or self.ordered[column]:
+            return dict()
+        values = conditions.domain_values(type_ref, dmn_table.input_label_dict[self.input_labels[column]][1])
+        for entry in dmn_table.input_rule_comp.column(column):
+            if entry is not None:
+                values.extend(sorted(conditions.value_set(entry)))
+        encoding = dict()
+        for value in values:
+            encoding.setdefault(value, len(encoding))
+        return encoding
+
+    @staticmethod
+    def __build_output_values(dmn_table: DecisionTable) -> (dict, dict):
+        """
+Arrays of the output value of every rule per output label, followed by a filler value, and boolean arrays telling
+whether the rule gives a value for the label at all
+        """
+        output_values = dict()
+        output_present = dict()
+        for column, label in enumerate(dmn_table.output_labels):
+            (type_ref, _) = dmn_table.output_label_dict[label]
+            fillers = {'integer': 0, 'boolean': False, 'string': ''}
+            entries = dmn_table.output_rule_comp.column(column)
+            values = [engine.output_value(type_ref, entry[1]) if entry is not None else fillers[type_ref]
+                      for entry in entries]
+            output_values[label] = numpy.array(values + [fillers[type_ref]])
+            output_present[label] = numpy.array([entry is not None for entry in entries] + [False], dtype=bool)
+        return output_values, output_present
+
+
+def evaluate_batch(dmn_table: DecisionTable, columns, chunk_size: int = 65536, strict: bool = True) -> BatchResult:
+    """
+Evaluates a table once for many rows. Use a BatchEvaluator to evaluate the same table repeatedly.
+    :param dmn_table:
+    :param columns: dictionary of input labels and array-likes of equal length, or a numpy structured array
+    :param chunk_size: amount of rows for which a match matrix is built at once
+    :param strict: raise a ValueError on overlapping rules in a table with unique hit policy
+    :return: BatchResult
+    """
+    return BatchEvaluator(dmn_table).evaluate(columns, chunk_size, strict)
@@ -0,0 +1,212 @@
+"""
+Evaluates decision tables directly in python, without translating them to IDP.
+
+The rule entries are compiled once into simple tests, so a TableEvaluator can be reused for many evaluations.
+Supported hit policies are the single hit policies of the meta model: unique, first and priority.
+"""
+import operator
+from functools import partial
+
+from dmnconverter.evaluate.index import RuleIndex, bits
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+HIT_POLICIES = ['unique', 'first', 'priority']
+
+# tests are written as partial(op, value)(x), so the operators are mirrored: x < value <=> value > x
+__MIRRORED_OPERATORS = {'=': operator.eq, '<': operator.gt, '=<': operator.ge, '>': operator.lt, '>=': operator.le}
+
+
+class TableEvaluator:
+    """"
+Compiled version of a DecisionTable that returns the outputs of the table for given inputs.
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    :param indexed: use a RuleIndex to find the triggered rules, instead of testing every rule
+    """
+
+    def __init__(self, dmn_table: DecisionTable, indexed: bool = True):
+        if dmn_table.hit_policy not in HIT_POLICIES:
+            raise ValueError('Hit policy ' + dmn_table.hit_policy + ' not yet implemented or not recognized.')
+        self.table_name = dmn_table.table_name
+        self.hit_policy = dmn_table.hit_policy
+        self.input_labels = dmn_table.input_labels
+        self.output_labels = dmn_table.output_labels
+        self.input_types = [type_ref for (type_ref, _) in dmn_table.input_label_dict.values()]
+        self.rules = [self.compile_rule(self.input_types, rule) for rule in dmn_table.input_rule_comp]
+        self.outputs = [self.__rule_output(dmn_table, rule) for rule in dmn_table.output_rule_comp]
+        self.priorities = priority_ranks(dmn_table)
+        self.index = RuleIndex(dmn_table) if indexed else None
+
+    def evaluate(self, inputs: dict) -> dict:
+        """
+Evaluates the table for one assignment of the inputs
+        :param inputs: dictionary with as keys the input labels and the assigned values
+        :return: dictionary of output labels and values, or None if no rule is triggered
+        """
+        return self.select(self.matching_rules(inputs))
+
+    def matching_rules(self, inputs: dict) -> [int]:
+        """
+Finds the rules triggered by an assignment of the inputs
+        :param inputs: dictionary with as keys the input labels and the assigned values
+        :return: indices of the triggered rules, in rule order. The first rule has index 0.
+        """
+        values = self.input_values(inputs)
+        stop_at_first = self.hit_policy == 'first'
+        rule_nrs = []
+        if self.index is not None:
+            unindexed = self.index.unindexed
+            for rule_nr in bits(self.index.candidates(values)):
+                if unindexed >> rule_nr & 1 and not all(test(values[column]) for (column, test) in self.rules[rule_nr]):
+                    continue
+                rule_nrs.append(rule_nr)
+                if stop_at_first:
+                    break
+            return rule_nrs
+
+        for rule_nr, rule in enumerate(self.rules):
+            for (column, test) in rule:
+                if not test(values[column]):
+                    break
+            else:
+                rule_nrs.append(rule_nr)
+                if stop_at_first:
+                    # no need to look any further than the first triggered rule
+                    break
+        return rule_nrs
+
+    def select(self, rule_nrs: [int]) -> dict:
+        """
+Applies the hit policy of the table to a list of triggered rules
+        :param rule_nrs: indices of the triggered rules, in rule order
+        :return: dictionary of output labels and values, or None if no rule is triggered
+        """
+        if not rule_nrs:
+            return None
+        if self.hit_policy == 'unique':
+            if len(rule_nrs) > 1:
+                raise ValueError('Rules ' + ', '.join(str(rule_nr + 1) for rule_nr in rule_nrs) + ' of table ' +
+                                 self.table_name + ' overlap, while its hit policy is unique')
+            rule_nr = rule_nrs[0]
+        elif self.hit_policy == 'first':
+            rule_nr = rule_nrs[0]
+        else:
+            rule_nr = min(rule_nrs, key=self.priorities.__getitem__)
+        return dict(self.outputs[rule_nr])
+
+    def input_values(self, inputs: dict) -> list:
+        """
+Normalizes an assignment of the inputs into a list of values, ordered as the input labels
+        :param inputs: dictionary with as keys the input labels, spaces in labels are allowed
+        :return: list of values
+        """
+        values = []
+        for (label, type_ref) in zip(self.input_labels, self.input_types):
+            try:
+                value = inputs[label]
+            except KeyError:
+                try:
+                    value = inputs[label.replace('_', ' ')]
+                except KeyError:
+                    raise ValueError('No value given for input ' + label + ' of table ' + self.table_name) from None
+            values.append(conditions.normalize_input(type_ref, value))
+        return values
+
+    @staticmethod
+    def compile_rule(input_types: [str], rule: [(str, str)]) -> [(int, 'function')]:
+        """
+Compiles the input entries of a rule into tests
+        :param input_types: type of every input variable
+        :param rule: list of (comparator, value) entries or None
+        :return: list of (column, test) tuples, entries without comparison are left out
+        """
+        return [(column, compile_entry(input_types[column], entry)) for column, entry in enumerate(rule)
+                if entry is not None]
+
+    @staticmethod
+    def __rule_output(dmn_table: DecisionTable, rule: [(str, str)]) -> [(str, object)]:
+        outputs = []
+        for (label, entry) in zip(dmn_table.output_labels, rule):
+            if entry is not None:
+                (type_ref, _) = dmn_table.output_label_dict[label]
+                outputs.append((label, output_value(type_ref, entry[1])))
+        return outputs
+
+
+def evaluate(dmn_table: DecisionTable, inputs: dict) -> dict:
+    """
+Evaluates a table once. Use a TableEvaluator to evaluate the same table repeatedly.
+    :param dmn_table:
+    :param inputs: dictionary with as keys the input labels and the assigned values
+    :return: dictionary of output labels and values, or None if no rule is triggered
+    """
+    return TableEvaluator(dmn_table).evaluate(inputs)
+
+
+def compile_entry(type_ref: str, entry: (str, str)) -> 'function':
+    """
+Compiles a single rule entry into a test function on the normalized input value
+    :param type_ref: type of the variable
+    :param entry: (comparator, value) tuple
+    :return: function taking the value and returning a boolean
+    """
+    case_tests = []
+    for case in conditions.entry_cases(entry):
+        tests = [partial(__MIRRORED_OPERATORS[comparator], conditions.coerce_value(type_ref, value))
+                 for (comparator, value) in case]
+        case_tests.append(tests[0] if len(tests) == 1 else partial(__all_hold, tuple(tests)))
+
+    if len(case_tests) == 1:
+        return case_tests[0]
+    if entry[0] == '=':
+        # list of values
+        return frozenset(conditions.coerce_value(type_ref, value) for value in entry[1].split(', ')).__contains__
+    return partial(__any_holds, tuple(case_tests))
+
+
+def output_value(type_ref: str, value: str):
+    """
+Turns the value of an output entry into a python value
+    :param type_ref:
+    :param value:
+    :return: int, bool or string
+    """
+    if type_ref == 'boolean':
+        return value == 'True'
+    return conditions.coerce_value(type_ref, value)
+
+
+def priority_ranks(dmn_table: DecisionTable) -> [tuple]:
+    """
+Ranks the rules for the priority hit policy: the output value listed first in the output values has the highest
+priority. Outputs without listed values do not influence the priority.
+    :param dmn_table:
+    :return: list with one tuple per rule, the rule with the smallest tuple has the highest priority
+    """
+    orders = []
+    for label in dmn_table.output_labels:
+        (type_ref, values) = dmn_table.output_label_dict[label]
+        if type_ref in ['string', 'boolean']:
+            order = conditions.domain_values(type_ref, values)
+            orders.append({value: rank for rank, value in enumerate(order)})
+        else:
+            orders.append(dict())
+    ranks = []
+    for rule in dmn_table.output_rule_comp:
+        ranks.append(tuple(order.get(entry[1], len(order)) if entry is not None else len(order)
+                           for (order, entry) in zip(orders, rule)))
+    return ranks
+
+
+def __all_hold(tests: tuple, value) -> bool:
+    for test in tests:
+        if not test(value):
+            return False
+    return True
+
+
+def __any_holds(tests: tuple, value) -> bool:
+    for test in tests:
+        if test(value):
+            return True
+    return False
@@ -0,0 +1,146 @@
+"""
+Per-column index of the rules of a decision table, to find the rules triggered by an input without scanning them all.
+
+Sets of rules are stored as bitsets (python integers, bit i standing for rule i). Every input column maps a value to
+the bitset of rules whose entry for that column accepts it:
+    * string and boolean columns use a hash map from value to bitset
+    * integer columns use the sorted boundary points of all entries: the points and the open intervals between them
+      form segments with a constant bitset, found by bisection
+Rules without comparison on a column are in the wildcard bitset of that column. The triggered rules are the
+intersection of the bitsets of all columns.
+"""
+import bisect
+
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+
+class RuleIndex:
+    """"
+Index of the input entries of a DecisionTable
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    """
+
+    def __init__(self, dmn_table: DecisionTable):
+        self.amount_rules = len(dmn_table.input_rule_comp)
+        self.all_rules = (1 << self.amount_rules) - 1
+        self.columns = []
+        # rules with entries the index can not represent, they always have to be tested
+        self.unindexed = 0
+        for column_nr, (type_ref, _) in enumerate(dmn_table.input_label_dict.values()):
+            entries = dmn_table.input_rule_comp.column(column_nr)
+            if type_ref == 'integer':
+                self.columns.append(IntervalColumn(entries))
+            else:
+                column = ValueColumn(entries)
+                self.unindexed |= column.unindexed
+                self.columns.append(column)
+
+    def candidates(self, values: list) -> int:
+        """
+Finds the rules that can be triggered by the given input
+        :param values: normalized input values, ordered as the input labels (see TableEvaluator.input_values)
+        :return: bitset of rules. All are triggered, apart from the unindexed rules that still need testing.
+        """
+        rules = self.all_rules
+        for (column, value) in zip(self.columns, values):
+            rules &= column.lookup(value)
+            if not rules:
+                break
+        return rules
+
+
+class ValueColumn:
+    """"
+Hash map from value to bitset of rules, for a string or boolean column
+    :param entries: entry of every rule for this column
+    """
+
+    def __init__(self, entries: [(str, str)]):
+        self.wildcard = 0
+        self.unindexed = 0
+        self.values = dict()
+        for rule_nr, entry in enumerate(entries):
+            bit = 1 << rule_nr
+            if entry is None:
+                self.wildcard |= bit
+                continue
+            try:
+                values = conditions.value_set(entry)
+            except ValueError:
+                # comparisons other than equality are left to the tests of the rule
+                self.wildcard |= bit
+                self.unindexed |= bit
+                continue
+            for value in values:
+                self.values[value] = self.values.get(value, 0) | bit
+
+    def lookup(self, value) -> int:
+        return self.wildcard | self.values.get(value, 0)
+
+
+class IntervalColumn:
+    """"
+Sorted boundary structure for an integer column. With boundary points p_0 < ... < p_k-1, segment 2i+1 is the point
+p_i and segment 2i the open interval between p_i-1 and p_i, giving 2k+1 segments.
+    :param entries: entry of every rule for this column
+    """
+
+    def __init__(self, entries: [(str, str)]):
+        rule_intervals = [conditions.integer_intervals(entry) for entry in entries]
+        points = set()
+        for intervals in rule_intervals:
+            for (start, stop) in intervals:
+                points.update(bound for bound in (start, stop) if bound is not None)
+        self.points = sorted(points)
+        position = {point: i for i, point in enumerate(self.points)}
+        amount_segments = 2 * len(self.points) + 1
+
+        # rules entering and leaving at every segment
+        starts = [0] * (amount_segments + 1)
+        stops = [0] * (amount_segments + 1)
+        for rule_nr, intervals in enumerate(rule_intervals):
+            bit = 1 << rule_nr
+            for (first, last) in self.__merge_segments(intervals, position, amount_segments):
+                starts[first] |= bit
+                stops[last + 1] |= bit
+
+        self.segments = []
+        rules = 0
+        for segment in range(amount_segments):
+            rules = (rules & ~stops[segment]) | starts[segment]
+            self.segments.append(rules)
+
+    def lookup(self, value: int) -> int:
+        i = bisect.bisect_left(self.points, value)
+        if i < len(self.points) and self.points[i] == value:
+            return self.segments[2 * i + 1]
+        return self.segments[2 * i]
+
+    @staticmethod
+    def __merge_segments(intervals: [(int, int)], position: dict, amount_segments: int) -> [(int, int)]:
+        """Translates intervals to ranges of segments, merging overlapping and adjacent ranges"""
+        ranges = sorted((0 if start is None else 2 * position[start] + 1,
+                         amount_segments - 1 if stop is None else 2 * position[stop] + 1)
+                        for (start, stop) in intervals)
+        merged = []
+        for (first, last) in ranges:
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        return merged
+
+
+def bits(rules: int) -> [int]:
+    """
+Lists the rules in a bitset
+    :param rules: bitset of rules
+    :return: rule indices in increasing order
+    """
+    rule_nrs = []
+    while rules:
+        lowest = rules & -rules
+        rule_nrs.append(lowest.bit_length() - 1)
+        rules ^= lowest
+    return rule_nrs
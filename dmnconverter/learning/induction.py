@@ -0,0 +1,375 @@
+"""
+Learns the rules of a decision table from examples in python, as a fast alternative to solving TableLearner in IDP.
+
+A decision tree is grown over the examples the given rules of the table do not decide yet. String and boolean inputs
+are split in their values, integer inputs at a threshold, always choosing the split with the largest information
+gain, until all examples in a leaf have the same outputs. Every leaf becomes a rule matching its box of inputs:
+    * unique and priority: the boxes of the given rules are subtracted from the leaves, so the new rules never
+      overlap the given rules or each other
+    * first: the new rules are added after the given rules, which keep deciding the inputs they match
+Values that no example of a node has are added to its largest child, so the rules cover all inputs. Afterwards the new
+rules are merged where possible (see transform.minimize). Examples are (inputs, outputs) tuples of dictionaries:
+    table, report = induce_table(dmn_table, [({'Season': 'Fall', 'Guest_Count': 8}, {'Dish': 'Spareribs'})])
+The result can be handed to TableLearner as warm start. Its rules are then part of every model, so IDP can only extend
+the table with rules for the inputs the examples left open, not find a smaller table.
+"""
+import math
+import time
+from collections import Counter
+
+from dmnconverter.evaluate.engine import HIT_POLICIES, TableEvaluator
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.transform.minimize import minimize_table
+
+INFINITY = float('inf')
+
+
+class InductionReport:
+    """"
+Summary of learning the rules of a table
+    :param table_name:
+    :param hit_policy:
+    :param amount_examples: amount of given examples
+    :param amount_decided: amount of examples already decided by the given rules
+    :param amount_leaves: amount of leaves of the decision tree
+    :param amount_given: amount of given rules, kept unchanged
+    :param amount_learned: amount of new rules, after merging
+    :param seconds: time taken to learn the rules
+    """
+
+    def __init__(self, table_name: str, hit_policy: str, amount_examples: int, amount_decided: int,
+                 amount_leaves: int, amount_given: int, amount_learned: int, seconds: float):
+        self.table_name = table_name
+        self.hit_policy = hit_policy
+        self.amount_examples = amount_examples
+        self.amount_decided = amount_decided
+        self.amount_leaves = amount_leaves
+        self.amount_given = amount_given
+        self.amount_learned = amount_learned
+        self.seconds = seconds
+
+    def __str__(self):
+        return 'Table ' + self.table_name + ' (' + self.hit_policy + '): ' + str(self.amount_examples) + \
+               ' examples, ' + str(self.amount_decided) + ' decided by ' + str(self.amount_given) + \
+               ' given rules, ' + str(self.amount_learned) + ' rules learned from ' + str(self.amount_leaves) + \
+               ' leaves in ' + '{:.3f}s'.format(self.seconds)
+
+
+class RuleInducer:
+    """"
+Learns rules of a DecisionTable from examples
+    :param dmn_table: DecisionTable with the labels of the table and the rules that are already known, if any
+    :param examples: iterable of (inputs, outputs) tuples, dictionaries with as keys the labels and the values, as
+    given to evaluate.engine.TableEvaluator
+    """
+
+    def __init__(self, dmn_table: DecisionTable, examples):
+        if dmn_table.hit_policy not in HIT_POLICIES:
+            raise ValueError('Hit policy ' + dmn_table.hit_policy + ' not yet implemented or not recognized.')
+        self.table = dmn_table
+        self.input_types = [type_ref for (type_ref, _) in dmn_table.input_label_dict.values()]
+        self.output_types = [type_ref for (type_ref, _) in dmn_table.output_label_dict.values()]
+        self.inputs = []
+        self.outputs = []
+        for (inputs, outputs) in examples:
+            self.inputs.append(self.__values(dmn_table.input_labels, self.input_types, inputs))
+            self.outputs.append(tuple(str(value) for value in
+                                      self.__values(dmn_table.output_labels, self.output_types, outputs)))
+        # values of every string and boolean input, None for integer inputs
+        self.domains = []
+        for (column, (type_ref, values)) in enumerate(dmn_table.input_label_dict.values()):
+            if type_ref == 'integer':
+                self.domains.append(None)
+                continue
+            domain = conditions.domain_values(type_ref, values) if values else []
+            known = set(domain)
+            domain.extend(sorted({row[column] for row in self.inputs}.difference(known)))
+            self.domains.append(domain)
+
+    def induce(self) -> (DecisionTable, InductionReport):
+        """
+Learns the rules
+        :return: tuple of the DecisionTable with the given and the learned rules, and an InductionReport
+        """
+        start = time.perf_counter()
+        table = self.table
+        undecided = self.undecided()
+        leaves = self.grow(undecided)
+        given = [self.__box(rule) for rule in table.input_rule_comp]
+        boxes = []
+        for (box, outputs) in leaves:
+            pieces = [box]
+            if table.hit_policy != 'first':
+                for given_box in given:
+                    pieces = [piece for box_piece in pieces for piece in self.subtract(box_piece, given_box)]
+            boxes.extend((piece, outputs) for piece in pieces)
+
+        # the new rules never overlap each other, so they are merged as a unique table whatever the hit policy
+        learned = DecisionTable(table.ontology, table.table_name, 'unique', table.input_label_dict,
+                                table.output_label_dict, [self.__entries(box) for (box, _) in boxes],
+                                [[('=', value) for value in outputs] for (_, outputs) in boxes], table.symbols)
+        (learned, _) = minimize_table(learned)
+        induced = DecisionTable(table.ontology, table.table_name, table.hit_policy, table.input_label_dict,
+                                table.output_label_dict, list(table.input_rule_comp) + list(learned.input_rule_comp),
+                                list(table.output_rule_comp) + list(learned.output_rule_comp), table.symbols,
+                                table.decision_id, table.required_decisions)
+        report = InductionReport(table.table_name, table.hit_policy, len(self.inputs),
+                                 len(self.inputs) - len(undecided), len(leaves), len(table.input_rule_comp),
+                                 len(learned.input_rule_comp), time.perf_counter() - start)
+        return induced, report
+
+    def undecided(self) -> [int]:
+        """
+Checks the examples against the given rules
+        :return: indices of the examples that no given rule matches
+        """
+        if not len(self.table.input_rule_comp):
+            return list(range(len(self.inputs)))
+        evaluator = TableEvaluator(self.table)
+        undecided = []
+        for (index, (inputs, outputs)) in enumerate(zip(self.inputs, self.outputs)):
+            rule_nrs = evaluator.matching_rules(dict(zip(self.table.input_labels, inputs)))
+            if not rule_nrs:
+                undecided.append(index)
+                continue
+            decided = evaluator.select(rule_nrs)
+            for (label, value) in zip(self.table.output_labels, outputs):
+                if label in decided and str(decided[label]) != value:
+                    raise ValueError('Example ' + str(index + 1) + ' has ' + label + ' ' + value + ', but the rules ' +
+                                     'of table ' + self.table.table_name + ' give ' + str(decided[label]))
+        return undecided
+
+    def grow(self, indices: [int]) -> [(list, tuple)]:
+        """
+Grows a decision tree over examples
+        :param indices: indices of the examples
+        :return: list of leaves, every leaf being a tuple of its box (see subtract) and its outputs
+        """
+        if not indices:
+            return []
+        root = [frozenset(domain) if domain is not None else (-INFINITY, INFINITY) for domain in self.domains]
+        leaves = []
+        pending = [(root, indices)]
+        while pending:
+            (box, indices) = pending.pop()
+            outputs = {self.outputs[index] for index in indices}
+            if len(outputs) == 1:
+                leaves.append((box, outputs.pop()))
+                continue
+            split = self.best_split(box, indices)
+            if split is None:
+                raise ValueError('Examples ' + ', '.join(str(index + 1) for index in sorted(indices)[:10]) +
+                                 ' have the same inputs but different outputs')
+            pending.extend(reversed(split))
+        return leaves
+
+    def best_split(self, box: list, indices: [int]) -> [(list, [int])]:
+        """
+Finds the split of a node with the largest information gain
+        :param box: inputs of the node
+        :param indices: indices of the examples in the node, with different outputs
+        :return: list of the boxes and indices of the children, None if all examples have the same inputs
+        """
+        best = None
+        for column in range(len(self.domains)):
+            if self.domains[column] is None:
+                candidate = self.__integer_split(column, indices)
+            else:
+                candidate = self.__value_split(column, indices)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = (candidate[0], column, candidate[1])
+        if best is None:
+            return None
+        (_, column, parts) = best
+        children = []
+        for (part, part_indices) in parts:
+            child = list(box)
+            child[column] = part if self.domains[column] is not None else \
+                (max(box[column][0], part[0]), min(box[column][1], part[1]))
+            children.append((child, part_indices))
+        if self.domains[column] is not None:
+            # values without examples go to the largest child, so the children cover the whole box
+            covered = frozenset().union(*(part for (part, _) in parts))
+            rest = box[column] - covered
+            if rest:
+                largest = max(range(len(children)), key=lambda child_nr: len(children[child_nr][1]))
+                children[largest][0][column] = children[largest][0][column] | rest
+        return children
+
+    def __value_split(self, column: int, indices: [int]):
+        """Split of a string or boolean input in its values, as (impurity, [(values, indices)])"""
+        groups = dict()
+        for index in indices:
+            groups.setdefault(self.inputs[index][column], []).append(index)
+        if len(groups) < 2:
+            return None
+        impurity = sum(weighted_entropy(Counter(self.outputs[index] for index in group)) for group in groups.values())
+        return impurity, [(frozenset([value]), group) for (value, group) in groups.items()]
+
+    def __integer_split(self, column: int, indices: [int]):
+        """Best split of an integer input at a threshold, as (impurity, [(interval, indices)])"""
+        ordered = sorted(indices, key=lambda index: self.inputs[index][column])
+        right = Counter(self.outputs[index] for index in ordered)
+        left = Counter()
+        best = None
+        for position in range(len(ordered) - 1):
+            index = ordered[position]
+            outputs = self.outputs[index]
+            left[outputs] += 1
+            right[outputs] -= 1
+            value = self.inputs[index][column]
+            if value == self.inputs[ordered[position + 1]][column]:
+                continue
+            impurity = weighted_entropy(left) + weighted_entropy(right)
+            if best is None or impurity < best[0]:
+                best = (impurity, position, value)
+        if best is None:
+            return None
+        (impurity, position, value) = best
+        return impurity, [((-INFINITY, value), ordered[:position + 1]), ((value + 1, INFINITY), ordered[position + 1:])]
+
+    def subtract(self, box: list, other: list) -> [list]:
+        """
+Inputs of a box that are not in another box
+        :param box: list with for every input a frozenset of values or an inclusive (start, stop) interval
+        :param other: list with for every input a frozenset of values or a list of intervals
+        :return: list of disjoint boxes
+        """
+        if not self.intersects(box, other):
+            return [box]
+        pieces = []
+        inside = [box]
+        for column in range(len(box)):
+            next_inside = []
+            for part in inside:
+                if self.domains[column] is not None:
+                    (outside_values, inside_values) = (part[column] - other[column], part[column] & other[column])
+                    outside_parts = [outside_values] if outside_values else []
+                    inside_parts = [inside_values] if inside_values else []
+                else:
+                    (outside_parts, inside_parts) = interval_difference(part[column], other[column])
+                pieces.extend(part[:column] + [values] + part[column + 1:] for values in outside_parts)
+                next_inside.extend(part[:column] + [values] + part[column + 1:] for values in inside_parts)
+            inside = next_inside
+            if not inside:
+                break
+        return pieces
+
+    def intersects(self, box: list, other: list) -> bool:
+        """
+Whether a box and another box have inputs in common
+        :param box: list with for every input a frozenset of values or an inclusive (start, stop) interval
+        :param other: list with for every input a frozenset of values or a list of intervals
+        """
+        for (domain, values, other_values) in zip(self.domains, box, other):
+            if domain is not None:
+                if values.isdisjoint(other_values):
+                    return False
+            elif not any(max(values[0], start) <= min(values[1], stop) for (start, stop) in other_values):
+                return False
+        return True
+
+    def __box(self, rule: list) -> list:
+        """Box of the inputs a given rule matches, integer inputs having a list of intervals"""
+        box = []
+        for (domain, entry) in zip(self.domains, rule):
+            if domain is not None:
+                box.append(frozenset(domain) if entry is None else frozenset(conditions.value_set(entry)))
+            else:
+                box.append([(-INFINITY if start is None else start, INFINITY if stop is None else stop)
+                            for (start, stop) in conditions.integer_intervals(entry)])
+        return box
+
+    def __entries(self, box: list) -> list:
+        entries = []
+        for (domain, values) in zip(self.domains, box):
+            if domain is None:
+                entries.append(interval_entry(*values))
+            elif len(values) == len(domain):
+                entries.append(None)
+            else:
+                entries.append(('=', ', '.join(value for value in domain if value in values)))
+        return entries
+
+    def __values(self, labels: [str], types: [str], assignment: dict) -> list:
+        values = []
+        for (label, type_ref) in zip(labels, types):
+            try:
+                value = assignment[label]
+            except KeyError:
+                try:
+                    value = assignment[label.replace('_', ' ')]
+                except KeyError:
+                    raise ValueError('Example without value for ' + label + ' of table ' +
+                                     self.table.table_name) from None
+            values.append(conditions.normalize_input(type_ref, value))
+        return values
+
+
+def induce_table(dmn_table: DecisionTable, examples) -> (DecisionTable, InductionReport):
+    """
+Learns rules of a table from examples
+    :param dmn_table: DecisionTable with the labels and the known rules of the table
+    :param examples: iterable of (inputs, outputs) tuples of dictionaries
+    :return: tuple of the DecisionTable with the given and learned rules, and an InductionReport
+    """
+    return RuleInducer(dmn_table, examples).induce()
+
+
+def weighted_entropy(counts: Counter) -> float:
+    """
+Entropy of the outputs of examples, multiplied with their amount
+    :param counts: Counter of the outputs
+    :return: float, 0 if all examples have the same outputs
+    """
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    return total * math.log2(total) - sum(count * math.log2(count) for count in counts.values() if count)
+
+
+def interval_difference(interval: (int, int), others: [(int, int)]) -> ([(int, int)], [(int, int)]):
+    """
+Splits an interval in the parts outside and inside a union of intervals
+    :param interval: inclusive (start, stop) tuple, with infinite unbounded sides
+    :param others: list of inclusive (start, stop) tuples
+    :return: tuple of the lists of intervals outside and inside the others
+    """
+    (start, stop) = interval
+    inside = []
+    for (other_start, other_stop) in sorted(others):
+        (low, high) = (max(start, other_start), min(stop, other_stop))
+        if low > high:
+            continue
+        if inside and low <= inside[-1][1] + 1:
+            inside[-1] = (inside[-1][0], max(inside[-1][1], high))
+        else:
+            inside.append((low, high))
+    outside = []
+    position = start
+    for (low, high) in inside:
+        if position < low:
+            outside.append((position, low - 1))
+        position = high + 1
+    if position <= stop and position != INFINITY:
+        outside.append((position, stop))
+    return outside, inside
+
+
+def interval_entry(start, stop) -> (str, str):
+    """
+Rule entry matching an interval of integers
+    :param start: first value, -infinity if unbounded
+    :param stop: last value, infinity if unbounded
+    :return: (comparator, value) tuple, None if the interval is unbounded on both sides
+    """
+    if start == -INFINITY and stop == INFINITY:
+        return None
+    if start == -INFINITY:
+        return '=<', str(stop)
+    if stop == INFINITY:
+        return '>=', str(start)
+    if start == stop:
+        return '=', str(start)
+    return '[]', str(start) + '..' + str(stop)
@@ -1,27 +1,64 @@
 """"
 Uses meta model with multiple assignments to learn a single table. Currently does not take into account a specific table
 """
+import itertools
 import warnings
 
 
+import dmnconverter.tools.print as printer
 from dmnconverter.tools.decisiontable import DecisionTable
 from dmnconverter.verify.verification import Verification
 
 
 class TableLearner(Verification):
+    def __init__(self, incremental: bool = False, instrument=None, ranges: dict = None, compress: bool = None,
+                 abstract: bool = None, encode: bool = None, warm_start: DecisionTable = None):
+        """
+        :param incremental: see GeneralConverter
+        :param instrument: see GeneralConverter
+        :param ranges: see MetaLanguageConverter
+        :param compress: see MetaLanguageConverter
+        :param abstract: see Verification
+        :param encode: see MetaLanguageConverter
+        :param warm_start: DecisionTable whose rules are written as certainly true rule components, e.g. learned by
+        learning.induction. They are part of every model, so IDP only searches for the rules the table misses.
+        """
+        super().__init__(incremental, instrument, ranges, compress, abstract, encode)
+        self.warm_start = warm_start
+
+    def cache_token(self) -> str:
+        return super().cache_token() + ('' if self.warm_start is None else ' warm ' + self.warm_start.fingerprint())
+
     def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
-        if len(decision_tables) > 1:
+        # works on lists as well as on (streamed) iterators of tables
+        tables = iter(decision_tables)
+        dmn_table: DecisionTable = next(tables)
+        if next(tables, None) is not None:
             warnings.warn("Only first table is verified even though multiple DMN tables were given")
-        dmn_table: DecisionTable = decision_tables[0]
 
         vocabulary = self.build_vocabulary(dmn_table)
+        if self.encode:
+            vocabulary = self.encode_vocabulary(vocabulary, self.integer_ranges([dmn_table]))
         theory = self.build_theory(dmn_table)
         structure = self.build_structure(dmn_table)
 
         return vocabulary, theory, structure
 
     def build_structure(self, decision_table: DecisionTable):
-        return []
+        structure = []
+        if self.warm_start is not None:
+            # <ct> only fixes the given tuples as true, IDP can still add rule components
+            structure.append(printer.enumeration('RuleIn<ct>', self.build_meta_input_rule(self.warm_start)))
+            structure.append(printer.enumeration('RuleOut<ct>', self.build_output_rule(self.warm_start)))
+        if self.symbols is not None:
+            # the structure is written by hand, so the codes of the labels and values of the table are listed up front
+            for label_dict in [decision_table.input_label_dict, decision_table.output_label_dict]:
+                for (label, (type_ref, values)) in label_dict.items():
+                    self.quote(label)
+                    if type_ref in ['string', 'boolean']:
+                        for value in values.split(','):
+                            self.quote(value)
+        return itertools.chain(structure, self.symbol_comments())
 
     def build_vocabulary(self, decision_table: DecisionTable) -> [str]:
         vocabulary = ["type RuleNr isa int",
@@ -1,30 +1,82 @@
 from dmnconverter.tools.texttools import clean_text
-from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.decisiontable import DecisionTable, SymbolTable
+from dmnconverter.read.unary import parse_entry
+from dmnconverter.tools.instrument import NULL_INSTRUMENT
 
 import xml.etree.ElementTree as ElemTree
-import re
 
 
 # FIXME: fix non-deterministic behaviour of 'find'!
 
-def read_tables(file_name: str, ontology: str = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}') -> [DecisionTable]:
+def read_tables(file_name: str, ontology: str = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}',
+                instrument=NULL_INSTRUMENT) -> [DecisionTable]:
     """
 Reads out a dmn table stored as XML file and returns it as a list of decisiontables
     :param file_name: complete file path or relative to call location
     :param ontology: used ontology in the XML table
-    :return: list of DecisionTable objects
+    :param instrument: tools.instrument.Instrument measuring the reading of every table
+    :return: list of DecisionTable objects, sharing one SymbolTable
     """
-    tree = ElemTree.parse(file_name)
-    root = tree.getroot()
-    decisions = root.findall(ontology + 'decision')  # this is defined in the XML structure
-    return [read_table(decision, ontology) for decision in decisions]
+    return list(iter_tables(file_name, ontology, instrument, SymbolTable()))
 
 
-def read_table(decision, ontology: str) -> DecisionTable:
+def iter_tables(file_name: str, ontology: str = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}',
+                instrument=NULL_INSTRUMENT, symbols: SymbolTable = None) -> "Iterator":
+    """
+Lazily reads out the decision tables of a dmn file, one decision at a time.
+Every DecisionTable is built as soon as the end of its decision element is parsed, after which the XML subtree is
+cleared. Peak memory is therefore bounded by the largest single decision instead of the whole file.
+    :param file_name: complete file path or relative to call location
+    :param ontology: used ontology in the XML table
+    :param instrument: tools.instrument.Instrument measuring the reading of every table
+    :param symbols: SymbolTable shared by the tables, every table gets its own if None so no entries outlive it
+    :return: generator of DecisionTable objects, in document order
+    """
+    decision_tag = ontology + 'decision'
+    root = None
+    depth = 0
+    for event, element in ElemTree.iterparse(file_name, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        # only direct children of the definitions are decisions, in line with root.findall
+        if depth == 1 and element.tag == decision_tag:
+            with instrument.stage('table', element.attrib.get('name')):
+                decision_table = read_table(element, ontology, instrument, symbols)
+            yield decision_table
+            # drop the processed decision (and anything before it) from the partially built tree
+            root.clear()
+
+
+class TableStream:
+    """
+Re-iterable view on the decision tables of a dmn file. Every iteration streams the file again with iter_tables, so
+converters that need several passes never hold more than one parsed decision at a time.
+    :param file_name: complete file path or relative to call location
+    :param ontology: used ontology in the XML table
+    :param instrument: tools.instrument.Instrument measuring the reading of every table
+    """
+
+    def __init__(self, file_name: str, ontology: str = '{http://www.omg.org/spec/DMN/20151101/dmn.xsd}',
+                 instrument=NULL_INSTRUMENT):
+        self.file_name = file_name
+        self.ontology = ontology
+        self.instrument = instrument
+
+    def __iter__(self):
+        return iter_tables(self.file_name, self.ontology, self.instrument)
+
+
+def read_table(decision, ontology: str, instrument=NULL_INSTRUMENT, symbols: SymbolTable = None) -> DecisionTable:
     """
 Reads out a given dmn table.
     :param decision: Defined in XML structure, contains both meta info about the decision table and the actual table.
     :param ontology: ontology used in the proces
+    :param instrument: tools.instrument.Instrument measuring the reading of the rules
+    :param symbols: SymbolTable interning the rule entries, a new one if None
     :return: DecisionTable object
     """
     table_name = decision.attrib['name']
@@ -32,10 +84,30 @@ Reads out a given dmn table.
     hit_policy = __read_hit_policy(dec_table)
     input_label_dict = read_expressions(ontology, dec_table, 'input')
     output_label_dict = read_expressions(ontology, dec_table, 'output')
-    rules = read_rules(ontology, dec_table)
+    with instrument.stage('rules') as stage:
+        rules = read_rules(ontology, dec_table)
+        stage.count('rules', len(rules[0]))
+        stage.count('cells', len(rules[0]) * (len(input_label_dict) + len(output_label_dict)))
     input_rule_comp = rules[0]
     output_rule_comp = rules[1]
-    return DecisionTable(ontology, table_name, hit_policy, input_label_dict, output_label_dict, input_rule_comp, output_rule_comp)
+    return DecisionTable(ontology, table_name, hit_policy, input_label_dict, output_label_dict, input_rule_comp,
+                         output_rule_comp, symbols, decision_id=decision.attrib.get('id', ''),
+                         required_decisions=read_requirements(ontology, decision))
+
+
+def read_requirements(ont: str, decision) -> [str]:
+    """
+Reads the ids of the decisions a decision requires, from its informationRequirement elements
+    :param ont: used ontology
+    :param decision: decision element
+    :return: list of decision ids, without the leading '#' of the hrefs
+    """
+    requirements = []
+    for requirement in decision.findall(ont + 'informationRequirement'):
+        required_decision = requirement.find(ont + 'requiredDecision')
+        if required_decision is not None:
+            requirements.append(required_decision.attrib.get('href', '').lstrip('#'))
+    return requirements
 
 
 def read_expressions(ont: str, dec_table, category: str) -> dict:
@@ -105,24 +177,7 @@ def __structure_comparison(entry: "XML inputEntry") -> (str, str):
     :param entry: The XML inputEntry as defined in the ontology
     :return:
     """
-    cleaned = clean_text(entry)
-    if cleaned is None:
-        return cleaned
-    content_pattern = re.compile('[ \\w,]+')
-
-    content_match = re.search(content_pattern, cleaned)
-
-    content = content_match.group(0)
-
-    comparator = cleaned.replace(content, '')
-    if not comparator:
-        comparator = '='
-    elif comparator == '<=':
-        comparator = '=<'
-
-    content = content.strip('_')  # removes excess underscores
-    content = content.title()  # standardize capitalization
-    return comparator, content
+    return parse_entry(entry[0].text)
 
 
 def __read_hit_policy(dec_table) ->str:
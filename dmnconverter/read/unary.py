@@ -0,0 +1,53 @@
+"""
+Parser for the unary tests found in the input and output entries of DMN rules.
+
+Entries are parsed into the (comparator, value) tuples used throughout the package:
+    * '"Winter"'             -> ('=', 'Winter')
+    * '"Winter", "Spring"'   -> ('=', 'Winter, Spring')
+    * '<= 8'                 -> ('=<', '8')
+    * '[5..8]'               -> ('[]', '5..8')
+    * '' or '-'              -> None (no comparison is made)
+Real tables repeat the same entry texts in many cells, so parsed entries are cached on their raw text.
+"""
+import functools
+import re
+
+# maximum amount of distinct entry texts kept in the cache
+ENTRY_CACHE_SIZE = 4096
+
+__RANGE_PATTERN = re.compile(r'([\[\]])\s*(.+?)\s*\.\.\s*(.+?)\s*([\[\]])', re.DOTALL)
+__COMPARISON_PATTERN = re.compile(r'(<=|>=|=<|<|>|=)?\s*(.*)', re.DOTALL)
+__COMPARATOR_NAMES = {None: '=', '=': '=', '<': '<', '<=': '=<', '=<': '=<', '>': '>', '>=': '>='}
+
+
+@functools.lru_cache(maxsize=ENTRY_CACHE_SIZE)
+def parse_entry(text: str) -> (str, str):
+    """
+Parses the raw text of one rule entry into a (comparator, value) tuple, both encoded as strings.
+The result is cached on the raw text, so the returned tuples are shared and should not be modified.
+    :param text: text of the entry as found in the XML, can be None
+    :return: (comparator, value) tuple or None if no comparison is made
+    """
+    if text is None:
+        return None
+    text = text.strip()
+    if not text or text == '-':
+        return None
+
+    range_match = __RANGE_PATTERN.fullmatch(text)
+    if range_match is not None:
+        (opening, start, stop, closing) = range_match.groups()
+        return opening + closing, __clean_value(start) + '..' + __clean_value(stop)
+
+    (comparator, content) = __COMPARISON_PATTERN.fullmatch(text).groups()
+    cases = [__clean_value(case) for case in content.split(',')]
+    if not all(cases):
+        raise ValueError('Rule entry ' + text + ' not yet implemented or not recognized.')
+    return __COMPARATOR_NAMES[comparator], ', '.join(cases)
+
+
+def __clean_value(value: str) -> str:
+    """Removes quotes, replaces spaces by underscores and standardizes capitalization of a single value"""
+    value = value.strip().replace('"', '').strip()
+    value = value.replace(' ', '_').strip('_')
+    return value.title()
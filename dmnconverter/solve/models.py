@@ -0,0 +1,120 @@
+"""
+Parser of the models printed by the printmodels procedure of IDP, e.g.
+    Number of models: 1.
+    Model 1
+    =======
+    structure  : V {
+      CountTriggers = 0
+      Match = { 1,"Guest_Count"; 1,"Season" }
+      VarValue = { "Guest_Count"->9; "Season"->"Fall" }
+    }
+Every model becomes a dictionary keyed by the symbols of the vocabulary:
+    * constants give their value: {'CountTriggers': 0}
+    * predicates give a set of their tuples, or of their values if they are unary:
+      {'Match': {(1, 'Guest_Count'), (1, 'Season')}}
+    * functions give a dictionary of their arguments and values: {'VarValue': {'Guest_Count': 9, 'Season': 'Fall'}}
+Quoted values become strings without quotes, integers become int and other values (constructors) stay strings.
+"""
+import re
+
+__TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|->|[,;]|-?\d+(?![\w.])|[^\s,;"]+')
+__MODEL_PATTERN = re.compile(r'^Model\s+\d+\s*$')
+__AMOUNT_PATTERN = re.compile(r'Number of models:\s*(\d+)')
+__SYMBOL_PATTERN = re.compile(r'^\s*([^\s=]+)\s*=\s*(.*)$', re.DOTALL)
+
+
+def parse_models(output: str) -> [dict]:
+    """
+Parses all models in the output of IDP
+    :param output: standard output of IDP running a program that calls printmodels
+    :return: list of dictionaries, one per model, in the order they were printed
+    """
+    models = []
+    model = None
+    pending = ''
+    for line in output.splitlines():
+        if pending:
+            # enumeration spread over several lines
+            pending += ' ' + line
+            if '}' in line:
+                __add_symbol(model, pending)
+                pending = ''
+            continue
+        stripped = line.strip()
+        if __MODEL_PATTERN.match(stripped):
+            model = dict()
+            models.append(model)
+        elif model is None or not stripped or stripped.startswith(('=', 'structure', '}')):
+            continue
+        elif '{' in stripped and '}' not in stripped:
+            pending = stripped
+        else:
+            __add_symbol(model, stripped)
+    return models
+
+
+def amount_models(output: str) -> int:
+    """
+Reads the amount of models IDP reports in its output
+    :param output: standard output of IDP
+    :return: amount of models, None if the output does not report it
+    """
+    match = __AMOUNT_PATTERN.search(output)
+    return None if match is None else int(match.group(1))
+
+
+def parse_value(token: str):
+    """
+Turns a printed value into a python value
+    :param token: single value as printed by IDP
+    :return: int, or string without quotes
+    """
+    if token.startswith('"'):
+        return token[1:-1]
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def parse_symbol(text: str):
+    """
+Parses the interpretation of one symbol
+    :param text: everything after the '=' of the symbol, e.g. '{ "Season"->"Fall" }' or '3'
+    :return: value, set or dictionary, see the module documentation
+    """
+    text = text.strip()
+    if not text.startswith('{'):
+        return parse_value(text)
+    tokens = __TOKEN_PATTERN.findall(text[1:text.rindex('}')])
+    tuples = []
+    arguments = []
+    result = None
+    function = False
+    for token in tokens + [';']:
+        if token == ';':
+            if arguments or result is not None:
+                tuples.append((arguments, result))
+            (arguments, result) = ([], None)
+        elif token == '->':
+            function = True
+            result = ()
+        elif token == ',':
+            continue
+        elif result is not None:
+            result = parse_value(token)
+        else:
+            arguments.append(parse_value(token))
+
+    def key(values: list):
+        return values[0] if len(values) == 1 else tuple(values)
+
+    if function:
+        return {key(values): value for (values, value) in tuples}
+    return {key(values) for (values, _) in tuples}
+
+
+def __add_symbol(model: dict, line: str) -> None:
+    match = __SYMBOL_PATTERN.match(line)
+    if match is not None:
+        model[match.group(1)] = parse_symbol(match.group(2))
@@ -0,0 +1,198 @@
+"""
+Runs generated IDP programs with a solver executable, several at a time.
+
+Every program runs in its own solver process, started by a pool of threads that each wait for one process. The amount
+of programs waiting to run is bounded, so submitting blocks when the solvers cannot keep up, and every program can be
+given a timeout after which its solver is killed. The output of the solver is parsed with solve.models:
+    with SolverRunner(workers=8, timeout=60) as runner:
+        for result in runner.run(report.file_names):
+            print(result.file_name, result.satisfiable, result.models)
+The executable is 'idp' unless given or set in the environment variable IDP_EXECUTABLE. Any executable taking the
+program file as its last argument (or on its standard input, with pipe=True) and printing the models like
+printmodels can be used, e.g. tests/fake_solver.py:
+    SolverRunner(sys.executable, ['tests/fake_solver.py'])
+"""
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dmnconverter.solve.models import amount_models, parse_models
+
+# environment variable with the solver executable
+EXECUTABLE_VARIABLE = 'IDP_EXECUTABLE'
+
+
+class SolveResult:
+    """"
+Outcome of running the solver on one program
+    :param file_name: IDP program
+    :param status: 'done', 'timeout', 'cancelled' or 'error' (solver could not be started)
+    :param returncode: exit code of the solver, None if it did not finish
+    :param stdout: standard output of the solver
+    :param stderr: standard error of the solver, or the reason it did not run
+    :param seconds: wall time of the solver
+    """
+    __slots__ = ('file_name', 'status', 'returncode', 'stdout', 'stderr', 'seconds', '_models')
+
+    def __init__(self, file_name: str, status: str, returncode: int = None, stdout: str = '', stderr: str = '',
+                 seconds: float = 0.0):
+        self.file_name = file_name
+        self.status = status
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+        self._models = None
+
+    @property
+    def models(self) -> [dict]:
+        """Models printed by the solver, parsed on first use (see solve.models.parse_models)"""
+        if self._models is None:
+            self._models = parse_models(self.stdout)
+        return self._models
+
+    @property
+    def satisfiable(self) -> bool:
+        """Whether the solver found a model, None if it did not finish or did not report the amount of models"""
+        if self.status != 'done':
+            return None
+        amount = amount_models(self.stdout)
+        if amount is None:
+            return True if self.models else None
+        return amount > 0
+
+    def __str__(self):
+        return self.file_name + ': ' + self.status + ' ' + '{:.3f}s'.format(self.seconds)
+
+
+class SolverRunner:
+    """"
+Pool of solver processes
+    :param executable: solver executable, IDP_EXECUTABLE or 'idp' if None
+    :param arguments: extra arguments of the solver, given before the program
+    :param workers: amount of solvers running at the same time, os.cpu_count() if None
+    :param timeout: default time limit of a program in seconds, None for no limit
+    :param max_pending: amount of submitted programs that are not finished yet before submit blocks, twice the
+    amount of workers if None
+    :param pipe: hand the program to the solver on its standard input instead of as file argument
+    """
+
+    def __init__(self, executable: str = None, arguments: [str] = (), workers: int = None, timeout: float = None,
+                 max_pending: int = None, pipe: bool = False):
+        self.executable = os.environ.get(EXECUTABLE_VARIABLE, 'idp') if executable is None else executable
+        self.arguments = list(arguments)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.timeout = timeout
+        self.pipe = pipe
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.pending = threading.BoundedSemaphore(2 * self.workers if max_pending is None else max_pending)
+        self.processes = set()
+        self.lock = threading.Lock()
+        self.cancelled = False
+
+    def submit(self, file_name: str, timeout: float = None) -> "Future":
+        """
+Schedules a program, blocking while the maximal amount of programs is pending
+        :param file_name: IDP program
+        :param timeout: time limit in seconds, the default of the runner if None
+        :return: concurrent.futures.Future of a SolveResult
+        """
+        self.pending.acquire()
+        try:
+            future = self.executor.submit(self.solve, file_name, self.timeout if timeout is None else timeout)
+        except BaseException:
+            self.pending.release()
+            raise
+        future.add_done_callback(lambda _: self.pending.release())
+        return future
+
+    def run(self, file_names, timeout: float = None) -> "Iterator":
+        """
+Runs programs, submitting them while earlier ones are running
+        :param file_names: iterable of IDP programs, consumed as far as the pending programs allow
+        :param timeout: time limit of every program, the default of the runner if None
+        :return: generator of SolveResult objects, in the order of file_names
+        """
+        futures = []
+        for file_name in file_names:
+            futures.append(self.submit(file_name, timeout))
+            # hand out the results that are already known, so the futures do not pile up
+            while futures and futures[0].done():
+                yield futures.pop(0).result()
+        for future in futures:
+            yield future.result()
+
+    def solve(self, file_name: str, timeout: float = None) -> SolveResult:
+        """
+Runs the solver on one program in the current thread
+        :param file_name: IDP program
+        :param timeout: time limit in seconds, None for no limit
+        :return: SolveResult
+        """
+        command = [self.executable] + self.arguments + ([] if self.pipe else [file_name])
+        program = None
+        if self.pipe:
+            with open(file_name) as program_file:
+                program = program_file.read()
+        start = time.perf_counter()
+        with self.lock:
+            if self.cancelled:
+                return SolveResult(file_name, 'cancelled')
+            try:
+                process = subprocess.Popen(command, stdin=subprocess.PIPE if self.pipe else subprocess.DEVNULL,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            except OSError as error:
+                return SolveResult(file_name, 'error', stderr=str(error))
+            self.processes.add(process)
+        try:
+            (stdout, stderr) = process.communicate(program, timeout=timeout)
+            status = 'cancelled' if self.cancelled else 'done'
+        except subprocess.TimeoutExpired:
+            process.kill()
+            (stdout, stderr) = process.communicate()
+            status = 'timeout'
+        finally:
+            with self.lock:
+                self.processes.discard(process)
+        return SolveResult(file_name, status, None if status != 'done' else process.returncode, stdout, stderr,
+                           time.perf_counter() - start)
+
+    def cancel(self) -> None:
+        """Stops all running solvers, programs that did not start yet are not run anymore"""
+        with self.lock:
+            self.cancelled = True
+            processes = list(self.processes)
+        for process in processes:
+            process.kill()
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """
+Waits for the submitted programs and stops the pool
+        :param cancel: cancel the running and pending programs first
+        """
+        if cancel:
+            self.cancel()
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # stop the solvers when leaving because of an error (e.g. KeyboardInterrupt)
+        self.shutdown(cancel=exc_type is not None)
+        return False
+
+
+def solve_files(file_names, executable: str = None, workers: int = None, timeout: float = None) -> [SolveResult]:
+    """
+Runs the solver on a batch of programs, e.g. the files of verify.network.NetworkReport
+    :param file_names: iterable of IDP programs
+    :param executable: see SolverRunner
+    :param workers: see SolverRunner
+    :param timeout: time limit of every program in seconds
+    :return: list of SolveResult objects, in the order of file_names
+    """
+    with SolverRunner(executable, workers=workers, timeout=timeout) as runner:
+        return list(runner.run(file_names))
@@ -0,0 +1,127 @@
+"""
+Abstraction of integer variables to the classes of values the rules cannot tell apart.
+
+The values between two consecutive constants of a variable, and every constant itself, form a class: every rule entry
+either matches all values of a class or none of them (see tools.ranges). Rewriting the integer entries over the
+numbers of these classes gives an equivalent table, whose integer variables only take a handful of small values:
+    * 'Age' with entries '< 18', '[18..65]' and '> 65' and bounds 17..66 has the classes
+      0: 17, 1: 18, 2: 19..64, 3: 65, 4: 66
+    * '< 18' becomes ('=', '0'), '[18..65]' becomes ('[]', '1..3') and '> 65' becomes ('=', '4')
+Values found by IDP for the abstracted table are class numbers, IntegerAbstraction.concrete turns them back into the
+interval of values they stand for.
+"""
+from dmnconverter.tools import conditions
+from dmnconverter.tools import texttools as text_tools
+from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.ranges import IntegerRanges
+
+# entry matching no class, used for entries that only match values outside the bounds of their variable
+EMPTY_ENTRY = ('<', '0')
+
+
+class IntegerAbstraction:
+    """"
+Classes of equivalent values of the integer variables of one or more decision tables
+    :param decision_tables: iterable of DecisionTable objects
+    :param overrides: dictionary of labels and (start, stop) tuples, see tools.ranges.IntegerRanges
+    :param margin: see tools.ranges.IntegerRanges
+    """
+
+    def __init__(self, decision_tables=(), overrides: dict = None, margin: int = 1):
+        self.ranges = IntegerRanges(decision_tables, overrides, margin)
+        self.classes = dict()
+        for label in self.ranges.labels():
+            (_, stop) = self.ranges.bounds(label)
+            points = self.ranges.points(label)
+            self.classes[label] = [(start, next_start - 1) for (start, next_start) in zip(points, points[1:])]
+            self.classes[label].append((points[-1], stop))
+
+    def concrete(self, label: str, class_nr: int) -> (int, int):
+        """
+Interval of values a class stands for
+        :param label: integer variable
+        :param class_nr: number of the class, as found in the abstracted table
+        :return: inclusive (start, stop) tuple
+        """
+        return self.classes[label][int(class_nr)]
+
+    def class_bounds(self) -> dict:
+        """Bounds of the class numbers by label, to be used as overrides of the ranges of the abstracted tables"""
+        return {label: (0, len(classes) - 1) for (label, classes) in self.classes.items()}
+
+    def abstract_table(self, dmn_table: DecisionTable) -> DecisionTable:
+        """
+Rewrites the integer entries of a table over the class numbers
+        :param dmn_table: DecisionTable whose variables are known to this abstraction
+        :return: new DecisionTable, the same apart from its integer entries
+        """
+        input_rules = self.__abstract_rules(dmn_table.input_label_dict, dmn_table.input_rule_comp,
+                                            self.abstract_entry)
+        output_rules = self.__abstract_rules(dmn_table.output_label_dict, dmn_table.output_rule_comp,
+                                             self.abstract_output)
+        return DecisionTable(dmn_table.ontology, dmn_table.table_name, dmn_table.hit_policy,
+                             dmn_table.input_label_dict, dmn_table.output_label_dict, input_rules, output_rules,
+                             dmn_table.symbols, dmn_table.decision_id, dmn_table.required_decisions)
+
+    def abstract_entry(self, label: str, entry: (str, str)) -> (str, str):
+        """
+Rewrites an input entry on an integer variable over the class numbers
+        :param label:
+        :param entry: (comparator, value) tuple or None
+        :return: (comparator, value) tuple matching the numbers of the classes the entry matched, or None
+        """
+        if entry is None:
+            return None
+        intervals = conditions.integer_intervals(entry)
+        # an entry matches all values of a class or none, so checking the first value is enough
+        class_nrs = [class_nr for (class_nr, (value, _)) in enumerate(self.classes[label])
+                     if any((start is None or start <= value) and (stop is None or value <= stop)
+                            for (start, stop) in intervals)]
+        if not class_nrs:
+            return EMPTY_ENTRY
+        (first, last) = (class_nrs[0], class_nrs[-1])
+        if len(class_nrs) == 1:
+            return '=', str(first)
+        if last - first + 1 != len(class_nrs):
+            return '=', ', '.join(str(class_nr) for class_nr in class_nrs)
+        if first == 0:
+            return '=<', str(last)
+        if last == len(self.classes[label]) - 1:
+            return '>=', str(first)
+        return '[]', str(first) + '..' + str(last)
+
+    def abstract_output(self, label: str, entry: (str, str)) -> (str, str):
+        """
+Rewrites an output entry on an integer variable to the number of the class of its value
+        :param label:
+        :param entry: (comparator, value) tuple or None
+        :return: (comparator, value) tuple or None
+        """
+        if entry is None:
+            return None
+        (comparator, value) = entry
+        for (class_nr, (start, stop)) in enumerate(self.classes[label]):
+            if start <= int(value) <= stop:
+                return comparator, str(class_nr)
+        raise ValueError('Output ' + value + ' of ' + label + ' lies outside its range ' +
+                         str(self.ranges.bounds(label)))
+
+    def comments(self, labels: [str] = None) -> [str]:
+        """
+Structure comments giving the interval of every class, so the values found by IDP can be read
+        :param labels: variables to include, all if None
+        :return: list of strings
+        """
+        labels = self.classes.keys() if labels is None else [label for label in labels if label in self.classes]
+        lines = []
+        for label in labels:
+            intervals = [str(class_nr) + ': ' + (str(start) if start == stop else str(start) + '..' + str(stop))
+                         for (class_nr, (start, stop)) in enumerate(self.classes[label])]
+            lines.append('// ' + text_tools.enquote(str(label)) + ' classes ' + ', '.join(intervals))
+        return lines
+
+    def __abstract_rules(self, label_dict: dict, rules, abstract) -> [[(str, str)]]:
+        integer_columns = {column_nr: label for (column_nr, (label, (type_ref, _))) in enumerate(label_dict.items())
+                           if type_ref == 'integer'}
+        return [[abstract(integer_columns[column_nr], entry) if column_nr in integer_columns else entry
+                 for (column_nr, entry) in enumerate(rule)] for rule in rules]
@@ -0,0 +1,195 @@
+"""
+On-disk cache of converted files, addressed by the content of the DMN file and the converter that was used.
+
+Entries are written to a temporary file and moved in place atomically, so several processes can share one cache
+directory. Recency is kept in the modification time of the entries, which is used to evict the least recently used
+entries once the cache grows beyond its size limit. Every ConversionCache keeps a running total of the size of the
+cache, which is only recounted from the directory when it exceeds the limit, so entries written by other processes are
+accounted for at the latest then.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+
+import dmnconverter
+
+
+class CacheStats:
+    """"
+Counters of the use of a ConversionCache in this process
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def __str__(self):
+        return 'hits: ' + str(self.hits) + ', misses: ' + str(self.misses) + ', bytes saved: ' + str(self.bytes_saved)
+
+
+class ConversionCache:
+    """"
+Content-addressed cache of IDP files
+    :param directory: directory of the cache, created if needed
+    :param max_bytes: size limit of the cache, least recently used entries are evicted beyond it
+    :param link: hard-link cached files instead of copying them. Linked outputs must not be modified in place, an output
+    that is converted again after a miss is unlinked first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30, link: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+        self.stats = CacheStats()
+        # running total of the size of the entries, counted on the first store
+        self.size = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(dmn_bytes: bytes, converter_token: str) -> str:
+        """
+Key of a conversion
+        :param dmn_bytes: content of the DMN file
+        :param converter_token: identification of the converter and its options, see GeneralConverter.cache_token
+        :return: hexadecimal hash of the normalized DMN content, the converter and the package version
+        """
+        digest = hashlib.sha256()
+        digest.update(normalize(dmn_bytes))
+        for part in [converter_token, dmnconverter.__version__]:
+            digest.update(b'\0' + part.encode())
+        return digest.hexdigest()
+
+    def fetch(self, key: str, file_name: str) -> bool:
+        """
+Creates file_name from the cache if the key is present. When linking, an existing file_name is removed on a miss, as it
+may be linked to another entry that writing the conversion would change.
+        :param key:
+        :param file_name: output file
+        :return: whether the key was present
+        """
+        path = self.__path(key)
+        try:
+            if self.link:
+                self.__link(path, file_name)
+            else:
+                shutil.copyfile(path, file_name)
+            # mark as recently used
+            os.utime(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            # not present, or evicted by another process in the meantime
+            self.stats.misses += 1
+            if self.link:
+                self.__unlink(file_name)
+            return False
+        self.stats.hits += 1
+        self.stats.bytes_saved += size
+        return True
+
+    def store(self, key: str, file_name: str) -> None:
+        """
+Adds a converted file to the cache and evicts entries if the cache is too large
+        :param key:
+        :param file_name: output file to cache
+        """
+        path = self.__path(key)
+        if self.size is None:
+            self.size = self.__entries_size()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        (handle, temporary) = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(handle)
+        try:
+            shutil.copyfile(file_name, temporary)
+            size = os.path.getsize(temporary)
+            replaced = self.__size(path)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.size += size - replaced
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+Removes the least recently used entries until the cache is within its size limit, and recounts its size
+        """
+        entries = self.__entries()
+        total = sum(size for (_, size, _) in entries)
+        for (_, size, path) in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.size = total
+
+    def __entries(self) -> [(float, int, str)]:
+        """Modification time, size and path of every entry"""
+        entries = []
+        for (directory, _, file_names) in os.walk(self.directory):
+            for file_name in file_names:
+                if not file_name.endswith('.idp'):
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    status = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+        return entries
+
+    def __entries_size(self) -> int:
+        return sum(size for (_, size, _) in self.__entries())
+
+    @staticmethod
+    def __size(path: str) -> int:
+        """Size of a file, 0 if it does not exist"""
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def __unlink(file_name: str) -> None:
+        try:
+            os.remove(file_name)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def __link(path: str, file_name: str) -> None:
+        """
+Hard-links an entry to file_name, replacing an existing file only once the link exists. Copies the entry when the
+cache and the output are on different filesystems.
+        """
+        temporary = file_name + '.' + str(os.getpid()) + '.link'
+        try:
+            os.link(path, temporary)
+        except OSError as error:
+            if error.errno not in [errno.EXDEV, errno.EPERM]:
+                raise
+            shutil.copyfile(path, file_name)
+            return
+        try:
+            os.replace(temporary, file_name)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.idp')
+
+
+def normalize(dmn_bytes: bytes) -> bytes:
+    """
+Removes differences in line endings and trailing whitespace, which do not change the meaning of a DMN file
+    :param dmn_bytes:
+    :return: normalized bytes
+    """
+    return b'\n'.join(line.rstrip() for line in dmn_bytes.strip().splitlines())
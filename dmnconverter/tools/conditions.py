@@ -0,0 +1,104 @@
+"""
+Interpretation of the (comparator, value) rule entries produced by read.unary.
+Used by the tools that work on decision tables directly in python, rather than through IDP.
+"""
+
+# bounds of ranges, e.g. ('[]', '5..8'), translated to comparators
+RANGE_START = {'[': '>=', ']': '>'}
+RANGE_STOP = {'[': '<', ']': '=<'}
+
+
+def entry_cases(entry: (str, str)) -> [[(str, str)]]:
+    """
+Splits a rule entry in its cases, every case being a list of (comparator, value) comparisons that all have to hold.
+The entry matches when one of its cases matches. This mirrors the RuleIn tuples of the meta representation: a list
+gives one case per value and a range gives a single case with two comparisons.
+    :param entry: (comparator, value) tuple, not None
+    :return: list of cases
+    """
+    (comparator, value) = entry
+    if comparator.startswith(('[', ']')):
+        (start, stop) = value.split('..')
+        return [[(RANGE_START[comparator[0]], start), (RANGE_STOP[comparator[1]], stop)]]
+    return [[(comparator, case)] for case in value.split(', ')]
+
+
+def coerce_value(type_ref: str, value: str):
+    """
+Turns a value string of a rule entry into the python value used for comparisons
+    :param type_ref: type of the variable, as in the label dictionaries
+    :param value:
+    :return: int for integer variables, the string itself otherwise
+    """
+    if type_ref == 'integer':
+        return int(value)
+    elif type_ref in ['string', 'boolean']:
+        return value
+    else:
+        raise TypeError('type ' + str(type_ref) + ' unknown')
+
+
+def normalize_input(type_ref: str, value):
+    """
+Brings a given input value in the same form as the values read from the rule entries
+    :param type_ref: type of the variable, as in the label dictionaries
+    :param value: python value, e.g. 3, True or 'light salad'
+    :return: normalized value
+    """
+    if type_ref == 'integer':
+        return int(value)
+    elif type_ref in ['string', 'boolean']:
+        return str(value).strip().replace(' ', '_').strip('_').title()
+    else:
+        raise TypeError('type ' + str(type_ref) + ' unknown')
+
+
+def integer_intervals(entry: (str, str)) -> [(int, int)]:
+    """
+Translates an entry on an integer variable into the closed intervals of values it matches
+    :param entry: (comparator, value) tuple or None
+    :return: list of (start, stop) tuples, with None for an unbounded side. Empty cases are left out.
+    """
+    if entry is None:
+        return [(None, None)]
+    intervals = []
+    for case in entry_cases(entry):
+        (start, stop) = (None, None)
+        for (comparator, value) in case:
+            value = int(value)
+            if comparator in ['=', '>=', '>']:
+                value = value + 1 if comparator == '>' else value
+                start = value if start is None else max(start, value)
+            if comparator in ['=', '=<', '<']:
+                value = value - 1 if comparator == '<' else value
+                stop = value if stop is None else min(stop, value)
+        if start is None or stop is None or start <= stop:
+            intervals.append((start, stop))
+    return intervals
+
+
+def value_set(entry: (str, str)) -> {str}:
+    """
+Translates an entry on a string or boolean variable into the set of values it matches
+    :param entry: (comparator, value) tuple, not None
+    :return: set of values
+    """
+    values = set()
+    for case in entry_cases(entry):
+        for (comparator, value) in case:
+            if comparator != '=':
+                raise ValueError('Comparator ' + comparator + ' not supported for non-integer values')
+            values.add(value)
+    return values
+
+
+def domain_values(type_ref: str, values: str) -> [str]:
+    """
+Lists the values of a string or boolean domain, as stored in the label dictionaries
+    :param type_ref:
+    :param values: comma separated values
+    :return: list of values in the same form as the values of the rule entries
+    """
+    if type_ref not in ['string', 'boolean']:
+        raise TypeError('type ' + str(type_ref) + ' has no enumerated domain')
+    return [normalize_input(type_ref, value) for value in values.split(',')]
@@ -1,3 +1,99 @@
+import hashlib
+import itertools
+import sys
+from array import array
+from collections.abc import Sequence
+
+
+class SymbolTable:
+    """"
+Interns rule entries, so every distinct (comparator, value) tuple is stored only once and referred to by a small
+integer code. Code 0 is reserved for None, an entry without comparison.
+    """
+    __slots__ = ('entries', 'codes')
+
+    def __init__(self):
+        self.entries = [None]
+        self.codes = {None: 0}
+
+    def encode(self, entry) -> int:
+        """
+Returns the code of a rule entry, adding it to the table if needed
+        :param entry: (comparator, value) tuple or None
+        :return: integer code of the entry
+        """
+        try:
+            return self.codes[entry]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable entries, e.g. [comparator, value] lists
+            entry = tuple(entry)
+            if entry in self.codes:
+                return self.codes[entry]
+        if isinstance(entry, tuple):
+            entry = tuple(sys.intern(part) if isinstance(part, str) else part for part in entry)
+        code = len(self.entries)
+        self.entries.append(entry)
+        self.codes[entry] = code
+        return code
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class RuleColumns(Sequence):
+    """"
+Column oriented storage of the entries of all rules, for either the inputs or the outputs of a table.
+Every column is an array of codes into a SymbolTable. Indexing returns the entries of a single rule as a list of
+(comparator, value) tuples, so it can be used like the former 2d list of rule components.
+    :param symbols: SymbolTable the codes refer to
+    :param rules: 2d array of rule components, the first index iterates over the rules
+    :param amount_columns: number of columns, used when there are no rules to count them from
+    """
+    __slots__ = ('symbols', 'columns', 'length')
+
+    def __init__(self, symbols: SymbolTable, rules=(), amount_columns: int = 0):
+        self.symbols = symbols
+        self.length = 0
+        rules = iter(rules)
+        first_rule = next(rules, None)
+        if first_rule is not None:
+            amount_columns = len(first_rule)
+            rules = itertools.chain([first_rule], rules)
+        self.columns = [array('I') for _ in range(amount_columns)]
+        encode = symbols.encode
+        for rule in rules:
+            if len(rule) != amount_columns:
+                raise ValueError('Rule ' + str(self.length + 1) + ' has ' + str(len(rule)) + ' entries, expected ' +
+                                 str(amount_columns))
+            for column, entry in zip(self.columns, rule):
+                column.append(encode(entry))
+            self.length += 1
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, rule_nr):
+        if isinstance(rule_nr, slice):
+            return [self[i] for i in range(*rule_nr.indices(self.length))]
+        if rule_nr < 0:
+            rule_nr += self.length
+        if not 0 <= rule_nr < self.length:
+            raise IndexError('rule index out of range')
+        entries = self.symbols.entries
+        return [entries[column[rule_nr]] for column in self.columns]
+
+    def column(self, column_nr: int) -> list:
+        """
+Returns all entries of a single column (variable)
+        :param column_nr:
+        :return: list of (comparator, value) tuples or None, one for every rule
+        """
+        entries = self.symbols.entries
+        return [entries[code] for code in self.columns[column_nr]]
+
+
 class DecisionTable:
     """"
 Structure to store information about a decision table
@@ -5,17 +101,59 @@ Structure to store information about a decision table
     :param input_label_dict: dictionary of labels and the tuple indicating their domain
     :param output_rule_comp: 2d array of output rule comps
     :param output_label_dict: dictionary of output labels and their domains
+    :param symbols: SymbolTable used to intern the rule entries, e.g. shared by the tables of one read. A new table of
+    its own if None.
+    :param decision_id: id of the decision element of the table
+    :param required_decisions: ids of the decisions this decision requires (informationRequirement)
     """
+    __slots__ = ('ontology', 'table_name', 'hit_policy', 'input_label_dict', 'output_label_dict', 'input_labels',
+                 'output_labels', 'symbols', 'decision_id', 'required_decisions', '_input_rule_comp',
+                 '_output_rule_comp')
 
-    def __init__(self, ontology: str = "", table_name: str = "", hit_policy: str = "", input_label_dict: dict = dict(),
-                 output_label_dict: dict = dict(),
-                 input_rule_comp: [str, str] = [[""], [""]], output_rule_comp: [str, str] = [[""], [""]]):
+    def __init__(self, ontology: str = "", table_name: str = "", hit_policy: str = "", input_label_dict: dict = None,
+                 output_label_dict: dict = None, input_rule_comp: [[(str, str)]] = None,
+                 output_rule_comp: [[(str, str)]] = None, symbols: SymbolTable = None, decision_id: str = "",
+                 required_decisions: [str] = None):
         self.ontology = ontology
         self.table_name = table_name
         self.hit_policy = hit_policy
-        self.input_label_dict = input_label_dict
-        self.output_label_dict = output_label_dict
-        self.input_rule_comp = input_rule_comp
-        self.output_rule_comp = output_rule_comp
-        self.input_labels = list(input_label_dict.keys())
-        self.output_labels = list(output_label_dict.keys())
+        self.input_label_dict = dict() if input_label_dict is None else input_label_dict
+        self.output_label_dict = dict() if output_label_dict is None else output_label_dict
+        self.input_labels = list(self.input_label_dict.keys())
+        self.output_labels = list(self.output_label_dict.keys())
+        self.symbols = SymbolTable() if symbols is None else symbols
+        self.decision_id = decision_id
+        self.required_decisions = [] if required_decisions is None else required_decisions
+        self.input_rule_comp = [] if input_rule_comp is None else input_rule_comp
+        self.output_rule_comp = [] if output_rule_comp is None else output_rule_comp
+
+    @property
+    def input_rule_comp(self) -> RuleColumns:
+        return self._input_rule_comp
+
+    @input_rule_comp.setter
+    def input_rule_comp(self, rules: [[(str, str)]]) -> None:
+        self._input_rule_comp = RuleColumns(self.symbols, rules, len(self.input_labels))
+
+    @property
+    def output_rule_comp(self) -> RuleColumns:
+        return self._output_rule_comp
+
+    @output_rule_comp.setter
+    def output_rule_comp(self, rules: [[(str, str)]]) -> None:
+        self._output_rule_comp = RuleColumns(self.symbols, rules, len(self.output_labels))
+
+    def fingerprint(self) -> str:
+        """
+Hash of everything a conversion depends on, to recognise unchanged tables
+        :return: hexadecimal sha256 digest
+        """
+        content = (self.ontology, self.table_name, self.hit_policy, list(self.input_label_dict.items()),
+                   list(self.output_label_dict.items()), list(self.input_rule_comp), list(self.output_rule_comp))
+        return hashlib.sha256(repr(content).encode()).hexdigest()
+
+    def __reduce__(self):
+        # codes are only meaningful within this process, so tables are pickled with their decoded entries
+        return DecisionTable, (self.ontology, self.table_name, self.hit_policy, self.input_label_dict,
+                               self.output_label_dict, list(self.input_rule_comp), list(self.output_rule_comp), None,
+                               self.decision_id, self.required_decisions)
@@ -0,0 +1,35 @@
+import hashlib
+
+
+def unique_list(values) -> list:
+    """
+Collects the values of an iterable in order, leaving out values that occurred before
+    :param values: iterable of hashable values
+    :return: list of unique values
+    """
+    # dictionaries keep the order of insertion
+    return list(dict.fromkeys(values))
+
+
+def digest(value: str) -> int:
+    """
+Fixed size key of a string, for remembering which strings were seen without keeping them
+    :param value:
+    :return: 128 bit integer
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=16).digest(), 'little')
+
+
+def unique_digests(values) -> "Iterator":
+    """
+Generates the strings of an iterable in order, leaving out strings that were generated before. Only the digests of
+the strings are kept, so memory grows with the amount of unique strings but not with their length.
+    :param values: iterable of strings
+    :return: generator of unique strings
+    """
+    seen = set()
+    for value in values:
+        key = digest(value)
+        if key not in seen:
+            seen.add(key)
+            yield value
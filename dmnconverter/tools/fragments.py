@@ -0,0 +1,61 @@
+"""
+Per-table fragments of a conversion, for incremental reconversion of networks of tables.
+
+Fragments are keyed on DecisionTable.fingerprint, so after a change only the changed tables are converted again and
+the output is stitched together from the fragments of the other tables.
+"""
+
+
+class FragmentCache:
+    """"
+Fragments of the tables of the last conversion, by fingerprint
+    """
+
+    def __init__(self):
+        self.fragments = dict()
+        self.context = None
+        self.rebuilt = 0
+        self.reused = 0
+
+    def collect(self, decision_tables, build, context=None, reusable=None) -> list:
+        """
+Fragments of every table, only building the fragments of tables that were not in the previous conversion.
+Fragments of tables that are no longer present are dropped.
+        :param decision_tables: iterable of DecisionTable objects
+        :param build: function from a DecisionTable to its fragments. The fragments are kept, so they must not be
+        one-shot iterators
+        :param context: hashable value of everything besides the table that the fragments depend on, e.g. ranges
+        inferred over the whole network. All fragments are rebuilt when it differs from the previous conversion.
+        :param reusable: function from the kept fragments of a table to whether they can be used in this conversion,
+        called in the order of the tables. All kept fragments are used if None.
+        :return: list of fragments, in the order of the tables
+        """
+        if context != self.context:
+            self.fragments = dict()
+            self.context = context
+        fragments = dict()
+        collected = []
+        for decision_table in decision_tables:
+            fingerprint = decision_table.fingerprint()
+            if fingerprint in fragments:
+                table_fragments = fragments[fingerprint]
+                self.reused += 1
+            elif fingerprint in self.fragments and (reusable is None or reusable(self.fragments[fingerprint])):
+                table_fragments = self.fragments[fingerprint]
+                self.reused += 1
+            else:
+                table_fragments = build(decision_table)
+                self.rebuilt += 1
+            fragments[fingerprint] = table_fragments
+            collected.append(table_fragments)
+        self.fragments = fragments
+        return collected
+
+
+def materialize(lines) -> [str]:
+    """
+Turns lines into a list of strings, joining lines given as fragments (see tools.print.write_idp)
+    :param lines: iterable of strings or of iterables of string fragments
+    :return: list of strings
+    """
+    return [line if isinstance(line, str) else ''.join(line) for line in lines]
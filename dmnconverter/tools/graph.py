@@ -0,0 +1,116 @@
+"""
+Dependency graph of the decisions of a network.
+
+A decision depends on the decisions it lists as informationRequirement, and on every decision with an output label
+that is one of its input labels. The graph only keeps the names, ids and labels of the tables, so it can be built from a
+stream of tables (see read.XML.TableStream) without keeping them in memory. It is used to order the decisions and to
+convert only the decisions needed for some requested outputs:
+    graph = DecisionGraph(read_tables('chainBBQ.dmn'))
+    graph.topological_order()
+    graph.closure(['Dish'])
+"""
+from dmnconverter.tools.decisiontable import DecisionTable
+
+
+class DecisionGraph:
+    """"
+Decisions of a network and the decisions each of them depends on
+    :param decision_tables: iterable of DecisionTable objects
+    """
+
+    def __init__(self, decision_tables=()):
+        # table names in document order
+        self.names = []
+        self.ids = dict()
+        self.requirements = dict()
+        self.input_labels = dict()
+        self.producers = dict()
+        for dmn_table in decision_tables:
+            self.add_table(dmn_table)
+
+    def add_table(self, dmn_table: DecisionTable) -> None:
+        """
+Adds a decision to the graph
+        :param dmn_table: DecisionTable
+        """
+        name = dmn_table.table_name
+        if name in self.requirements:
+            raise ValueError('Decision ' + name + ' occurs more than once')
+        self.names.append(name)
+        if dmn_table.decision_id:
+            self.ids[dmn_table.decision_id] = name
+        self.requirements[name] = list(dmn_table.required_decisions)
+        self.input_labels[name] = list(dmn_table.input_labels)
+        for label in dmn_table.output_labels:
+            self.producers.setdefault(label, []).append(name)
+
+    def dependencies(self, name: str) -> [str]:
+        """
+Decisions a decision directly depends on
+        :param name: name of the decision table
+        :return: list of table names, required decisions first and then the producers of its inputs
+        """
+        dependencies = []
+        for decision_id in self.requirements[name]:
+            if decision_id not in self.ids:
+                raise ValueError('Decision ' + name + ' requires unknown decision ' + decision_id)
+            dependencies.append(self.ids[decision_id])
+        for label in self.input_labels[name]:
+            dependencies.extend(self.producers.get(label, []))
+        return [dependency for (index, dependency) in enumerate(dependencies)
+                if dependency != name and dependency not in dependencies[:index]]
+
+    def topological_order(self) -> [str]:
+        """
+Orders the decisions so every decision comes after the decisions it depends on, keeping the document order otherwise
+        :return: list of table names
+        """
+        dependencies = {name: self.dependencies(name) for name in self.names}
+        order = []
+        placed = set()
+        remaining = list(self.names)
+        while remaining:
+            ready = [name for name in remaining if all(dependency in placed for dependency in dependencies[name])]
+            if not ready:
+                raise ValueError('Decisions ' + ', '.join(remaining) + ' depend on each other in a cycle')
+            order.extend(ready)
+            placed.update(ready)
+            remaining = [name for name in remaining if name not in placed]
+        return order
+
+    def closure(self, goals: [str]) -> {str}:
+        """
+Decisions needed to decide the goals
+        :param goals: names of decision tables or output labels
+        :return: set of table names, the goals and everything they depend on directly or indirectly
+        """
+        pending = []
+        for goal in goals:
+            if goal in self.requirements:
+                pending.append(goal)
+            elif goal in self.producers:
+                pending.extend(self.producers[goal])
+            else:
+                raise ValueError('Goal ' + str(goal) + ' is neither a decision nor an output of a decision')
+        needed = set()
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.dependencies(name))
+        return needed
+
+
+class TableSelection:
+    """"
+Re-iterable view on the tables of a re-iterable (e.g. read.XML.TableStream) with a name in a given set
+    :param decision_tables: re-iterable of DecisionTable objects
+    :param names: set of table names
+    """
+
+    def __init__(self, decision_tables, names: {str}):
+        self.decision_tables = decision_tables
+        self.names = names
+
+    def __iter__(self):
+        return (dmn_table for dmn_table in self.decision_tables if dmn_table.table_name in self.names)
@@ -0,0 +1,284 @@
+"""
+Opt-in instrumentation of the stages of a conversion.
+
+Code under measurement opens stages with Instrument.stage, which can be nested. Every closed stage is handed to a sink,
+a callable taking a StageRecord, with its wall time, CPU time, net allocated bytes and item counts (e.g. rules, cells
+or lines). NULL_INSTRUMENT is used when nothing is measured, its stages do nothing. FlameReporter is a sink that prints
+a breakdown per stage and table:
+    reporter = FlameReporter()
+    converter = DMNConverter(instrument=Instrument(reporter, allocations=True))
+    converter.read('network.dmn')
+    converter.print_meta('network.idp')
+    reporter.report()
+"""
+import inspect
+import sys
+import time
+
+
+class StageRecord:
+    """"
+Measurements of one finished stage
+    :param path: tuple of the labels of the enclosing stages and of this stage, outermost first
+    :param table: name of the decision table the stage worked on, or None
+    :param wall: wall time in seconds
+    :param cpu: CPU time of the process in seconds
+    :param allocated: net allocated bytes, None if allocations are not traced
+    :param counts: dictionary of item counts by name
+    """
+    __slots__ = ('path', 'table', 'wall', 'cpu', 'allocated', 'counts')
+
+    def __init__(self, path: tuple, table: str, wall: float, cpu: float, allocated: int, counts: dict):
+        self.path = path
+        self.table = table
+        self.wall = wall
+        self.cpu = cpu
+        self.allocated = allocated
+        self.counts = counts
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+
+class Stage:
+    """"
+Context manager of a stage that is being measured, created by Instrument.stage
+    """
+    __slots__ = ('instrument', 'label', 'table', 'counts', 'wall', 'cpu', 'allocated')
+
+    def __init__(self, instrument: "Instrument", name: str, table: str = None):
+        self.instrument = instrument
+        self.label = name if table is None else name + '[' + table + ']'
+        self.table = table
+        self.counts = dict()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+Adds to an item count of this stage
+        :param name: e.g. 'rules', 'cells' or 'lines'
+        :param amount:
+        """
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def counted(self, items, name: str) -> "Iterator":
+        """
+Passes the items of an iterable through, counting them under the given name
+        :param items: iterable
+        :param name:
+        :return: generator of the same items
+        """
+        for item in items:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            yield item
+
+    def __enter__(self):
+        self.instrument.stack.append(self.label)
+        self.allocated = self.instrument.traced_memory()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        allocated = None
+        if self.allocated is not None:
+            allocated = self.instrument.traced_memory() - self.allocated
+        path = tuple(self.instrument.stack)
+        self.instrument.stack.pop()
+        self.instrument.sink(StageRecord(path, self.table, wall, cpu, allocated, self.counts))
+        return False
+
+
+class NullStage:
+    """"
+Stage that measures nothing, shared by all stages of NULL_INSTRUMENT
+    """
+    __slots__ = ()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def counted(self, items, name: str):
+        return items
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class Instrument:
+    """"
+Measures stages and hands them to a sink
+    :param sink: callable taking a StageRecord of every finished stage
+    :param allocations: also measure allocated bytes, with tracemalloc. Tracing is started if it was not running and
+    slows down the measured code considerably.
+    """
+    enabled = True
+
+    def __init__(self, sink, allocations: bool = False):
+        self.sink = sink
+        self.allocations = allocations
+        self.stack = []
+        self.tracemalloc = None
+        if allocations:
+            # only imported when needed, as it is rarely used outside of measurements
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def stage(self, name: str, table: str = None) -> Stage:
+        """
+Context manager measuring a stage
+        :param name: name of the stage
+        :param table: name of the decision table the stage works on, if any
+        :return: Stage, to add item counts to
+        """
+        return Stage(self, name, table)
+
+    def traced_memory(self) -> int:
+        """Currently allocated bytes, None if allocations are not measured"""
+        if self.tracemalloc is None:
+            return None
+        return self.tracemalloc.get_traced_memory()[0]
+
+    def call(self, name: str, table: str, function, *args):
+        """
+Calls a function in a stage, counting the items of its result as 'items' if it is a list. The iteration of generator
+functions is measured instead, as they only do their work while they are iterated (see iterate).
+        :param name: name of the stage
+        :param table: name of the decision table, if any
+        :param function:
+        :param args: arguments of the function
+        :return: result of the function
+        """
+        if inspect.isgeneratorfunction(function):
+            return self.iterate(name, table, function, *args)
+        with self.stage(name, table) as stage:
+            result = function(*args)
+            if isinstance(result, list):
+                stage.count('items', len(result))
+        return result
+
+    def iterate(self, name: str, table: str, function, *args) -> "Iterator":
+        """
+Calls a function returning an iterable, e.g. a generator, and passes its items through. The call and the production of
+the items are measured as a stage, the items are counted as 'items'. The time the consumer takes between the items is
+not measured. The stage is recorded once the iteration ends, below the stages that are open at that time.
+        :param name: name of the stage
+        :param table: name of the decision table, if any
+        :param function:
+        :param args: arguments of the function
+        :return: generator of the items of the result of the function
+        """
+        stage = Stage(self, name, table)
+        (wall, cpu, allocated) = (0.0, 0.0, None)
+        iterator = None
+        try:
+            while True:
+                self.stack.append(stage.label)
+                start_allocated = self.traced_memory()
+                start_cpu = time.process_time()
+                start_wall = time.perf_counter()
+                try:
+                    if iterator is None:
+                        iterator = iter(function(*args))
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    wall += time.perf_counter() - start_wall
+                    cpu += time.process_time() - start_cpu
+                    if start_allocated is not None:
+                        allocated = (allocated or 0) + self.traced_memory() - start_allocated
+                    self.stack.pop()
+                stage.count('items')
+                yield item
+        finally:
+            self.sink(StageRecord(tuple(self.stack) + (stage.label,), table, wall, cpu, allocated, stage.counts))
+
+
+class NullInstrument:
+    """"
+Instrument that measures nothing, the default of all instrumented code
+    """
+    enabled = False
+    __stage = NullStage()
+
+    def stage(self, name: str, table: str = None) -> NullStage:
+        return self.__stage
+
+    def call(self, name: str, table: str, function, *args):
+        return function(*args)
+
+    def iterate(self, name: str, table: str, function, *args):
+        return function(*args)
+
+
+NULL_INSTRUMENT = NullInstrument()
+
+
+class FlameReporter:
+    """"
+Sink that aggregates records by path, printing a tree with the share of every stage in the total wall time
+    """
+
+    def __init__(self):
+        self.totals = dict()
+        self.order = []
+
+    def __call__(self, record: StageRecord) -> None:
+        if record.path not in self.totals:
+            self.totals[record.path] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'allocated': None, 'counts': dict()}
+            self.order.append(record.path)
+        total = self.totals[record.path]
+        total['calls'] += 1
+        total['wall'] += record.wall
+        total['cpu'] += record.cpu
+        if record.allocated is not None:
+            total['allocated'] = (total['allocated'] or 0) + record.allocated
+        for name, amount in record.counts.items():
+            total['counts'][name] = total['counts'].get(name, 0) + amount
+
+    def report(self, file=None, width: int = 30) -> None:
+        """
+Prints every stage below its enclosing stage, with a bar of its share in the wall time of the outermost stages
+        :param file: file-like object, sys.stdout if None
+        :param width: width of a bar for 100%
+        """
+        file = sys.stdout if file is None else file
+        overall = sum(self.totals[path]['wall'] for path in self.order if len(path) == 1) or 1.0
+        # children are recorded before their parents, so sort on the paths of the first appearances
+        position = {path: index for (index, path) in enumerate(self.order)}
+        paths = sorted(self.order,
+                       key=lambda path: [position.get(path[:depth], 0) for depth in range(1, len(path) + 1)])
+        for path in paths:
+            total = self.totals[path]
+            share = total['wall'] / overall
+            label = '  ' * (len(path) - 1) + path[-1]
+            bar = '#' * int(round(share * width))
+            details = ['{:6.1%}'.format(share), 'wall {:.4f}s'.format(total['wall']),
+                       'cpu {:.4f}s'.format(total['cpu'])]
+            if total['allocated'] is not None:
+                details.append('alloc {:,}B'.format(total['allocated']))
+            if total['calls'] > 1:
+                details.append('calls ' + str(total['calls']))
+            details.extend(name + ' ' + str(amount) for (name, amount) in total['counts'].items())
+            print(label.ljust(40) + ' ' + bar.ljust(width) + ' ' + '  '.join(details), file=file)
+
+    def folded(self) -> [str]:
+        """
+Self time of every stage in the folded format of flame graph tools ('outer;inner microseconds')
+        :return: list of strings
+        """
+        lines = []
+        for path in self.order:
+            children = sum(self.totals[child]['wall'] for child in self.order
+                           if len(child) == len(path) + 1 and child[:-1] == path)
+            self_time = max(self.totals[path]['wall'] - children, 0.0)
+            lines.append(';'.join(path) + ' ' + str(int(round(self_time * 1e6))))
+        return lines
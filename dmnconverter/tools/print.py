@@ -1,34 +1,73 @@
-def print_idp(file_name: str, vocabulary_strings: list, theory_strings: list, structure_strings: list) -> None:
+def print_idp(file_name, vocabulary_strings, theory_strings, structure_strings) -> None:
     """Takes all contents of vocab and theory as list of strings and prints it as IDP code in file_name
-    :param file_name: Name of output file
-    :param vocabulary_strings: list of strings, with every string denoting one line in the vocabulary
-    :param theory_strings: list of strings, with every string denoting one line in the theory
-    :param structure_strings: list of strings, with every string denoting one line in the structure
+    :param file_name: Name of output file, or an open file-like object (e.g. sys.stdout or from gzip.open) to write to
+    :param vocabulary_strings: iterable of strings, with every string denoting one line in the vocabulary
+    :param theory_strings: iterable of strings, with every string denoting one line in the theory
+    :param structure_strings: iterable of strings, with every string denoting one line in the structure
+    """
+    if hasattr(file_name, 'write'):
+        write_idp(file_name, vocabulary_strings, theory_strings, structure_strings)
+    else:
+        with open(file_name, 'w') as text_file:
+            write_idp(text_file, vocabulary_strings, theory_strings, structure_strings)
+
+
+def write_idp(sink, vocabulary_strings, theory_strings, structure_strings) -> None:
+    """
+Writes IDP code line by line to a file-like object, so the sections are never held in memory as a whole.
+A line is either a string or an iterable of string fragments, which are written one after the other. This allows
+single lines, such as large structure enumerations, to be generated while writing.
+    :param sink: file-like object opened for writing text
+    :param vocabulary_strings: iterable of lines in the vocabulary
+    :param theory_strings: iterable of lines in the theory
+    :param structure_strings: iterable of lines in the structure
     """
     # Header
     # TODO make header for transformed files?
     # start with vocab
-    lines = ['vocabulary V{']
-    lines.extend(__indent(vocabulary_strings))
+    __write_lines(sink, ['vocabulary V{'])
+    __write_lines(sink, vocabulary_strings, '\t')
     # end vocab and start theory
-    lines.extend(['}', '\n', 'theory T:V {'])
-    lines.extend(__indent(theory_strings))
-    lines.append('}')
+    __write_lines(sink, ['}', '\n', 'theory T:V {'])
+    __write_lines(sink, theory_strings, '\t')
+    __write_lines(sink, ['}'])
     # Structure
-    lines.extend(['\n', 'structure S:V{'])
-    lines.extend(__indent(structure_strings))
-    lines.extend(['', '\t // INSERT INPUT HERE', '}'])
+    __write_lines(sink, ['\n', 'structure S:V{'])
+    __write_lines(sink, structure_strings, '\t')
+    __write_lines(sink, ['', '\t // INSERT INPUT HERE', '}'])
     # main
-    lines.extend(['\n', 'procedure main(){', 'stdoptions.nbmodels=200', 'printmodels(modelexpand(T,S))', '}'])
-    with open(file_name, 'w') as text_file:
-        print('\n'.join(lines), file=text_file)
+    __write_lines(sink, ['\n', 'procedure main(){', 'stdoptions.nbmodels=200', 'printmodels(modelexpand(T,S))', '}'])
+
+
+def enumeration(predicate: str, values) -> "Iterator":
+    """
+Builds the line of a structure that enumerates a predicate, as fragments to be written by write_idp
+    :param predicate: name of the predicate
+    :param values: iterable of strings, every string denoting one element or tuple
+    :return: generator of fragments of the line 'predicate = {value; value}'
+    """
+    yield predicate + " = {"
+    separator = ''
+    for value in values:
+        yield separator
+        yield value
+        separator = '; '
+    yield "}"
 
 
-def __indent(text: list) -> list:
+def __write_lines(sink, lines, indent: str = '') -> None:
     """
-Adds 1-tab indentation to a list of strings
-    :param text:
-    :return:
+Writes every line followed by a newline
+    :param sink:
+    :param lines: iterable of strings or of iterables of string fragments
+    :param indent: prefix of every line
     """
-    indented = ['\t' + line for line in text]
-    return indented
+    write = sink.write
+    for line in lines:
+        write(indent)
+        if isinstance(line, str):
+            write(line)
+        else:
+            for fragment in line:
+                write(fragment)
+        write('\n')
@@ -0,0 +1,153 @@
+"""
+Inference of the integer values the meta representations have to consider, instead of a fixed ModelInt.
+
+An integer variable is only compared with the constants in the rule entries, so all values between two consecutive
+constants behave the same. Besides tight bounds per variable, a compressed set of values can be built: the constants,
+the value right after every constant and the lower bound. Every class of equivalent values has a representative in
+this set, which stays true when the sets of several tables are merged.
+"""
+from dmnconverter.tools import conditions
+from dmnconverter.tools import texttools as text_tools
+
+# bounds of integer variables without constants or override
+DEFAULT_BOUNDS = (0, 0)
+
+
+class IntegerRanges:
+    """"
+Constants, bounds and compressed values of the integer variables of one or more decision tables
+    :param decision_tables: iterable of DecisionTable objects
+    :param overrides: dictionary of labels and (start, stop) tuples, replacing the inferred bounds of those variables
+    :param margin: distance of the inferred bounds to the smallest and largest constant of a variable
+    """
+
+    def __init__(self, decision_tables=(), overrides: dict = None, margin: int = 1):
+        self.overrides = dict()
+        for (label, bounds) in (dict() if overrides is None else overrides).items():
+            try:
+                (start, stop) = (int(bounds[0]), int(bounds[1]))
+            except (TypeError, ValueError, IndexError):
+                raise ValueError('Range of ' + str(label) + ' should be a (start, stop) tuple of integers, not ' +
+                                 repr(bounds)) from None
+            if start > stop:
+                raise ValueError('Range of ' + str(label) + ' starts at ' + str(start) + ', above its stop ' +
+                                 str(stop))
+            self.overrides[label] = (start, stop)
+        self.margin = margin
+        self.constants = dict()
+        for dmn_table in decision_tables:
+            self.add_table(dmn_table)
+
+    def add_table(self, dmn_table) -> None:
+        """
+Adds the constants of the integer inputs and outputs of a table
+        :param dmn_table: DecisionTable
+        """
+        for (label_dict, rules) in [(dmn_table.input_label_dict, dmn_table.input_rule_comp),
+                                    (dmn_table.output_label_dict, dmn_table.output_rule_comp)]:
+            for (column_nr, (label, (type_ref, _))) in enumerate(label_dict.items()):
+                if type_ref != 'integer':
+                    continue
+                constants = self.constants.setdefault(label, set())
+                for entry in rules.column(column_nr):
+                    if entry is not None:
+                        constants.update(int(value) for case in conditions.entry_cases(entry) for (_, value) in case)
+
+    def labels(self) -> [str]:
+        """Labels of all integer variables, including the overridden ones"""
+        return list(self.constants) + [label for label in self.overrides if label not in self.constants]
+
+    def bounds(self, label: str) -> (int, int):
+        """
+Inclusive bounds of the values of an integer variable
+        :param label:
+        :return: the override of the variable, or the constants widened by the margin
+        """
+        if label in self.overrides:
+            (start, stop) = self.overrides[label]
+            return int(start), int(stop)
+        constants = self.constants.get(label)
+        if not constants:
+            return DEFAULT_BOUNDS
+        return min(constants) - self.margin, max(constants) + self.margin
+
+    def points(self, label: str) -> [int]:
+        """
+Compressed values of an integer variable: at least one value of every class of values that no rule entry can tell
+apart, within the bounds of the variable
+        :param label:
+        :return: sorted list of integers
+        """
+        (start, stop) = self.bounds(label)
+        constants = self.constants.get(label, set())
+        candidates = {start} | constants | {constant + 1 for constant in constants}
+        return sorted(value for value in candidates if start <= value <= stop)
+
+    def maximum(self) -> int:
+        """Largest integer any variable or constant can take, 0 if there are no integer variables"""
+        values = [self.bounds(label)[1] for label in self.labels()]
+        values.extend(constant for constants in self.constants.values() for constant in constants)
+        return max(values, default=0)
+
+    def model_ints(self, compress: bool, labels: [str] = None) -> [str]:
+        """
+Elements of the ModelInt type: all constants, and all values or the compressed values of the variables
+        :param compress: use the compressed values instead of all values within the bounds
+        :param labels: variables to include, all if None
+        :return: list of strings, consecutive values are written as ranges, e.g. ['0..3', '7']
+        """
+        known = self.labels()
+        labels = known if labels is None else [label for label in labels if label in known]
+        intervals = [(constant, constant) for label in labels for constant in self.constants.get(label, ())]
+        for label in labels:
+            if compress:
+                intervals.extend((value, value) for value in self.points(label))
+            else:
+                intervals.append(self.bounds(label))
+        return [str(start) if start == stop else str(start) + '..' + str(stop) for (start, stop) in runs(intervals)]
+
+    def structure(self, label_dict: dict, compress: bool, quote=text_tools.enquote) -> ([str], [str]):
+        """
+Domain and Range elements of the integer variables in a dictionary of labels
+        :param label_dict: dictionary of labels and (type_ref, values) tuples
+        :param compress: enumerate the compressed values as Domain instead of giving the bounds as Range. Compressed
+        values without gaps are given as Range as well, which is the same restriction in one element.
+        :param quote: function writing a label as an element of the structure
+        :return: tuple of lists of strings, the Domain and Range elements
+        """
+        domain = []
+        ranges = []
+        for label, (type_ref, _) in label_dict.items():
+            if type_ref != 'integer':
+                continue
+            variable = quote(str(label))
+            if compress:
+                points = self.points(label)
+                if points[-1] - points[0] + 1 != len(points):
+                    domain.extend(variable + ',' + str(value) for value in points)
+                    continue
+                (start, stop) = (points[0], points[-1])
+            else:
+                (start, stop) = self.bounds(label)
+            ranges.append(variable + ',' + str(start) + ',' + str(stop))
+        return domain, ranges
+
+    def key(self) -> tuple:
+        """Hashable summary of the constants and bounds, which changes whenever the generated structures change"""
+        return tuple((label, self.bounds(label), tuple(sorted(self.constants.get(label, ()))))
+                     for label in sorted(self.labels()))
+
+
+def runs(intervals: [(int, int)]) -> [(int, int)]:
+    """
+Merges overlapping and adjacent closed intervals
+    :param intervals: iterable of (start, stop) tuples
+    :return: sorted list of disjoint (start, stop) tuples
+    """
+    merged = []
+    for (start, stop) in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
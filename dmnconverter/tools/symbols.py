@@ -0,0 +1,207 @@
+"""
+Integer encoding of the labels, string values and table names in the structures of the meta representations.
+
+Instead of quoted strings, which IDP has to intern while grounding, every symbol is written as an integer code. The
+codes are dense and start at a power of ten above every integer of ModelInt, so they never collide with integer
+values. The types of variables and tables become integer types, Value holds both integers and codes:
+    type Variable isa int
+    Domain = {100,101; 100,102; 103,0; 103,1}
+The codes are listed in comments at the end of the structure, e.g. '// symbol 100 "Season"', and models found by IDP
+are decoded with the vocabulary of the program:
+    symbols = read_symbols('bbq.idp')
+    symbols.decode_models(parse_models(output))
+"""
+import re
+
+from dmnconverter.tools import texttools as text_tools
+
+# types whose elements are all codes, declared as integer types when encoding
+ENCODED_TYPES = ('Variable', 'TableName')
+# types holding both integers and codes
+MIXED_TYPES = ('Value',)
+
+_SYMBOL_PATTERN = re.compile(r'^\s*// symbol (-?\d+) "(.*)"\s*$')
+_TYPE_PATTERN = re.compile(r'^type\s+(\w+)(?:\s+isa\s+(\w+))?')
+_DECLARATION_PATTERN = re.compile(r'^(\w+)\s*(?:\(([^)]*)\))?\s*(?::\s*(\w+))?\s*(?://.*)?$')
+
+
+class SymbolEncoding:
+    """"
+Codes of the symbols of one or more structures
+    :param offset: first code, above every integer the structures contain (see symbol_offset)
+    """
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        # code of every symbol, as written in the structure
+        self.codes = dict()
+        self.names = dict()
+        # symbols of the vocabulary, with whether every argument and the value can hold codes
+        self.signatures = dict()
+        # dictionary of the quoted symbols in the order they were first quoted, while recording (see record)
+        self.recorded = None
+
+    def quote(self, name: str) -> str:
+        """
+Code of a symbol, assigning the next code to a new symbol
+        :param name: label, string value or table name
+        :return: code as written in the structure
+        """
+        if self.recorded is not None:
+            self.recorded[name] = None
+        code = self.codes.get(name)
+        if code is None:
+            self.names[self.offset + len(self.codes)] = name
+            code = self.codes[name] = str(self.offset + len(self.codes))
+        return code
+
+    def record(self, function, *args) -> (object, [(str, str)]):
+        """
+Calls a function, recording the symbols it quotes
+        :param function: function quoting symbols with this encoding, it must not be a generator
+        :param args: arguments of the function
+        :return: tuple of the result of the function and a list of (name, code) tuples of the quoted symbols, in the
+        order they were first quoted
+        """
+        self.recorded = dict()
+        try:
+            result = function(*args)
+            return result, [(name, self.codes[name]) for name in self.recorded]
+        finally:
+            self.recorded = None
+
+    def declare(self, vocabulary: [str]) -> [str]:
+        """
+Declares the encoded types as integer types and remembers which arguments of every symbol hold codes
+        :param vocabulary: lines of the vocabulary
+        :return: lines of the vocabulary with the encoded types
+        """
+        encoded = []
+        for line in vocabulary:
+            match = _TYPE_PATTERN.match(line.strip())
+            if match is not None and match.group(1) in ENCODED_TYPES and match.group(2) is None:
+                line = line.rstrip() + ' isa int'
+            encoded.append(line)
+        self.signatures = signatures(encoded)
+        return encoded
+
+    def comments(self) -> "Iterator":
+        """
+Comments listing the codes, to end the structure with
+        :return: generator of lines
+        """
+        for (code, name) in self.names.items():
+            yield '// symbol ' + str(code) + ' ' + text_tools.enquote(name)
+
+    def decode(self, code):
+        """
+Symbol of a code
+        :param code: int as parsed by solve.models
+        :return: name of the symbol, or the value itself if it is no code
+        """
+        return self.names.get(code, code) if isinstance(code, int) else code
+
+    def decode_model(self, model: dict) -> dict:
+        """
+Replaces the codes in a model by their symbols, only in the arguments and values that can hold codes
+        :param model: dictionary as made by solve.models.parse_models
+        :return: new dictionary
+        """
+        decoded = dict()
+        for (symbol, interpretation) in model.items():
+            if symbol not in self.signatures:
+                decoded[symbol] = interpretation
+                continue
+            (arguments, value) = self.signatures[symbol]
+            if isinstance(interpretation, dict):
+                decoded[symbol] = {self.__decode_arguments(key, arguments): self.decode(result) if value else result
+                                   for (key, result) in interpretation.items()}
+            elif isinstance(interpretation, set):
+                decoded[symbol] = {self.__decode_arguments(key, arguments) for key in interpretation}
+            else:
+                decoded[symbol] = self.decode(interpretation) if value else interpretation
+        return decoded
+
+    def decode_models(self, models: [dict]) -> [dict]:
+        """
+Decodes every model, see decode_model
+        :param models: list of dictionaries as made by solve.models.parse_models
+        """
+        return [self.decode_model(model) for model in models]
+
+    def __decode_arguments(self, key, arguments: [bool]):
+        if isinstance(key, tuple):
+            return tuple(self.decode(element) if encoded else element for (element, encoded) in zip(key, arguments))
+        return self.decode(key) if arguments and arguments[0] else key
+
+
+def symbol_offset(maximum: int) -> int:
+    """
+First code of the symbols
+    :param maximum: largest integer in the structure, e.g. IntegerRanges.maximum
+    :return: smallest power of ten above maximum, at least 10
+    """
+    return 10 ** len(str(max(maximum, 0) + 1))
+
+
+def signatures(vocabulary: [str]) -> dict:
+    """
+Finds the arguments and values of the symbols of a vocabulary that can hold codes
+    :param vocabulary: lines of the vocabulary
+    :return: dictionary of symbol names and tuples of a list of booleans (one per argument) and a boolean for the value
+    """
+    declarations = [line.strip() for line in vocabulary]
+    parents = dict()
+    for line in declarations:
+        match = _TYPE_PATTERN.match(line)
+        if match is not None:
+            parents[match.group(1)] = match.group(2)
+
+    def holds_codes(type_name: str) -> bool:
+        while type_name is not None:
+            if type_name in ENCODED_TYPES or type_name in MIXED_TYPES:
+                return True
+            type_name = parents.get(type_name)
+        return False
+
+    found = dict()
+    for line in declarations:
+        if line.startswith('type') or line.startswith('//'):
+            continue
+        match = _DECLARATION_PATTERN.match(line)
+        if match is None:
+            continue
+        arguments = [holds_codes(argument.strip()) for argument in (match.group(2) or '').split(',')
+                     if argument.strip()]
+        found[match.group(1)] = (arguments, holds_codes(match.group(3)))
+    return found
+
+
+def read_symbols(file_name) -> SymbolEncoding:
+    """
+Reads the codes and the vocabulary of an IDP program written with encoded symbols
+    :param file_name: IDP file
+    :return: SymbolEncoding to decode the models of the program
+    """
+    vocabulary = []
+    names = dict()
+    section = None
+    with open(file_name) as idp_file:
+        for line in idp_file:
+            stripped = line.strip()
+            if stripped.startswith('vocabulary'):
+                section = 'vocabulary'
+            elif stripped == '}':
+                section = None
+            elif section == 'vocabulary':
+                vocabulary.append(stripped)
+            else:
+                match = _SYMBOL_PATTERN.match(line)
+                if match is not None:
+                    names[int(match.group(1))] = match.group(2)
+    encoding = SymbolEncoding(min(names, default=0))
+    for (code, name) in sorted(names.items()):
+        encoding.names[code] = name
+        encoding.codes[name] = str(code)
+    encoding.signatures = signatures(vocabulary)
+    return encoding
@@ -1,26 +1,76 @@
 # File contains some translation operations that are more general and are used in multiple representations
-import itertools
 from abc import ABC, abstractmethod
 
-from boltons.setutils import IndexedSet
-
 import dmnconverter.tools.print as printer
 from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.dedupe import unique_list
+from dmnconverter.tools.fragments import FragmentCache, materialize
+from dmnconverter.tools.graph import DecisionGraph, TableSelection
+from dmnconverter.tools.instrument import NULL_INSTRUMENT
+
+
+def reiterable(decision_tables) -> "Iterable":
+    """
+Makes sure the decision tables can be iterated more than once
+    :param decision_tables: iterable of DecisionTable objects
+    :return: the iterable itself if it is not a one-shot iterator, otherwise a list of its tables
+    """
+    if iter(decision_tables) is decision_tables:
+        return list(decision_tables)
+    return decision_tables
 
 
 class GeneralConverter(ABC):
-    def __init__(self):
-        pass
+    def __init__(self, incremental: bool = False, instrument=None):
+        """
+        :param incremental: keep the fragments of every table, so converting a changed network again only rebuilds
+        the changed tables. Only supported by converters of networks (DirectConverter and MetaConverter).
+        :param instrument: tools.instrument.Instrument measuring the stages of the conversion
+        """
+        self.fragments = FragmentCache() if incremental else None
+        self.instrument = NULL_INSTRUMENT if instrument is None else instrument
 
-    def print_file(self, file_name, dmn_tables: [DecisionTable]) -> None:
+    def print_file(self, file_name, dmn_tables: [DecisionTable], goals: [str] = None) -> None:
         # Translate vocabulary
         """
         Print table as a txt file in the correct framework
         :param file_name: name of output file
-        :param dmn_tables: list of classes containing all info about the current decisiontable
+        :param dmn_tables: iterable of classes containing all info about the current decisiontable
+        :param goals: names of decisions or output labels, only the tables needed for them are converted. Only
+        supported by converters of networks (DirectConverter and MetaConverter).
         """
-        (vocabulary, theory, structure) = self.convert(dmn_tables)
-        printer.print_idp(file_name, vocabulary, theory, structure)
+        instrument = self.instrument
+        with instrument.stage('convert'):
+            if goals is None:
+                (vocabulary, theory, structure) = self.convert(dmn_tables)
+            else:
+                (vocabulary, theory, structure) = self.convert(dmn_tables, goals)
+        # lines are mostly generated while writing, so the stages of single tables are nested in this one
+        with instrument.stage('write') as stage:
+            sections = [stage.counted(section, 'lines') for section in (vocabulary, theory, structure)]
+            printer.print_idp(file_name, *sections)
+
+    def cache_token(self) -> str:
+        """
+Identifies this converter and the options that influence its output, used in the keys of tools.cache.ConversionCache
+        :return: string
+        """
+        return type(self).__module__ + '.' + type(self).__qualname__
+
+    def required_tables(self, decision_tables, goals: [str]) -> "Iterable":
+        """
+Leaves out the tables that are not needed to decide the goals, see tools.graph.DecisionGraph
+        :param decision_tables: re-iterable of DecisionTable objects
+        :param goals: names of decisions or output labels
+        :return: list of the needed tables if decision_tables is a list, otherwise a re-iterable view, in the order of
+        decision_tables
+        """
+        with self.instrument.stage('goals') as stage:
+            needed = DecisionGraph(decision_tables).closure(goals)
+            stage.count('tables', len(needed))
+        if isinstance(decision_tables, list):
+            return [dmn_table for dmn_table in decision_tables if dmn_table.table_name in needed]
+        return TableSelection(decision_tables, needed)
 
     def print_base_file(self, file_name) -> None:
         """
@@ -37,7 +87,7 @@ Prints file without reference to a specific decision table, so voc and theory wi
     def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
         """
 Convert a given decision table into the required format
-        :rtype: 3-tuple containing vocabulary, theory and structure, each as a list of strings
+        :rtype: 3-tuple containing vocabulary, theory and structure, each as an iterable of lines
         :param decision_tables:
         """
         pass
@@ -56,21 +106,53 @@ Convert a given decision table into the required format
 
 
 class DirectConverter(GeneralConverter):
-    def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
-
-        vocabularies = [self.build_vocabulary(table) for table in decision_tables]
-        vocab_list = list(itertools.chain.from_iterable(vocabularies))
+    def convert(self, decision_tables: [DecisionTable], goals: [str] = None) -> ([str], "Iterator", "Iterator"):
+        """
+Convert the decision tables. The vocabulary is deduplicated over all tables, theory and structure are generated
+table by table while they are consumed. Lists and re-iterable streams of tables (e.g. read.XML.TableStream) are
+iterated once per section, other iterators are first collected in a list.
+        :param decision_tables: iterable of DecisionTable objects
+        :param goals: names of decisions or output labels, only the tables needed for them are converted if given
+        """
+        decision_tables = reiterable(decision_tables)
+        if goals is not None:
+            decision_tables = self.required_tables(decision_tables, goals)
+        instrument = self.instrument
+        if self.fragments is not None:
+            # vocabulary, theory and structure of every table, only rebuilt for changed tables
+            fragments = self.fragments.collect(
+                decision_tables, lambda table: instrument.call('fragments', table.table_name, self.build_fragments,
+                                                               table))
+            vocab_fragments = (vocabulary for (vocabulary, _, _) in fragments)
+            theory_fragments = (theory for (_, theory, _) in fragments)
+            structure_fragments = (structure for (_, _, structure) in fragments)
+        else:
+            vocab_fragments = (instrument.call('vocabulary', table.table_name, self.build_vocabulary, table)
+                               for table in decision_tables)
+            theory_fragments = (instrument.call('theory', table.table_name, self.build_theory, table)
+                                for table in decision_tables)
+            structure_fragments = (instrument.call('structure', table.table_name, self.build_structure, table)
+                                   for table in decision_tables)
+
+        vocab_lines = (line for lines in vocab_fragments for line in lines)
         # remove double entries
-        vocabulary = list(IndexedSet(vocab_list))
-
-        theories = [self.build_theory(table) for table in decision_tables]
-        theory = list(itertools.chain.from_iterable(theories))
+        with instrument.stage('merge'):
+            vocabulary = unique_list(vocab_lines)
 
-        structures = [self.build_structure(table) for table in decision_tables]
-        structure = list(itertools.chain.from_iterable(structures))
+        theory = (line for lines in theory_fragments for line in lines)
+        structure = (line for lines in structure_fragments for line in lines)
 
         return vocabulary, theory, structure
 
+    def build_fragments(self, dmn_table: DecisionTable) -> ([str], [str], [str]):
+        """
+Builds vocabulary, theory and structure of a single table, as kept in incremental mode
+        :param dmn_table:
+        :return: 3-tuple of lists of strings
+        """
+        return (materialize(self.build_vocabulary(dmn_table)), materialize(self.build_theory(dmn_table)),
+                materialize(self.build_structure(dmn_table)))
+
     def build_vocabulary(self, dmn_table: DecisionTable) -> [str]:
         """
 Build the vocabulary for the direct translation
@@ -134,6 +216,13 @@ translates one entry in the direct formalism
         entry_strings = []
         rule_comparator = rule_entry[0]
         rule_entry = rule_entry[1]
+        # case of range, e.g. ('[]', '5..8')
+        if rule_comparator.startswith(('[', ']')):
+            first_dict = {'[': '>=', ']': '>'}
+            last_dict = {'[': '<', ']': '=<'}
+            values = rule_entry.split('..')
+            return '(' + label + ' ' + first_dict[rule_comparator[0]] + ' ' + values[0] + ' & ' + label + ' ' + \
+                   last_dict[rule_comparator[1]] + ' ' + values[1] + ')'
         rule_cases = rule_entry.split(", ")
         for case in rule_cases:
             entry_strings.append(label + " " + rule_comparator + " " + case)
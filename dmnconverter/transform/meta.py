@@ -1,49 +1,114 @@
 import itertools
-from boltons.setutils import IndexedSet
 
+import dmnconverter.tools.print as printer
 import dmnconverter.tools.texttools as text_tools
+from dmnconverter.tools.dedupe import unique_digests
 
 from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.ranges import IntegerRanges
+from dmnconverter.transform.general import reiterable
 from dmnconverter.transform.meta_language import MetaLanguageConverter
 
 
 class MetaConverter(MetaLanguageConverter):
-    def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
-        vocabulary = self.build_vocabulary()
+    def convert(self, decision_tables: [DecisionTable], goals: [str] = None) -> ([str], [str], "Iterator"):
+        """
+Convert a network of decision tables into the meta representation
+        :param decision_tables: iterable of DecisionTable objects
+        :param goals: names of decisions or output labels, only the tables needed for them are converted if given
+        """
+        decision_tables = reiterable(decision_tables)
+        if goals is not None:
+            decision_tables = self.required_tables(decision_tables, goals)
         theory = self.build_theory()
-
-        structure_dictionaries = [self.build_structure_dict(decision_table) for decision_table in decision_tables]
-        predicate_names = structure_dictionaries[0].keys()
-        # Loop over every predicate and only keep unique entries for those predicates
-        structure: [str] = []
-        for predicate in predicate_names:
-            value_list = [structure_dictionary[predicate] for structure_dictionary in structure_dictionaries]
-            flat_value_list = list(itertools.chain.from_iterable(value_list))
-            # remove doubles
-            unique_value_list = list(IndexedSet(flat_value_list))
-            values_string = '; '.join(unique_value_list)
-            structure.append(predicate + " = {" + values_string + "}")
-
-        return vocabulary, theory, structure
-
-    def build_structure_dict(self, dmn_table: DecisionTable) -> dict:
+        # variables are shared over the tables, so their values are inferred over the whole network
+        ranges = self.integer_ranges(decision_tables)
+        vocabulary = self.encode_vocabulary(self.build_vocabulary(), ranges)
+        if self.fragments is not None:
+            model_ints = ranges.model_ints(self.compress)
+            # structure dictionaries of every table, only rebuilt for changed tables or when the ranges changed
+            structure_dicts = self.collect_fragments(
+                decision_tables, lambda table: self.instrument.call('structure_dict', table.table_name,
+                                                                    self.build_structure_dict, table, True, ranges,
+                                                                    model_ints),
+                ranges.key())
+            structure = self.stitch_structure(structure_dicts,
+                                              lambda predicate: (value for structure_dict in structure_dicts
+                                                                 for value in structure_dict[predicate]),
+                                              model_ints)
+        else:
+            structure = self.build_network_structure(decision_tables, ranges)
+
+        return vocabulary, theory, itertools.chain(structure, self.symbol_comments())
+
+    def build_network_structure(self, decision_tables: [DecisionTable], ranges: IntegerRanges = None) -> "Iterator":
+        """
+Generates the structure lines of a network of tables. The small predicates are collected over all tables first, the
+rule components are only generated table by table while their line is written.
+        :param decision_tables: re-iterable of DecisionTable objects
+        :param ranges: values of the integer variables of all tables, inferred from the tables if None
+        :return: generator of lines, every line being a generator of fragments (see tools.print.write_idp)
+        """
+        ranges = self.integer_ranges(decision_tables) if ranges is None else ranges
+        model_ints = ranges.model_ints(self.compress)
+        rule_builders = self.rule_builders()
+        call = self.instrument.call
+        iterate = self.instrument.iterate
+        structure_dicts = (call('structure_dict', decision_table.table_name, self.build_structure_dict, decision_table,
+                                False, ranges, model_ints) for decision_table in decision_tables)
+        # the rule components are generated while they are written, so their iteration is measured
+        return self.stitch_structure(structure_dicts,
+                                     lambda predicate: (value for decision_table in decision_tables
+                                                        for value in iterate(predicate, decision_table.table_name,
+                                                                             rule_builders[predicate], decision_table)),
+                                     model_ints)
+
+    def stitch_structure(self, structure_dicts, rule_values, model_ints: [str]) -> "Iterator":
+        """
+Generates the structure lines of a network of tables from the structures of the single tables
+        :param structure_dicts: iterable of dictionaries made by build_structure_dict, rule components and ModelInt are
+        ignored
+        :param rule_values: function from the name of a rule predicate to an iterable of its values over all tables
+        :param model_ints: elements of ModelInt of the network
+        :return: generator of lines, every line being a generator of fragments (see tools.print.write_idp)
+        """
+        rule_predicates = self.rule_builders().keys()
+        # Collect the unique values of every predicate table by table, so tables can be streamed in. Dictionaries keep
+        # the order of insertion, and only a single copy of every value is kept.
+        value_sets = {'ModelInt': model_ints}
+        for structure_dictionary in structure_dicts:
+            with self.instrument.stage('merge'):
+                for predicate, values in structure_dictionary.items():
+                    if predicate != 'ModelInt' and predicate not in rule_predicates:
+                        value_sets.setdefault(predicate, dict()).update(dict.fromkeys(values))
+
+        for predicate, values in value_sets.items():
+            yield printer.enumeration(predicate, values)
+
+        # rule components are written while they are generated, only remembering digests of the written ones
+        for predicate in rule_predicates:
+            yield printer.enumeration(predicate, unique_digests(rule_values(predicate)))
+
+    def build_structure_dict(self, dmn_table: DecisionTable, rules: bool = True, ranges: IntegerRanges = None,
+                             model_ints: [str] = None) -> dict:
         """
     Build a dictionary of the structure for a specific decision table in the meta formalism
             :rtype: dict
             :param dmn_table:
+            :param rules: include the rule components (RuleIn and RuleOut), as lists
+            :param ranges: values of the integer variables of the network, inferred from this table only if None
+            :param model_ints: elements of ModelInt, computed from the ranges if None. Networks compute them once.
             :return: dictionary with keys the name of the relevant predicate. Values are lists containing all the relevant entries.
             """
-        # todo: good method for this
-        modelint_start = 0
-        modelint_stop = 20
+        ranges = self.integer_ranges([dmn_table]) if ranges is None else ranges
 
         structure_dict = dict()
 
         # Model int
-        structure_dict['ModelInt'] = [str(modelint_start) + ".." + str(modelint_stop)]
+        structure_dict['ModelInt'] = ranges.model_ints(self.compress) if model_ints is None else model_ints
 
         # Table Name
-        structure_dict['TableName'] = [dmn_table.table_name]
+        structure_dict['TableName'] = [self.quote_table(dmn_table.table_name)]
 
         # Variables
         (input_variables, output_variables) = self.structure_variables(dmn_table)
@@ -54,8 +119,8 @@ class MetaConverter(MetaLanguageConverter):
         input_label_dict = dmn_table.input_label_dict
         output_label_dict = dmn_table.output_label_dict
 
-        (input_domain, input_range) = self.specify_meta_domain(input_label_dict, modelint_start, modelint_stop)
-        (output_domain, output_range) = self.specify_meta_domain(output_label_dict, modelint_start, modelint_stop)
+        (input_domain, input_range) = self.specify_domains(input_label_dict, ranges)
+        (output_domain, output_range) = self.specify_domains(output_label_dict, ranges)
 
         domain = input_domain + output_domain
         ranges = input_range + output_range
@@ -64,27 +129,35 @@ class MetaConverter(MetaLanguageConverter):
         structure_dict['Range'] = text_tools.make_str(ranges)
 
         # Policies
-        structure_dict['TablePolicy'] = [dmn_table.table_name + "," + dmn_table.hit_policy]
+        structure_dict['TablePolicy'] = [self.quote_table(dmn_table.table_name) + "," + dmn_table.hit_policy]
 
         #  Rule components
-        input_rules = super().build_meta_input_rule(dmn_table)
-        output_rules = super().build_output_rule(dmn_table)
-        structure_dict['RuleIn'] = self.add_table_name(dmn_table, input_rules)
-        structure_dict['RuleOut'] = self.add_table_name(dmn_table, output_rules)
+        if rules:
+            for predicate, build_rules in self.rule_builders().items():
+                structure_dict[predicate] = list(build_rules(dmn_table))
 
         # Priorities
         # fixme support priorities
         return structure_dict
 
-    @staticmethod
-    def add_table_name(dmn_table: DecisionTable, string_list: [str]) -> [str]:
+    def rule_builders(self) -> dict:
+        """
+Functions building the rule components of a table, by predicate
+        :return: dictionary with keys the name of the predicate and values functions from a DecisionTable to a
+        generator of strings
+        """
+        return {'RuleIn': lambda dmn_table: self.add_table_name(dmn_table, self.build_meta_input_rule(dmn_table)),
+                'RuleOut': lambda dmn_table: self.add_table_name(dmn_table, self.build_output_rule(dmn_table))}
+
+    def add_table_name(self, dmn_table: DecisionTable, strings) -> "Iterator":
         """
-Adds the name of the relevant table to the start of every element in the list.
+Adds the name of the relevant table to the start of every element.
         :param dmn_table:
-        :param string_list:
+        :param strings: iterable of strings
+        :return: generator of strings
         """
-        table_name = dmn_table.table_name
-        return [table_name + "," + element for element in string_list]
+        table_name = self.quote_table(dmn_table.table_name) + ","
+        return (table_name + element for element in strings)
 
     # Todo: update vocabulary and adapt to number of tables!
     @staticmethod
@@ -1,33 +1,156 @@
 from abc import abstractmethod
 
-from boltons.setutils import IndexedSet
-
+import dmnconverter.tools.print as printer
 from dmnconverter.tools import texttools as text_tools
 from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.abstraction import IntegerAbstraction
+from dmnconverter.tools.dedupe import unique_list
+from dmnconverter.tools.ranges import IntegerRanges, runs
+from dmnconverter.tools.symbols import SymbolEncoding, symbol_offset
 from dmnconverter.transform.general import GeneralConverter
 
+# shortest run of consecutive integers in an equality entry that is written as a range, shorter runs are equalities
+MIN_RUN = 3
+
 
 class MetaLanguageConverter(GeneralConverter):
+    # whether integer variables are restricted to their compressed values by default, see tools.ranges
+    compress_integers = False
+    # whether labels, string values and table names are written as integer codes by default, see tools.symbols
+    encode_symbols = False
+
+    def __init__(self, incremental: bool = False, instrument=None, ranges: dict = None, compress: bool = None,
+                 encode: bool = None):
+        """
+        :param incremental: see GeneralConverter
+        :param instrument: see GeneralConverter
+        :param ranges: dictionary of integer labels and (start, stop) tuples, replacing the bounds inferred from the
+        constants in the rules (see tools.ranges.IntegerRanges)
+        :param compress: only give integer variables one value of every class of values the rules cannot tell apart,
+        instead of all values within their bounds. Keeps the answers of verifications the same, but values given as
+        input afterwards must be among the compressed values. Defaults to compress_integers of the class.
+        :param encode: write labels, string values and table names in the structure as integer codes, listed in
+        comments at the end of the structure (see tools.symbols). Defaults to encode_symbols of the class.
+        """
+        super().__init__(incremental, instrument)
+        self.range_overrides = dict() if ranges is None else dict(ranges)
+        self.compress = self.compress_integers if compress is None else compress
+        self.encode = self.encode_symbols if encode is None else encode
+        # SymbolEncoding of the last conversion, None if symbols are quoted
+        self.symbols = None
+
+    def cache_token(self) -> str:
+        return super().cache_token() + repr((sorted(self.range_overrides.items()), self.compress, self.encode))
+
+    def encode_vocabulary(self, vocabulary: [str], ranges: IntegerRanges) -> [str]:
+        """
+Starts the encoding of the symbols of a conversion, if symbols are encoded. Codes are assigned afresh in every
+conversion, in incremental mode as well (see collect_fragments).
+        :param vocabulary: lines of the vocabulary
+        :param ranges: IntegerRanges of the structure, the codes start above its integers
+        :return: lines of the vocabulary, with the encoded types declared as integer types if symbols are encoded
+        """
+        if not self.encode:
+            return vocabulary
+        self.symbols = SymbolEncoding(symbol_offset(ranges.maximum()))
+        return self.symbols.declare(vocabulary)
+
+    def collect_fragments(self, decision_tables, build, context=None) -> list:
+        """
+Fragments of every table, see tools.fragments.FragmentCache.collect. When symbols are encoded, the kept fragments of a
+table are only reused when quoting their symbols again gives the codes they were built with, so the codes are the same
+as those of a conversion of all tables.
+        :param decision_tables: iterable of DecisionTable objects
+        :param build: function from a DecisionTable to its fragments
+        :param context: see FragmentCache.collect
+        :return: list of fragments, in the order of the tables
+        """
+        if self.symbols is None:
+            return self.fragments.collect(decision_tables, build, context)
+        # the fragments are kept along with the symbols they quote
+        recorded = self.fragments.collect(decision_tables, lambda table: self.symbols.record(build, table), context,
+                                          self.__quotes_same)
+        return [table_fragments for (table_fragments, _) in recorded]
+
+    def __quotes_same(self, recorded: (object, [(str, str)])) -> bool:
+        """Whether the symbols of kept fragments get the same codes, assigning codes to new symbols in their order"""
+        quote = self.symbols.quote
+        return all(quote(name) == code for (name, code) in recorded[1])
+
+    def quote(self, name: str) -> str:
+        """
+Writes a label, string value or table name as an element of the structure
+        :param name:
+        :return: the quoted name, or its code if symbols are encoded
+        """
+        if self.symbols is None:
+            return text_tools.enquote(name)
+        return self.symbols.quote(name)
+
+    def quote_table(self, table_name: str) -> str:
+        """
+Writes a table name as an element of the structure
+        :param table_name:
+        :return: the name itself, as TableName is not quoted, or its code if symbols are encoded
+        """
+        if self.symbols is None:
+            return table_name
+        return self.symbols.quote(table_name)
+
+    def symbol_comments(self) -> "Iterator":
+        """
+Comments listing the codes of the symbols, to end the structure with. Generated lazily, so all codes of the structure
+are known when it is written before them.
+        :return: generator of lines, nothing if symbols are not encoded
+        """
+        if self.symbols is not None:
+            yield from self.symbols.comments()
+
+    def integer_ranges(self, decision_tables, abstraction: IntegerAbstraction = None) -> IntegerRanges:
+        """
+Infers the values of the integer variables of the tables
+        :param decision_tables: iterable of DecisionTable objects
+        :param abstraction: IntegerAbstraction the tables were abstracted with, their values are then class numbers
+        """
+        overrides = self.range_overrides if abstraction is None else abstraction.class_bounds()
+        with self.instrument.stage('ranges'):
+            return IntegerRanges(decision_tables, overrides)
+
+    def integer_abstraction(self, decision_tables) -> IntegerAbstraction:
+        """
+Partitions the values of the integer variables of the tables in classes of equivalent values
+        :param decision_tables: iterable of DecisionTable objects
+        """
+        with self.instrument.stage('abstraction'):
+            return IntegerAbstraction(decision_tables, self.range_overrides)
+
+    def specify_domains(self, label_dict: dict, ranges: IntegerRanges) -> ([str], [str]):
+        """
+Determine domain and range of variables in the dictionary, with the integer values given by the inferred ranges
+        :param label_dict: dictionary of labels and domains
+        :param ranges: IntegerRanges
+        :return: tuple of all Domain and Ranges that are associated to this dictionary (list(str),list(str))
+        """
+        # TODO share the enumeration of variables with the same values, needs a domain predicate in every theory
+        (domain, _) = self.specify_meta_domain({label: value_tuple for (label, value_tuple) in label_dict.items()
+                                                if value_tuple[0] != 'integer'}, 0, 0, self.quote)
+        (integer_domain, integer_ranges) = ranges.structure(label_dict, self.compress, self.quote)
+        return domain + integer_domain, integer_ranges
+
     @abstractmethod
     def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
         pass
 
-    def build_structure(self, decision_table: DecisionTable) -> [str]:
+    def build_structure(self, decision_table: DecisionTable) -> "Iterator":
         """
 Builds meta representation structure based on the dictionary representation of the structure
         :param decision_table:
-        :return:
+        :return: generator of lines, every line being a generator of fragments (see tools.print.write_idp)
         """
         structure_dict = self.build_structure_dict(decision_table)
-        predicate_names = structure_dict.keys()
-        structure: [str] = []
-        for predicate in predicate_names:
-            value_list = structure_dict[predicate]
+        for predicate, value_list in structure_dict.items():
             # remove doubles
-            unique_value_list = list(IndexedSet(value_list))
-            values_string = '; '.join(unique_value_list)
-            structure.append(predicate + " = {" + values_string + "}")
-        return structure
+            yield printer.enumeration(predicate, unique_list(value_list))
 
     @abstractmethod
     def build_structure_dict(self, dmn_table: DecisionTable) -> dict:
@@ -37,8 +160,7 @@ Stores all elements of the structure as key='predicate', value='values of string
         """
         pass
 
-    @staticmethod
-    def structure_variables(dmn_table: DecisionTable) -> ([str], [str]):
+    def structure_variables(self, dmn_table: DecisionTable) -> ([str], [str]):
         """
 Reads out input and output variables from a DecisionTable for usage in the structure
         :param dmn_table: DecisionTable object
@@ -47,19 +169,18 @@ Reads out input and output variables from a DecisionTable for usage in the struc
         input_labels = dmn_table.input_labels
         output_labels = dmn_table.output_labels
 
-        input_variables = text_tools.enquote_list(input_labels)
-        output_variables = text_tools.enquote_list(output_labels)
+        input_variables = [self.quote(label) for label in input_labels]
+        output_variables = [self.quote(label) for label in output_labels]
 
         return input_variables, output_variables
 
-    @staticmethod
-    def list_meta_variables(labels: list) -> str:
+    def list_meta_variables(self, labels: list) -> str:
         """
 Quotes and ';'-joins a list of labels
         :param labels:
         :return:
         """
-        listing = '; '.join(text_tools.enquote_list(labels))
+        listing = '; '.join(self.quote(label) for label in labels)
         return listing
 
     @staticmethod
@@ -69,16 +190,17 @@ Quotes and ';'-joins a list of labels
         :param comparator:
         :return:
         """
-        encoding = {'=': 'eq()', '<': 'less()', '=<': 'leq()', '>': 'gtr()', '>=': 'geq()'}
+        encoding = {'=': 'eq()', '<': 'less()', '=<': 'leq()', '>': 'grt()', '>=': 'geq()'}
         return encoding[comparator]
 
     @staticmethod
-    def specify_meta_domain(label_dict: dict, range_start: int, range_stop: int) -> tuple:
+    def specify_meta_domain(label_dict: dict, range_start: int, range_stop: int, quote=text_tools.enquote) -> tuple:
         """
     Determine domain and range of variables in the dictionary
         :param label_dict: dictionary of labels and domains
         :param range_start:
         :param range_stop:
+        :param quote: function writing a label or string value as an element of the structure
         :return: tuple of all Domain and Ranges that are associated to this dictionary (list(str),list(str))
         """
         domain = []
@@ -86,43 +208,34 @@ Quotes and ';'-joins a list of labels
 
         keys = label_dict.keys()
         for key in keys:
-            current_variable = text_tools.enquote(str(key))
+            current_variable = quote(str(key))
             (type_ref, values) = label_dict[key]
 
             if type_ref in ['string', 'boolean']:
                 value_list = values.split(',')
-                domain.extend([current_variable + ',' + value for value in text_tools.enquote_list(value_list)])
+                domain.extend([current_variable + ',' + quote(value) for value in value_list])
             elif type_ref in ['integer']:
                 ranges.append(current_variable + ',' + str(range_start) + ',' + str(range_stop))
             else:
                 raise TypeError('Unknown type ' + str('type_ref'))
         return domain, ranges
 
-    def build_meta_input_rule(self, dmn_table: DecisionTable) -> [str]:
+    def build_meta_input_rule(self, dmn_table: DecisionTable) -> "Iterator":
         """
-        Make list of all rule components, ready to be entered in the IDP structure (still needs ";" separation
-        between elements) :param dmn_table: :return:
+Generates all rule components, ready to be entered in the IDP structure (still needs ";" separation between elements)
+        :param dmn_table:
+        :return: generator of strings, one per RuleIn tuple
         """
-        labels = dmn_table.input_labels
-        rule_components = dmn_table.input_rule_comp
-
-        rule = []
-        amount_entries = len(labels)
-        enquoted_labels = text_tools.enquote_list(labels)
+        enquoted_labels = [self.quote(label) for label in dmn_table.input_labels]
 
         # note rule_nr is one index off from what IDP uses (therefore +1 later on)
-        for rule_nr in range(len(rule_components)):
-            rule_component = rule_components[rule_nr]
-            for entry_nr in range(amount_entries):
-                entry = rule_component[entry_nr]
+        for rule_nr, rule_component in enumerate(dmn_table.input_rule_comp):
+            for label, entry in zip(enquoted_labels, rule_component):
                 if entry is not None:
-                    label = enquoted_labels[entry_nr]
                     (comparator, value) = entry
-                    rule.extend(self.__build_single_input_rule(rule_nr + 1, label, comparator, value))
-
-        return rule
+                    yield from self.__build_single_input_rule(rule_nr + 1, label, comparator, value)
 
-    def __build_single_input_rule(self, rule_nr: int, label: str, comparator: str, value: str) -> [str]:
+    def __build_single_input_rule(self, rule_nr: int, label: str, comparator: str, value: str) -> "Iterator":
         # case of range (transform into 2 rules and recursively deal with them)
         if comparator.startswith(('[', ']')):
             first_dict = {'[': '>=', ']': '>'}
@@ -132,49 +245,74 @@ Quotes and ';'-joins a list of labels
             values = value.split('..')
 
             # recursive call
-            first_rule_comp = self.__build_single_input_rule(rule_nr, label, first_dict[inclusion_symbols[0]],
-                                                             values[0])
-            second_rule_comp = self.__build_single_input_rule(rule_nr, label, last_dict[inclusion_symbols[1]],
-                                                              values[1])
-
-            entry = first_rule_comp + second_rule_comp
+            yield from self.__build_single_input_rule(rule_nr, label, first_dict[inclusion_symbols[0]], values[0])
+            yield from self.__build_single_input_rule(rule_nr, label, last_dict[inclusion_symbols[1]], values[1])
 
         else:
-            entry = []
             comparator_name = self.encode_comparison(comparator)
             rule_cases = value.split(", ")
+            case_runs = self.integer_runs(rule_cases) if comparator == '=' else None
+            if case_runs is not None:
+                yield from self.__build_run_cases(rule_nr, label, case_runs)
+                return
             # deal with multiple cases
-            for i in range(len(rule_cases)):
-                case = rule_cases[i]
-                case_nr = i + 1
+            for case_nr, case in enumerate(rule_cases, 1):
                 # enquote non integer values
                 try:
                     int(case)
                 except ValueError:
-                    case = text_tools.enquote(case)
-                entry.append(str(rule_nr) + ',' + str(case_nr) + ',' + label + ',' + comparator_name + ',' + case)
-        return entry
+                    case = self.quote(case)
+                yield str(rule_nr) + ',' + str(case_nr) + ',' + label + ',' + comparator_name + ',' + case
+
+    def __build_run_cases(self, rule_nr: int, label: str, case_runs: [(int, int)]) -> "Iterator":
+        # a run is a single case of two components, as all components of a case have to hold
+        (equal, lower, upper) = (self.encode_comparison(comparator) for comparator in ['=', '>=', '=<'])
+        prefix = str(rule_nr) + ','
+        case_nr = 0
+        for (start, stop) in case_runs:
+            if stop - start + 1 >= MIN_RUN:
+                case_nr += 1
+                case = prefix + str(case_nr) + ',' + label + ','
+                yield case + lower + ',' + str(start)
+                yield case + upper + ',' + str(stop)
+                continue
+            for value in range(start, stop + 1):
+                case_nr += 1
+                yield prefix + str(case_nr) + ',' + label + ',' + equal + ',' + str(value)
 
     @staticmethod
-    def build_output_rule(dmn_table: DecisionTable) -> [str]:
-        labels = dmn_table.output_labels
-        rule_components = dmn_table.output_rule_comp
-
-        rule = []
-        amount_entries = len(labels)
-        enquoted_labels = text_tools.enquote_list(labels)
-
-        for rule_nr in range(len(rule_components)):
-            rule_component = rule_components[rule_nr]
-            for entry_nr in range(amount_entries):
-                entry = rule_component[entry_nr]
+    def integer_runs(rule_cases: [str]) -> [(int, int)]:
+        """
+Finds the runs of consecutive integers in the cases of an entry, e.g. '1, 3, 4, 5, 6' has the runs 1 and 3..6
+        :param rule_cases: values of the cases of an equality entry
+        :return: sorted list of inclusive (start, stop) tuples, None if a case is no integer or no run is long enough to
+        be written as a range
+        """
+        if len(rule_cases) < MIN_RUN:
+            return None
+        try:
+            case_runs = runs((int(case), int(case)) for case in rule_cases)
+        except ValueError:
+            return None
+        if all(stop - start + 1 < MIN_RUN for (start, stop) in case_runs):
+            return None
+        return case_runs
+
+    def build_output_rule(self, dmn_table: DecisionTable) -> "Iterator":
+        """
+Generates all output components, ready to be entered in the IDP structure
+        :param dmn_table:
+        :return: generator of strings, one per RuleOut tuple
+        """
+        enquoted_labels = [self.quote(label) for label in dmn_table.output_labels]
+
+        for rule_nr, rule_component in enumerate(dmn_table.output_rule_comp):
+            for label, entry in zip(enquoted_labels, rule_component):
                 if entry is not None:
-                    label = enquoted_labels[entry_nr]
                     (comparator, value) = entry
                     # enquote non integer values
                     try:
                         int(value)
                     except ValueError:
-                        value = text_tools.enquote(value)
-                    rule.append(str(rule_nr + 1) + ',' + label + ',' + value)
-        return rule
+                        value = self.quote(value)
+                    yield str(rule_nr + 1) + ',' + label + ',' + value
@@ -0,0 +1,317 @@
+"""
+Minimization of the rules of a decision table, before it is translated.
+
+Two kinds of changes are made, both keeping the outputs of the table the same for every input:
+    * merging: two rules with the same outputs whose inputs only differ in one column become one rule, matching the
+      values of both entries in that column, e.g. 'Kinderen = 3' and 'Kinderen = 4' become 'Kinderen in [3..4]' and
+      '"Winter"' and '"Fall"' become '"Winter", "Fall"'
+    * dropping: a rule is left out when another rule matches all of its inputs and decides the outputs instead
+Which changes keep the outputs depends on the hit policy of the table:
+    * unique: only rules whose entries in the differing column do not overlap are merged. Subsumed rules overlap with
+      the rule subsuming them, which is an error verifications should still find, so they are kept.
+    * first: a rule is only merged into an earlier rule when no rule in between with other outputs overlaps it, and is
+      dropped when an earlier rule subsumes it
+    * priority: as first, but only rules of the same priority are taken into account, as the others are ordered by
+      their priority rather than by their position
+Tables with other hit policies are left unchanged.
+"""
+from dmnconverter.evaluate.engine import HIT_POLICIES, priority_ranks
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+INFINITY = float('inf')
+# result of a merge of entries that cannot be written as a single entry, None being the entry matching any value
+UNMERGEABLE = object()
+
+
+class Merge:
+    """"
+Rules merged into one rule
+    :param rules: numbers of the original rules, numbered from 1 as in the IDP representation
+    :param label: input in which the entries of the rules differed
+    :param entry: (comparator, value) tuple of the merged rule in that input
+    """
+
+    def __init__(self, rules: [int], label: str, entry: (str, str)):
+        self.rules = rules
+        self.label = label
+        self.entry = entry
+
+    def __str__(self):
+        return 'Merged rules ' + ', '.join(str(rule) for rule in self.rules) + ' into ' + self.label + ' ' + \
+               describe_entry(self.entry)
+
+
+class Drop:
+    """"
+Rule left out because another rule subsumes it
+    :param rules: numbers of the original rules of the dropped rule, more than one if it was merged before
+    :param subsumed_by: numbers of the original rules of the rule subsuming it
+    """
+
+    def __init__(self, rules: [int], subsumed_by: [int]):
+        self.rules = rules
+        self.subsumed_by = subsumed_by
+
+    def __str__(self):
+        return 'Dropped rule ' + ', '.join(str(rule) for rule in self.rules) + ', subsumed by rule ' + \
+               ', '.join(str(rule) for rule in self.subsumed_by)
+
+
+class MinimizeReport:
+    """"
+Changes made to the rules of a table
+    """
+
+    def __init__(self, table_name: str, hit_policy: str, amount_before: int, amount_after: int, changes: list,
+                 supported: bool = True):
+        self.table_name = table_name
+        self.hit_policy = hit_policy
+        self.amount_before = amount_before
+        self.amount_after = amount_after
+        self.changes = changes
+        self.supported = supported
+
+    @property
+    def merges(self) -> [Merge]:
+        return [change for change in self.changes if isinstance(change, Merge)]
+
+    @property
+    def drops(self) -> [Drop]:
+        return [change for change in self.changes if isinstance(change, Drop)]
+
+    def __str__(self):
+        header = 'Table ' + self.table_name + ' (' + self.hit_policy + '): '
+        if not self.supported:
+            return header + 'left unchanged, hit policy not supported'
+        lines = [header + str(self.amount_before) + ' -> ' + str(self.amount_after) + ' rules, ' +
+                 str(len(self.merges)) + ' merges, ' + str(len(self.drops)) + ' dropped']
+        lines.extend('\t' + str(change) for change in self.changes)
+        return '\n'.join(lines)
+
+
+class Rule:
+    """"
+Rule being minimized
+    :param numbers: numbers of the original rules it was made of
+    :param inputs: list of input entries
+    :param outputs: tuple of output entries
+    :param rank: priority of the rule, see evaluate.engine.priority_ranks
+    """
+    __slots__ = ('numbers', 'inputs', 'outputs', 'rank')
+
+    def __init__(self, numbers: [int], inputs: list, outputs: tuple, rank: tuple):
+        self.numbers = numbers
+        self.inputs = inputs
+        self.outputs = outputs
+        self.rank = rank
+
+
+class RuleMinimizer:
+    """"
+Merges and drops redundant rules of a DecisionTable
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    """
+
+    def __init__(self, dmn_table: DecisionTable):
+        self.table = dmn_table
+        self.labels = dmn_table.input_labels
+        # values of every string and boolean input, None for integer inputs
+        self.domains = [None if type_ref == 'integer' else conditions.domain_values(type_ref, values)
+                        for (type_ref, values) in dmn_table.input_label_dict.values()]
+        # sets of values or integer intervals of every entry, by column and entry
+        self.__sets = dict()
+
+    def minimize(self) -> (DecisionTable, MinimizeReport):
+        """
+Repeats dropping and merging rules until no rule can be left out anymore
+        :return: tuple of the minimized DecisionTable and a MinimizeReport
+        """
+        table = self.table
+        amount_before = len(table.input_rule_comp)
+        if table.hit_policy not in HIT_POLICIES:
+            return table, MinimizeReport(table.table_name, table.hit_policy, amount_before, amount_before, [], False)
+
+        ranks = priority_ranks(table)
+        rules = [Rule([rule_nr + 1], list(inputs), tuple(outputs), rank) for (rule_nr, (inputs, outputs, rank))
+                 in enumerate(zip(table.input_rule_comp, table.output_rule_comp, ranks))]
+        changes = []
+        changed = True
+        while changed:
+            changed = self.__drop_subsumed(rules, changes)
+            for column in range(len(self.labels)):
+                changed = self.__merge_column(rules, column, changes) or changed
+
+        minimized = DecisionTable(table.ontology, table.table_name, table.hit_policy, table.input_label_dict,
+                                  table.output_label_dict, [rule.inputs for rule in rules],
+                                  [list(rule.outputs) for rule in rules], table.symbols, table.decision_id,
+                                  table.required_decisions)
+        return minimized, MinimizeReport(table.table_name, table.hit_policy, amount_before, len(rules), changes)
+
+    def __drop_subsumed(self, rules: [Rule], changes: list) -> bool:
+        if self.table.hit_policy == 'unique':
+            return False
+        dropped = False
+        position = 0
+        while position < len(rules):
+            rule = rules[position]
+            for (other_position, other) in enumerate(rules):
+                if other_position != position and self.__decides_before(other_position, other, position, rule) \
+                        and self.__subsumes(other, rule):
+                    changes.append(Drop(rule.numbers, other.numbers))
+                    del rules[position]
+                    dropped = True
+                    break
+            else:
+                position += 1
+        return dropped
+
+    def __decides_before(self, position: int, rule: Rule, other_position: int, other: Rule) -> bool:
+        """Whether rule is chosen over other when both are triggered"""
+        if self.table.hit_policy == 'priority' and rule.rank != other.rank:
+            return rule.rank < other.rank
+        return position < other_position
+
+    def __merge_column(self, rules: [Rule], column: int, changes: list) -> bool:
+        # rules that can be merged along this column agree on all other entries and on their outputs
+        groups = dict()
+        for (position, rule) in enumerate(rules):
+            key = (rule.outputs, tuple(rule.inputs[:column]), tuple(rule.inputs[column + 1:]))
+            groups.setdefault(key, []).append(position)
+
+        merged = set()
+        for positions in groups.values():
+            for (index, position) in enumerate(positions):
+                if position in merged:
+                    continue
+                for later_position in positions[index + 1:]:
+                    if later_position in merged:
+                        continue
+                    entry = self.__merged_entry(rules, position, later_position, column)
+                    if entry is UNMERGEABLE:
+                        continue
+                    (rule, later_rule) = (rules[position], rules[later_position])
+                    numbers = sorted(rule.numbers + later_rule.numbers)
+                    inputs = rule.inputs[:column] + [entry] + rule.inputs[column + 1:]
+                    rules[position] = Rule(numbers, inputs, rule.outputs, rule.rank)
+                    changes.append(Merge(numbers, self.labels[column], entry))
+                    merged.add(later_position)
+
+        if merged:
+            rules[:] = [rule for (position, rule) in enumerate(rules) if position not in merged]
+        return bool(merged)
+
+    def __merged_entry(self, rules: [Rule], position: int, later_position: int, column: int) -> (str, str):
+        """Entry of the merged rule, UNMERGEABLE if the rules cannot be merged"""
+        (rule, later_rule) = (rules[position], rules[later_position])
+        (entry, later_entry) = (rule.inputs[column], later_rule.inputs[column])
+        if entry == later_entry or entry is None or later_entry is None:
+            return UNMERGEABLE
+        if self.table.hit_policy == 'unique':
+            if self.__overlap(column, entry, later_entry):
+                return UNMERGEABLE
+        else:
+            # the later rule moves forward, so no rule it passes may decide differently on its inputs
+            ordered = self.table.hit_policy == 'first'
+            for between in rules[position + 1:later_position]:
+                if between.outputs != later_rule.outputs and (ordered or between.rank == later_rule.rank) and \
+                        all(self.__overlap(other_column, between_entry, later_entry)
+                            for (other_column, (between_entry, later_entry))
+                            in enumerate(zip(between.inputs, later_rule.inputs))):
+                    return UNMERGEABLE
+        return self.__union(column, entry, later_entry)
+
+    def __subsumes(self, rule: Rule, other: Rule) -> bool:
+        """Whether rule matches all inputs other matches"""
+        for (column, (entry, other_entry)) in enumerate(zip(rule.inputs, other.inputs)):
+            if entry is None or entry == other_entry:
+                continue
+            (values, other_values) = (self.__set(column, entry), self.__set(column, other_entry))
+            if self.domains[column] is not None:
+                if not other_values <= values:
+                    return False
+            elif not all(any(start <= other_start and other_stop <= stop for (start, stop) in values)
+                         for (other_start, other_stop) in other_values):
+                return False
+        return True
+
+    def __overlap(self, column: int, entry: (str, str), other_entry: (str, str)) -> bool:
+        """Whether two entries in the same column match a common value"""
+        (values, other_values) = (self.__set(column, entry), self.__set(column, other_entry))
+        if self.domains[column] is not None:
+            return bool(values & other_values)
+        return any(max(start, other_start) <= min(stop, other_stop)
+                   for (start, stop) in values for (other_start, other_stop) in other_values)
+
+    def __union(self, column: int, entry: (str, str), other_entry: (str, str)) -> (str, str):
+        """
+Entry matching the values of both entries, None if it matches any value and UNMERGEABLE if it cannot be written as a
+single entry
+        """
+        (values, other_values) = (self.__set(column, entry), self.__set(column, other_entry))
+        domain = self.domains[column]
+        if domain is not None:
+            union = values | other_values
+            if union.issuperset(domain):
+                return None
+            ordered = [value for value in domain if value in union]
+            ordered.extend(sorted(union.difference(ordered)))
+            return '=', ', '.join(ordered)
+
+        runs = []
+        for (start, stop) in sorted(values + other_values):
+            if runs and start <= runs[-1][1] + 1:
+                runs[-1] = (runs[-1][0], max(runs[-1][1], stop))
+            else:
+                runs.append((start, stop))
+        if len(runs) > 1:
+            if all(start == stop for (start, stop) in runs):
+                return '=', ', '.join(str(start) for (start, _) in runs)
+            return UNMERGEABLE
+        (start, stop) = runs[0]
+        if start == -INFINITY and stop == INFINITY:
+            return None
+        if start == -INFINITY:
+            return '=<', str(stop)
+        if stop == INFINITY:
+            return '>=', str(start)
+        if start == stop:
+            return '=', str(start)
+        return '[]', str(start) + '..' + str(stop)
+
+    def __set(self, column: int, entry: (str, str)):
+        """Set of values of a string or boolean entry, or list of integer intervals with infinite unbounded sides"""
+        try:
+            return self.__sets[(column, entry)]
+        except KeyError:
+            pass
+        if self.domains[column] is not None:
+            values = frozenset(self.domains[column]) if entry is None else frozenset(conditions.value_set(entry))
+        else:
+            values = [(-INFINITY if start is None else start, INFINITY if stop is None else stop)
+                      for (start, stop) in conditions.integer_intervals(entry)]
+        self.__sets[(column, entry)] = values
+        return values
+
+
+def minimize_table(dmn_table: DecisionTable) -> (DecisionTable, MinimizeReport):
+    """
+Merges and drops redundant rules of a table
+    :param dmn_table:
+    :return: tuple of the minimized DecisionTable and a MinimizeReport
+    """
+    return RuleMinimizer(dmn_table).minimize()
+
+
+def describe_entry(entry: (str, str)) -> str:
+    """
+Readable form of a rule entry
+    :param entry: (comparator, value) tuple or None
+    :return: string
+    """
+    if entry is None:
+        return 'any'
+    (comparator, value) = entry
+    if comparator.startswith(('[', ']')):
+        return 'in ' + comparator[0] + value + comparator[1]
+    return comparator + ' ' + value
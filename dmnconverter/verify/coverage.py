@@ -1,32 +1,32 @@
+import dmnconverter.tools.print as printer
 import dmnconverter.tools.texttools as text_tools
+from dmnconverter.tools.abstraction import IntegerAbstraction
 from dmnconverter.tools.decisiontable import DecisionTable
 from dmnconverter.verify.verification import Verification
 
 
 class Coverage(Verification):
 
-    def build_structure(self, decision_table: DecisionTable) -> [str]:
+    def build_structure(self, decision_table: DecisionTable, abstraction: IntegerAbstraction = None) -> "Iterator":
+        if abstraction is not None:
+            yield from abstraction.comments(decision_table.input_labels)
+
         # ModelInt
-        # TODO: proper method to introduce ranges of variables
-        modelint_start = 0
-        modelint_stop = 30
-        structure = ["ModelInt = {" + str(modelint_start) + ".." + str(modelint_stop) + "}"]
+        ranges = self.integer_ranges([decision_table], abstraction)
+        yield printer.enumeration('ModelInt', ranges.model_ints(self.compress, decision_table.input_labels))
 
         # Variables
-        structure.append(
-            'Variable = {' + super().list_meta_variables(decision_table.input_labels) + '}')
+        yield 'Variable = {' + super().list_meta_variables(decision_table.input_labels) + '}'
 
         # Domain and ranges
-        (input_domain, input_range) = super().specify_meta_domain(decision_table.input_label_dict, 0, 20)
+        (input_domain, input_range) = self.specify_domains(decision_table.input_label_dict, ranges)
 
         # add to structure
-        structure.append('Domain = {' + '; '.join(text_tools.make_str(input_domain)) + '}')
-        structure.append('Range = {' + '; '.join(text_tools.make_str(input_range)) + '}')
+        yield printer.enumeration('Domain', text_tools.make_str(input_domain))
+        yield printer.enumeration('Range', text_tools.make_str(input_range))
 
         #  Rule components
-        structure.append('RuleIn = {' + '; '.join(
-            super().build_meta_input_rule(decision_table)) + '}')
-        return structure
+        yield printer.enumeration('RuleIn', super().build_meta_input_rule(decision_table))
 
     def build_vocabulary(self, decision_table: DecisionTable) -> [str]:
         vocabulary = ["type RuleNr isa int",
@@ -0,0 +1,172 @@
+""""
+Verifies every table of a network, with one independent verification program per table.
+
+The verification of a table is chosen from its hit policy: VerifyUniquePolicy for unique tables, Coverage for first
+tables (where overlapping rules are allowed, but gaps are not) and the full Verification otherwise. The programs are
+generated in worker processes, largest tables first, so verifying a network takes about as long as its largest table.
+"""
+import os
+import re
+import time
+import traceback
+from collections import Counter
+
+from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.verify.coverage import Coverage
+from dmnconverter.verify.unique_policy import VerifyUniquePolicy
+from dmnconverter.verify.verification import Verification
+
+# verification by hit policy, Verification for the other hit policies
+VERIFICATIONS = {'unique': VerifyUniquePolicy,
+                 'first': Coverage}
+
+# characters of table names that are replaced in file names
+_UNSAFE_CHARACTERS = re.compile(r'[^A-Za-z0-9_-]')
+
+
+class TableResult:
+    """"
+Verification program generated for one table
+    :param table_name:
+    :param hit_policy:
+    :param verification: name of the verification class used
+    :param file_name: IDP file of the program
+    :param seconds: time taken to generate the program
+    :param error: traceback if generating the program failed, None otherwise
+    """
+    __slots__ = ('table_name', 'hit_policy', 'verification', 'file_name', 'seconds', 'error')
+
+    def __init__(self, table_name: str, hit_policy: str, verification: str, file_name: str, seconds: float,
+                 error: str = None):
+        self.table_name = table_name
+        self.hit_policy = hit_policy
+        self.verification = verification
+        self.file_name = file_name
+        self.seconds = seconds
+        self.error = error
+
+    def __str__(self):
+        state = 'failed: ' + self.error.splitlines()[-1] if self.error is not None else self.file_name
+        return self.table_name + ' (' + self.hit_policy + ', ' + self.verification + ') ' + \
+               '{:.3f}s '.format(self.seconds) + state
+
+
+class NetworkReport:
+    """"
+Verification programs of all tables of a network
+    :param results: list of TableResult objects, in the order of the tables
+    :param seconds: wall time of generating all programs
+    """
+
+    def __init__(self, results: [TableResult], seconds: float):
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def failed(self) -> [TableResult]:
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def file_names(self) -> [str]:
+        return [result.file_name for result in self.results if result.error is None]
+
+    def __str__(self):
+        lines = ['Network: ' + str(len(self.results)) + ' tables, ' + str(len(self.failed)) + ' failed, ' +
+                 '{:.3f}s'.format(self.seconds)]
+        lines.extend('\t' + str(result) for result in self.results)
+        return '\n'.join(lines)
+
+
+def verification_class(hit_policy: str) -> type:
+    """
+Verification suited for a hit policy
+    :param hit_policy: hit policy of a table, in lower case
+    :return: subclass of Verification
+    """
+    return VERIFICATIONS.get(hit_policy, Verification)
+
+
+def table_file_name(file_name: str, table_name: str) -> str:
+    """
+Name of the IDP file of the verification of one table
+    :param file_name: IDP file name given for the network, e.g. 'out/bbq.idp'
+    :param table_name: name of the table, characters other than letters, digits, '_' and '-' are replaced by '_'
+    :return: file name with the table name appended to its stem, e.g. 'out/bbq_Dish.idp'
+    """
+    (stem, extension) = os.path.splitext(file_name)
+    return stem + '_' + safe_name(table_name) + (extension or '.idp')
+
+
+def safe_name(table_name: str) -> str:
+    """
+Table name as part of a file name, so it cannot point to another directory
+    :param table_name:
+    :return: name with only letters, digits, '_' and '-'
+    """
+    return _UNSAFE_CHARACTERS.sub('_', table_name) or '_'
+
+
+def verify_table(job: tuple) -> TableResult:
+    """
+Writes the verification program of one table. Runs in the worker processes.
+    :param job: tuple of DecisionTable, file name and dictionary of options of the verification
+    :return: TableResult
+    """
+    (dmn_table, file_name, options) = job
+    verification = verification_class(dmn_table.hit_policy)
+    start = time.perf_counter()
+    error = None
+    try:
+        verification(**options).print_file(file_name, [dmn_table])
+    except Exception:
+        error = traceback.format_exc()
+    return TableResult(dmn_table.table_name, dmn_table.hit_policy, verification.__name__, file_name,
+                       time.perf_counter() - start, error)
+
+
+def verify_network(decision_tables: [DecisionTable], file_name: str, workers: int = None,
+                   options: dict = None) -> NetworkReport:
+    """
+Writes a verification program for every table, see table_file_name for the names of the files
+    :param decision_tables: iterable of DecisionTable objects
+    :param file_name: IDP file name of the network
+    :param workers: amount of worker processes, os.cpu_count() if None. With 1 all programs are generated in this
+    process.
+    :param options: keyword arguments of the verifications, e.g. ranges, compress and abstract
+    :return: NetworkReport
+    """
+    options = dict() if options is None else options
+    decision_tables = list(decision_tables)
+    # tables whose names give the same file name are told apart by their position in the network, numbered from 1
+    amounts = Counter(safe_name(dmn_table.table_name) for dmn_table in decision_tables)
+    jobs = []
+    for (index, dmn_table) in enumerate(decision_tables):
+        table_name = safe_name(dmn_table.table_name)
+        if amounts[table_name] > 1:
+            table_name += '_' + str(index + 1)
+        jobs.append((dmn_table, table_file_name(file_name, table_name), options))
+    return run_jobs(jobs, workers)
+
+
+def run_jobs(jobs: [tuple], workers: int = None) -> NetworkReport:
+    """
+Writes verification programs in worker processes
+    :param jobs: list of jobs as taken by verify_table
+    :param workers: amount of worker processes, os.cpu_count() if None. With 1 all programs are generated in this
+    process.
+    :return: NetworkReport, with the results in the order of the jobs
+    """
+    # the largest tables are handed out first, so no worker is left with a large table at the end
+    order = sorted(range(len(jobs)), key=lambda index: -len(jobs[index][0].input_rule_comp))
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) < 2:
+        results = [verify_table(jobs[index]) for index in order]
+    else:
+        # slow to import and not needed for a single worker
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(verify_table, [jobs[index] for index in order]))
+    results_in_order = [None] * len(jobs)
+    for (index, result) in zip(order, results):
+        results_in_order[index] = result
+    return NetworkReport(results_in_order, time.perf_counter() - start)
@@ -0,0 +1,249 @@
+""""
+Splits the verification of a large table into independent programs, one per part of the values of a single input.
+
+A string or boolean input is split in its values, an integer input in sub-ranges of its values whose boundaries are
+constants of the rules (see tools.ranges). The program of a part only contains the rules that can be triggered by
+values in that part, and only lets the splitting input take those values. Entries that match the whole part are left
+out, as they always hold, unless they are the only entry of their rule. Gaps and overlaps of the table are exactly the
+gaps and overlaps found in any of the parts, so the programs can be solved in parallel and their findings merged:
+    plan = split_table(dmn_table, parts=8)
+    report = write_partitions(plan, 'out/bbq.idp')
+    results = solve_files(report.file_names)
+    plan.findings(results)
+Rules are numbered anew in every program, Partition.rule_numbers translates them back.
+"""
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.ranges import IntegerRanges
+from dmnconverter.verify.network import NetworkReport, run_jobs, table_file_name
+
+INFINITY = float('inf')
+
+
+class Partition:
+    """"
+Part of the input space of a table, with the table restricted to it
+    :param label: splitting input
+    :param values: values of the splitting input in this part, a list of strings for string and boolean inputs and an
+    inclusive (start, stop) tuple for integer inputs
+    :param table: DecisionTable with the rules that can be triggered in this part
+    :param rule_numbers: number of every rule of table in the original table, numbered from 1
+    """
+    __slots__ = ('label', 'values', 'table', 'rule_numbers')
+
+    def __init__(self, label: str, values, table: DecisionTable, rule_numbers: [int]):
+        self.label = label
+        self.values = values
+        self.table = table
+        self.rule_numbers = rule_numbers
+
+    @property
+    def name(self) -> str:
+        """Part of the file names of the programs, e.g. 'Season_Fall' or 'Age_18-64'"""
+        if isinstance(self.values, tuple):
+            return self.label + '_' + str(self.values[0]) + '-' + str(self.values[1])
+        return self.label + '_' + '_'.join(self.values)
+
+    def original_rule(self, rule_nr: int) -> int:
+        """
+Number in the original table of a rule in the program of this part
+        :param rule_nr: rule number as found in a model of the program, numbered from 1
+        """
+        return self.rule_numbers[int(rule_nr) - 1]
+
+    def __str__(self):
+        values = '[' + str(self.values[0]) + '..' + str(self.values[1]) + ']' if isinstance(self.values, tuple) \
+            else '{' + ', '.join(self.values) + '}'
+        return self.label + ' in ' + values + ': ' + str(len(self.rule_numbers)) + ' rules'
+
+
+class PartitionPlan:
+    """"
+Partitions of a table along one input
+    :param dmn_table: original DecisionTable
+    :param label: splitting input
+    :param partitions: list of Partition objects
+    :param ranges: bounds of the integer inputs used in the programs, as overrides for the verifications
+    """
+
+    def __init__(self, dmn_table: DecisionTable, label: str, partitions: [Partition], ranges: dict):
+        self.table = dmn_table
+        self.label = label
+        self.partitions = partitions
+        self.ranges = ranges
+
+    @property
+    def largest(self) -> int:
+        """Amount of rules of the largest part"""
+        return max((len(partition.rule_numbers) for partition in self.partitions), default=0)
+
+    def options(self, partition: Partition, options: dict = None) -> dict:
+        """
+Options of the verification of a part: the given options, with the bounds of the part for an integer splitting input
+        :param partition:
+        :param options: keyword arguments of the verification, e.g. compress and abstract
+        """
+        options = dict() if options is None else dict(options)
+        ranges = dict(self.ranges)
+        ranges.update(options.get('ranges') or dict())
+        if isinstance(partition.values, tuple):
+            ranges[self.label] = partition.values
+        options['ranges'] = ranges
+        return options
+
+    def findings(self, results: list) -> [(Partition, dict)]:
+        """
+Merges the models found for the programs of the parts
+        :param results: solve.runner.SolveResult objects, one per part in the order of the partitions
+        :return: list of (Partition, model) tuples for every model found in any part
+        """
+        return [(partition, model) for (partition, result) in zip(self.partitions, results) for model in result.models]
+
+    def __str__(self):
+        lines = ['Table ' + self.table.table_name + ' split along ' + self.label + ' in ' +
+                 str(len(self.partitions)) + ' parts, largest part ' + str(self.largest) + ' of ' +
+                 str(len(self.table.input_rule_comp)) + ' rules']
+        lines.extend('\t' + str(partition) for partition in self.partitions)
+        return '\n'.join(lines)
+
+
+class TableSplitter:
+    """"
+Builds the partitions of a DecisionTable
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    :param ranges: dictionary of integer labels and (start, stop) tuples, replacing the bounds inferred from the rules
+    """
+
+    def __init__(self, dmn_table: DecisionTable, ranges: dict = None):
+        self.table = dmn_table
+        self.ranges = IntegerRanges([dmn_table], ranges)
+        self.overrides = dict() if ranges is None else dict(ranges)
+
+    def split(self, label: str = None, parts: int = 4) -> PartitionPlan:
+        """
+Splits the table along an input
+        :param label: splitting input, the input giving the smallest largest part if None
+        :param parts: amount of sub-ranges of an integer input, string and boolean inputs are split in all their values
+        :return: PartitionPlan
+        """
+        labels = self.table.input_labels if label is None else [label]
+        if not labels:
+            raise ValueError('Table ' + self.table.table_name + ' has no inputs to split')
+        best = None
+        for candidate in labels:
+            if candidate not in self.table.input_label_dict:
+                raise ValueError('Table ' + self.table.table_name + ' has no input ' + str(candidate))
+            partitions = self.partitions(candidate, parts)
+            largest = max((len(partition.rule_numbers) for partition in partitions), default=0)
+            if best is None or largest < best[0]:
+                best = (largest, candidate, partitions)
+        (_, label, partitions) = best
+        # bounds of the whole table, so the programs of all parts use the same bounds for the other inputs
+        ranges = {other: self.ranges.bounds(other) for other in self.ranges.labels()}
+        ranges.update(self.overrides)
+        return PartitionPlan(self.table, label, partitions, ranges)
+
+    def partitions(self, label: str, parts: int) -> [Partition]:
+        """
+Partitions of the table along one input
+        :param label: input label
+        :param parts: amount of sub-ranges of an integer input
+        :return: list of Partition objects
+        """
+        column = self.table.input_labels.index(label)
+        (type_ref, values) = self.table.input_label_dict[label]
+        entries = self.table.input_rule_comp.column(column)
+        partitions = []
+        if type_ref == 'integer':
+            for (start, stop) in self.sub_ranges(label, parts):
+                matches = [self.__interval_match(entry, start, stop) for entry in entries]
+                partitions.append(self.__partition(label, (start, stop), values, matches))
+        else:
+            domain = conditions.domain_values(type_ref, values)
+            raw_values = values.split(',')
+            for (value, raw_value) in zip(domain, raw_values):
+                # a rule either matches the single value or not
+                matches = [None if entry is None or value in conditions.value_set(entry) else False
+                           for entry in entries]
+                partitions.append(self.__partition(label, [value], raw_value, matches))
+        return partitions
+
+    def sub_ranges(self, label: str, parts: int) -> [(int, int)]:
+        """
+Splits the values of an integer input in sub-ranges with about the same amount of classes of equivalent values
+        :param label: integer input label
+        :param parts: maximal amount of sub-ranges
+        :return: list of inclusive (start, stop) tuples covering the bounds of the input
+        """
+        (_, stop) = self.ranges.bounds(label)
+        points = self.ranges.points(label)
+        parts = max(1, min(parts, len(points)))
+        starts = [points[(index * len(points)) // parts] for index in range(parts)]
+        return [(start, next_start - 1) for (start, next_start) in zip(starts, starts[1:])] + [(starts[-1], stop)]
+
+    def __partition(self, label: str, part_values, label_values: str, matches: list) -> Partition:
+        """
+Builds the table of a part
+        :param matches: for every rule False if it cannot be triggered in the part, None if its entry on the splitting
+        input always holds in the part and the entry otherwise
+        """
+        column = self.table.input_labels.index(label)
+        input_rules = []
+        output_rules = []
+        rule_numbers = []
+        for (rule_nr, (match, inputs, outputs)) in enumerate(zip(matches, self.table.input_rule_comp,
+                                                                 self.table.output_rule_comp)):
+            if match is False:
+                continue
+            inputs = list(inputs)
+            # a rule needs at least one RuleIn tuple, RuleNr is inferred from them
+            if any(entry is not None for (index, entry) in enumerate(inputs) if index != column):
+                inputs[column] = match
+            input_rules.append(inputs)
+            output_rules.append(outputs)
+            rule_numbers.append(rule_nr + 1)
+        input_label_dict = dict(self.table.input_label_dict)
+        input_label_dict[label] = (input_label_dict[label][0], label_values)
+        table = DecisionTable(self.table.ontology, self.table.table_name, self.table.hit_policy, input_label_dict,
+                              self.table.output_label_dict, input_rules, output_rules, self.table.symbols,
+                              self.table.decision_id, self.table.required_decisions)
+        return Partition(label, part_values, table, rule_numbers)
+
+    @staticmethod
+    def __interval_match(entry: (str, str), start: int, stop: int):
+        """Whether an integer entry can hold in [start..stop]: False, None if it always holds or the entry itself"""
+        if entry is None:
+            return None
+        intervals = [(-INFINITY if low is None else low, INFINITY if high is None else high)
+                     for (low, high) in conditions.integer_intervals(entry)]
+        if any(low <= start and stop <= high for (low, high) in intervals):
+            return None
+        if any(max(low, start) <= min(high, stop) for (low, high) in intervals):
+            return entry
+        return False
+
+
+def split_table(dmn_table: DecisionTable, label: str = None, parts: int = 4, ranges: dict = None) -> PartitionPlan:
+    """
+Splits a table along an input
+    :param dmn_table:
+    :param label: splitting input, chosen automatically if None
+    :param parts: amount of sub-ranges of an integer input
+    :param ranges: dictionary of integer labels and (start, stop) tuples, replacing the inferred bounds
+    :return: PartitionPlan
+    """
+    return TableSplitter(dmn_table, ranges).split(label, parts)
+
+
+def write_partitions(plan: PartitionPlan, file_name: str, workers: int = None, options: dict = None) -> NetworkReport:
+    """
+Writes the verification program of every part, in worker processes (see verify.network)
+    :param plan: PartitionPlan
+    :param file_name: IDP file name of the table, the names of the parts are appended to its stem
+    :param workers: amount of worker processes, os.cpu_count() if None
+    :param options: keyword arguments of the verifications, e.g. compress and abstract
+    :return: NetworkReport with a result for every part, in the order of the partitions
+    """
+    jobs = [(partition.table, table_file_name(file_name, plan.table.table_name + '_' + partition.name),
+             plan.options(partition, options)) for partition in plan.partitions]
+    return run_jobs(jobs, workers)
@@ -0,0 +1,224 @@
+""""
+Verifies a table directly in python with the multi-dimensional sweep line approach of Calvanese et al.
+
+Every rule is seen as a hyper-rectangle in the input space: integer inputs are (possibly unbounded) integer intervals,
+string and boolean inputs are intervals over the positions of their domain values. The space is swept one input at a
+time: along an input, the boundaries of the active rules split it in segments covered by a constant set of rules.
+Segments without rules are gaps, the others are swept further along the next input. Rules that are still together
+after the last input overlap.
+"""
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+INFINITY = float('inf')
+
+
+class Gap:
+    """"
+Part of the input space that is not covered by any rule
+    :param box: dictionary of input labels and their values in the gap, (start, stop) tuples for integer inputs with None
+    if unbounded and lists of values for string and boolean inputs
+    """
+
+    def __init__(self, box: dict):
+        self.box = box
+
+    def __str__(self):
+        return 'Gap: ' + describe_box(self.box)
+
+
+class Overlap:
+    """"
+Pair of rules that are triggered together
+    :param rules: tuple of the two rule numbers, numbered from 1 as in the IDP representation
+    :param box: part of the input space where both rules are triggered, as in Gap
+    :param same_output: whether both rules assign the same outputs
+    """
+
+    def __init__(self, rules: (int, int), box: dict, same_output: bool):
+        self.rules = rules
+        self.box = box
+        self.same_output = same_output
+
+    def __str__(self):
+        return 'Overlap of rules ' + str(self.rules[0]) + ' and ' + str(self.rules[1]) + ': ' + describe_box(self.box)
+
+
+class SweepReport:
+    """"
+All gaps and overlapping rule pairs of a table
+    """
+
+    def __init__(self, table_name: str, hit_policy: str, gaps: [Gap], overlaps: [Overlap]):
+        self.table_name = table_name
+        self.hit_policy = hit_policy
+        self.gaps = gaps
+        self.overlaps = overlaps
+
+    @property
+    def valid(self) -> bool:
+        """Table is complete and, for unique hit policy, has no overlapping rules"""
+        return not self.gaps and (self.hit_policy != 'unique' or not self.overlaps)
+
+    def __str__(self):
+        lines = ['Table ' + self.table_name + ' (' + self.hit_policy + '): ' + str(len(self.gaps)) + ' gaps, ' +
+                 str(len(self.overlaps)) + ' overlapping rule pairs']
+        lines.extend('\t' + str(finding) for finding in self.gaps + self.overlaps)
+        return '\n'.join(lines)
+
+
+class SweepVerifier:
+    """"
+Finds every gap and every overlapping pair of rules of a DecisionTable
+    :param dmn_table: DecisionTable, e.g. from read.XML.read_tables
+    :param bounds: optional dictionary of integer input labels and (start, stop) tuples limiting their values
+    """
+
+    def __init__(self, dmn_table: DecisionTable, bounds: dict = None):
+        bounds = dict() if bounds is None else bounds
+        self.table = dmn_table
+        self.labels = dmn_table.input_labels
+        self.domains = []
+        self.bounds = []
+        for label in self.labels:
+            (type_ref, values) = dmn_table.input_label_dict[label]
+            if type_ref == 'integer':
+                (start, stop) = bounds.get(label, (None, None))
+                self.domains.append(None)
+                self.bounds.append((-INFINITY if start is None else start, INFINITY if stop is None else stop))
+            else:
+                domain = conditions.domain_values(type_ref, values)
+                self.domains.append(domain)
+                self.bounds.append((0, len(domain) - 1))
+        # intervals of every rule along every input
+        self.rule_intervals = [[self.__intervals(column, entry) for column, entry in enumerate(rule)]
+                               for rule in dmn_table.input_rule_comp]
+
+    def verify(self) -> SweepReport:
+        """
+Sweeps the input space of the table
+        :return: SweepReport with all gaps and overlapping rule pairs
+        """
+        self.__gaps = []
+        self.__overlaps = dict()
+        if self.labels:
+            self.__sweep(0, list(range(len(self.rule_intervals))), [])
+        elif not self.rule_intervals:
+            self.__gaps.append(Gap(dict()))
+        elif len(self.rule_intervals) > 1:
+            self.__record_overlaps(list(range(len(self.rule_intervals))), [])
+        overlaps = [self.__overlaps[pair] for pair in sorted(self.__overlaps)]
+        return SweepReport(self.table.table_name, self.table.hit_policy, self.__gaps, overlaps)
+
+    def __sweep(self, dimension: int, active: [int], box: list) -> None:
+        (lower_bound, upper_bound) = self.bounds[dimension]
+        # rules entering at a position, and leaving after a position
+        events = dict()
+        for rule_nr in active:
+            for (start, stop) in self.rule_intervals[rule_nr][dimension]:
+                (start, stop) = (max(start, lower_bound), min(stop, upper_bound))
+                if start > stop:
+                    continue
+                events.setdefault(start, ([], []))[0].append(rule_nr)
+                events.setdefault(stop + 1, ([], []))[1].append(rule_nr)
+        events.setdefault(lower_bound, ([], []))
+
+        segments = []
+        covering = dict()
+        positions = sorted(events)
+        for i, position in enumerate(positions):
+            if position > upper_bound or position == INFINITY:
+                break
+            (entering, leaving) = events[position]
+            for rule_nr in leaving:
+                covering[rule_nr] -= 1
+                if not covering[rule_nr]:
+                    del covering[rule_nr]
+            for rule_nr in entering:
+                covering[rule_nr] = covering.get(rule_nr, 0) + 1
+            stop = positions[i + 1] - 1 if i + 1 < len(positions) else upper_bound
+            stop = min(stop, upper_bound)
+            rules = sorted(covering)
+            if segments and segments[-1][2] == rules:
+                # same rules as the previous segment
+                segments[-1] = (segments[-1][0], stop, rules)
+            else:
+                segments.append((position, stop, rules))
+
+        for (start, stop, rules) in segments:
+            segment_box = box + [(start, stop)]
+            if not rules:
+                full_box = segment_box + self.bounds[dimension + 1:]
+                self.__gaps.append(Gap(self.__describe(full_box)))
+            elif dimension + 1 < len(self.labels):
+                self.__sweep(dimension + 1, rules, segment_box)
+            elif len(rules) > 1:
+                self.__record_overlaps(rules, segment_box)
+
+    def __record_overlaps(self, rules: [int], box: list) -> None:
+        outputs = self.table.output_rule_comp
+        for i, first in enumerate(rules):
+            for second in rules[i + 1:]:
+                if (first + 1, second + 1) not in self.__overlaps:
+                    self.__overlaps[(first + 1, second + 1)] = Overlap((first + 1, second + 1), self.__describe(box),
+                                                                       outputs[first] == outputs[second])
+
+    def __intervals(self, column: int, entry: (str, str)) -> [(int, int)]:
+        """Intervals covered by an entry along one input, for string and boolean inputs over the domain positions"""
+        domain = self.domains[column]
+        if domain is None:
+            return [(-INFINITY if start is None else start, INFINITY if stop is None else stop)
+                    for (start, stop) in conditions.integer_intervals(entry)]
+        if entry is None:
+            return [self.bounds[column]]
+        values = conditions.value_set(entry)
+        positions = [position for position, value in enumerate(domain) if value in values]
+        intervals = []
+        for position in positions:
+            if intervals and intervals[-1][1] == position - 1:
+                intervals[-1] = (intervals[-1][0], position)
+            else:
+                intervals.append((position, position))
+        return intervals
+
+    def __describe(self, box: list) -> dict:
+        """Translates a box of intervals back to the values of every input"""
+        description = dict()
+        for (label, domain, (start, stop)) in zip(self.labels, self.domains, box):
+            if domain is None:
+                description[label] = (None if start == -INFINITY else start, None if stop == INFINITY else stop)
+            else:
+                description[label] = domain[start:stop + 1]
+        return description
+
+
+def verify_table(dmn_table: DecisionTable, bounds: dict = None) -> SweepReport:
+    """
+Finds all gaps and overlapping rule pairs of a table
+    :param dmn_table:
+    :param bounds: optional dictionary of integer input labels and (start, stop) tuples limiting their values
+    :return: SweepReport
+    """
+    return SweepVerifier(dmn_table, bounds).verify()
+
+
+def describe_box(box: dict) -> str:
+    """
+Readable description of a part of the input space
+    :param box: dictionary as in Gap
+    :return: string
+    """
+    parts = []
+    for (label, values) in box.items():
+        if isinstance(values, tuple):
+            (start, stop) = values
+            if start is None and stop is None:
+                parts.append(label + ' any')
+            elif start == stop:
+                parts.append(label + ' = ' + str(start))
+            else:
+                parts.append(label + ' in [' + ('-inf' if start is None else str(start)) + '..' +
+                             ('inf' if stop is None else str(stop)) + ']')
+        else:
+            parts.append(label + ' in {' + ', '.join(values) + '}')
+    return ', '.join(parts)
@@ -2,43 +2,93 @@
 Does full table verification for the single hit policies
 """
 
+import itertools
 import warnings
 
+import dmnconverter.tools.print as printer
+from dmnconverter.tools.abstraction import IntegerAbstraction
 from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.dedupe import unique_list
 from dmnconverter.transform.meta_language import MetaLanguageConverter
 from dmnconverter.tools import texttools as text_tools
 # from dmnconverter.verify.unique_policy import VerifyUniquePolicy
 
 
 class Verification(MetaLanguageConverter):
+    # verifications only look for the existence of inputs, so one value per class of equivalent values is enough
+    compress_integers = True
+    # whether integer entries are rewritten over classes of equivalent values by default, see tools.abstraction
+    abstract_integers = False
+
+    def __init__(self, incremental: bool = False, instrument=None, ranges: dict = None, compress: bool = None,
+                 abstract: bool = None, encode: bool = None):
+        """
+        :param incremental: see GeneralConverter
+        :param instrument: see GeneralConverter
+        :param ranges: see MetaLanguageConverter
+        :param compress: see MetaLanguageConverter
+        :param abstract: verify the table with its integer entries rewritten over the numbers of the classes of values
+        the rules cannot tell apart, instead of over the values themselves. The structure lists the interval of every
+        class in comments, values found by IDP are class numbers. Defaults to abstract_integers of the class.
+        :param encode: see MetaLanguageConverter
+        """
+        super().__init__(incremental, instrument, ranges, compress, encode)
+        self.abstract = self.abstract_integers if abstract is None else abstract
+
+    def cache_token(self) -> str:
+        return super().cache_token() + repr(self.abstract)
+
     def convert(self, decision_tables: [DecisionTable]) -> ([str], [str], [str]):
-        if len(decision_tables) > 1:
-            warnings.warn("Only first table is verified even though multiple DMN tables were given")
-        dmn_table: DecisionTable = decision_tables[0]
+        # works on lists as well as on (streamed) iterators of tables
+        tables = iter(decision_tables)
+        dmn_table: DecisionTable = next(tables)
+        if next(tables, None) is not None:
+            warnings.warn("Only first table is verified even though multiple DMN tables were given, "
+                          "use verify.network to verify all tables")
 
         # todo : automatically go to single hit policy if needed
         # if dmn_table.hit_policy == 'Unique':
         #     return VerifyUniquePolicy().convert(decision_tables)
 
+        abstraction = None
+        if self.abstract:
+            abstraction = self.integer_abstraction([dmn_table])
+            dmn_table = abstraction.abstract_table(dmn_table)
+
         vocabulary: [str] = self.build_vocabulary(dmn_table)
+        if self.encode:
+            vocabulary = self.encode_vocabulary(vocabulary, self.integer_ranges([dmn_table], abstraction))
         theory = self.build_theory(dmn_table)
-        structure = self.build_structure(dmn_table)
+        structure = itertools.chain(self.build_structure(dmn_table, abstraction), self.symbol_comments())
         return vocabulary, theory, structure
 
-    def build_structure_dict(self, dmn_table: DecisionTable) -> [str]:
+    def build_structure(self, decision_table: DecisionTable, abstraction: IntegerAbstraction = None) -> "Iterator":
+        """
+Builds the structure, preceded by the intervals of the classes if the table is abstracted
+        :param decision_table:
+        :param abstraction: IntegerAbstraction the table was abstracted with, None if it is not abstracted
+        :return: generator of lines
+        """
+        if abstraction is not None:
+            yield from abstraction.comments(decision_table.input_labels + decision_table.output_labels)
+        structure_dict = self.build_structure_dict(decision_table, abstraction)
+        for predicate, value_list in structure_dict.items():
+            # remove doubles
+            yield printer.enumeration(predicate, unique_list(value_list))
+
+    def build_structure_dict(self, dmn_table: DecisionTable, abstraction: IntegerAbstraction = None) -> [str]:
         """
 Build structure dictionary for general verification of a single table
         :param dmn_table:
+        :param abstraction: IntegerAbstraction the table was abstracted with, None if it is not abstracted
         :return:
         """
-        # todo: good method for this
-        modelint_start = 0
-        modelint_stop = 20
+        ranges = self.integer_ranges([dmn_table], abstraction)
 
         structure_dict = dict()
 
         # Model int
-        structure_dict['ModelInt'] = [str(modelint_start) + ".." + str(modelint_stop)]
+        structure_dict['ModelInt'] = ranges.model_ints(self.compress)
 
         # Variables
         (input_variables, output_variables) = self.structure_variables(dmn_table)
@@ -49,8 +99,8 @@ Build structure dictionary for general verification of a single table
         input_label_dict = dmn_table.input_label_dict
         output_label_dict = dmn_table.output_label_dict
 
-        (input_domain, input_range) = self.specify_meta_domain(input_label_dict, modelint_start, modelint_stop)
-        (output_domain, output_range) = self.specify_meta_domain(output_label_dict, modelint_start, modelint_stop)
+        (input_domain, input_range) = self.specify_domains(input_label_dict, ranges)
+        (output_domain, output_range) = self.specify_domains(output_label_dict, ranges)
 
         domain = input_domain + output_domain
         ranges = input_range + output_range
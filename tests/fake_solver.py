@@ -0,0 +1,45 @@
+"""
+Stand-in for the IDP executable in the tests of solve.runner. Reads the program from the file given as last argument,
+or from standard input, and prints a fixed printmodels block. A line '// sleep <seconds>' in the program makes it wait
+first, to test timeouts, cancelling and back-pressure, and a line '// unsat' makes it print no models.
+"""
+import sys
+import time
+
+MODELS = """Number of models: 2.
+Model 1
+=======
+structure  : V {
+  CountTriggers = 0
+  Match = { 1,"Guest_Count"; 1,"Season" }
+  VarValue = { "Guest_Count"->9; "Season"->"Fall" }
+}
+Model 2
+=======
+structure  : V {
+  CountTriggers = -2
+  Match = { 2,"Guest_Count" }
+  VarValue = { "Guest_Count"->-3; "Season"->"Winter" }
+}
+"""
+
+
+def main(argv: [str]) -> int:
+    if len(argv) > 1:
+        with open(argv[-1]) as program_file:
+            program = program_file.read()
+    else:
+        program = sys.stdin.read()
+    for line in program.splitlines():
+        words = line.split()
+        if words[:2] == ['//', 'sleep']:
+            time.sleep(float(words[2]))
+        elif words[:2] == ['//', 'unsat']:
+            print('Number of models: 0.')
+            return 0
+    print(MODELS, end='')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,76 @@
+"""
+DMN networks for the tests, the dish network and generated chains of tables
+"""
+import itertools
+import os
+import random
+
+from dmnconverter.tools import conditions
+
+# network of the dish and guests tables
+DISH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dish.dmn')
+HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+          '<definitions xmlns="http://www.omg.org/spec/DMN/20151101/dmn.xsd" id="network" name="network" '
+          'namespace="http://camunda.org/schema/1.0/dmn">')
+SEASONS = ['Winter', 'Summer', 'Spring', 'Fall']
+
+
+def network_xml(amount_tables: int, amount_rules: int, seed: int = 0) -> str:
+    """
+DMN network of a chain of tables with an integer and a string input, every table requiring the previous one
+    :param amount_tables:
+    :param amount_rules: rules of every table
+    :param seed: seed of the random rule entries
+    :return: content of the DMN file
+    """
+    generator = random.Random(seed)
+    parts = [HEADER]
+    for table in range(amount_tables):
+        parts.append('<decision id="d' + str(table) + '" name="Decision ' + str(table) + '">')
+        if table > 0:
+            parts.append('<informationRequirement><requiredDecision href="#d' + str(table - 1) + '"/>'
+                         '</informationRequirement>')
+        parts.append('<decisionTable id="t' + str(table) + '" hitPolicy="FIRST">')
+        parts.append('<input id="a' + str(table) + '" label="Level ' + str(table) + '"><inputExpression typeRef='
+                     '"integer"><text>level</text></inputExpression></input>')
+        parts.append('<input id="s' + str(table) + '" label="Season"><inputExpression typeRef="string"><text>season'
+                     '</text></inputExpression><inputValues><text>' + ','.join('"' + season + '"' for season in SEASONS)
+                     + '</text></inputValues></input>')
+        parts.append('<output id="o' + str(table) + '" label="Level ' + str(table + 1) + '" name="level" '
+                     'typeRef="integer"/>')
+        for rule in range(amount_rules):
+            level = generator.choice(['&lt;= ', '&gt; ', '', '[']) + str(generator.randint(0, 50))
+            if level.startswith('['):
+                level += '..' + str(generator.randint(50, 60)) + ']'
+            season = generator.choice(['', '"' + generator.choice(SEASONS) + '"',
+                                       '"' + '","'.join(generator.sample(SEASONS, 2)) + '"'])
+            parts.append('<rule><inputEntry><text>' + level + '</text></inputEntry><inputEntry><text>' + season +
+                         '</text></inputEntry><outputEntry><text>' + str(generator.randint(0, 60)) +
+                         '</text></outputEntry></rule>')
+        parts.append('</decisionTable></decision>')
+    parts.append('</definitions>')
+    return '\n'.join(parts)
+
+
+def write_network(directory, name: str, amount_tables: int, amount_rules: int, seed: int = 0) -> str:
+    """Writes network_xml to a file in the directory and returns its path"""
+    path = directory / (name + '.dmn')
+    path.write_text(network_xml(amount_tables, amount_rules, seed))
+    return str(path)
+
+
+def input_space(dmn_table, ranges) -> [dict]:
+    """
+All assignments of the inputs of a table, with the integer inputs ranging one beyond their bounds
+    :param dmn_table: DecisionTable
+    :param ranges: IntegerRanges of the table
+    :return: list of dictionaries of input labels and values
+    """
+    columns = []
+    for (label, (type_ref, values)) in dmn_table.input_label_dict.items():
+        if type_ref == 'integer':
+            (start, stop) = ranges.bounds(label)
+            columns.append(list(range(start - 1, stop + 2)))
+        else:
+            columns.append(conditions.domain_values(type_ref, values))
+    return [dict(zip(dmn_table.input_labels, values)) for values in itertools.product(*columns)]
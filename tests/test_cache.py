@@ -0,0 +1,43 @@
+import os
+
+from dmnconverter.converter import DMNConverter
+from dmnconverter.tools.cache import ConversionCache
+
+from networks import DISH
+
+
+def read_file(path) -> str:
+    with open(str(path)) as text_file:
+        return text_file.read()
+
+
+def test_link_hit_miss_hit(tmp_path):
+    cache = ConversionCache(str(tmp_path / 'cache'), link=True)
+    output = str(tmp_path / 'dish.idp')
+    converter = DMNConverter(cache=cache)
+    converter.read(DISH)
+    converter.print_meta(output)
+    meta = read_file(output)
+    converter.print_meta(output)
+    # a miss writes the inductive representation over an output linked to the meta entry
+    converter.print_inductive(output)
+    inductive = read_file(output)
+    converter.print_meta(output)
+    assert read_file(output) == meta
+    converter.print_inductive(output)
+    assert read_file(output) == inductive
+    assert (cache.stats.hits, cache.stats.misses) == (3, 2)
+
+
+def test_running_size(tmp_path):
+    output = tmp_path / 'output.idp'
+    cache = ConversionCache(str(tmp_path / 'cache'), max_bytes=250)
+    for number in range(5):
+        output.write_text(str(number) * 100)
+        cache.store(ConversionCache.key(str(number).encode(), 'test'), str(output))
+        assert cache.size <= 250
+    sizes = [os.path.getsize(os.path.join(directory, name))
+             for (directory, _, names) in os.walk(str(tmp_path / 'cache')) for name in names]
+    # only two entries fit
+    assert sizes == [100, 100]
+    assert cache.size == 200
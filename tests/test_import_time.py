@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+from benchmarks.bench_import_time import FORBIDDEN, check_module
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('module', sorted(FORBIDDEN))
+def test_forbidden_imports(module, monkeypatch):
+    # the modules are imported in a new interpreter, which has to find the package
+    monkeypatch.chdir(ROOT)
+    assert check_module(module, FORBIDDEN[module], 1)['violations'] == []
@@ -0,0 +1,35 @@
+import io
+import re
+
+from dmnconverter.converter import DMNConverter
+
+from networks import network_xml
+
+OUTPUTS = ['print_inductive', 'print_implicative', 'print_meta']
+
+
+def convert(converter: DMNConverter, file_name: str, output: str) -> str:
+    converter.read(file_name)
+    result = io.StringIO()
+    getattr(converter, output)(result)
+    return result.getvalue()
+
+
+def test_incremental_is_fresh(tmp_path):
+    network = network_xml(10, 6, seed=1)
+    # a changed rule, a removed table, a duplicated table and the original network again
+    changes = [network.replace('<text>"Fall"</text>', '<text>"Spring"</text>', 1),
+               re.sub(r'<decision id="d4".*?</decision>', '', network, flags=re.DOTALL),
+               network.replace('</definitions>', re.search(r'<decision id="d2".*?</decision>', network, re.DOTALL)
+                               .group(0).replace('id="d2"', 'id="copy"') + '</definitions>'),
+               network]
+    assert network not in changes[:3]
+    for output in OUTPUTS:
+        incremental = DMNConverter(incremental=True)
+        for (number, changed) in enumerate([network] + changes):
+            file_name = tmp_path / ('network' + str(number) + '.dmn')
+            file_name.write_text(changed)
+            assert convert(incremental, str(file_name), output) == convert(DMNConverter(), str(file_name), output)
+        converter = next(iter(incremental.converters.values()))
+        # only the changed tables were converted again
+        assert converter.fragments.reused > 0
@@ -0,0 +1,25 @@
+import time
+
+from dmnconverter.tools.instrument import Instrument
+
+
+def slow_items(amount: int):
+    for number in range(amount):
+        time.sleep(0.01)
+        yield number
+
+
+def test_generator_stage():
+    records = []
+    instrument = Instrument(records.append)
+    with instrument.stage('write'):
+        items = instrument.call('items', 'Table', slow_items, 3)
+        assert records == []
+        for _ in items:
+            # the consumer is not measured
+            time.sleep(0.05)
+    (stage, write) = records
+    assert stage.path == ('write', 'items[Table]')
+    assert stage.counts == {'items': 3}
+    assert 0.03 <= stage.wall < 0.1
+    assert write.wall >= 0.18
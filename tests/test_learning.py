@@ -0,0 +1,68 @@
+import io
+import random
+import re
+
+import pytest
+
+from dmnconverter.converter import DMNConverter
+from dmnconverter.evaluate.engine import TableEvaluator
+from dmnconverter.learning.induction import induce_table
+from dmnconverter.read.XML import read_tables
+from dmnconverter.tools import conditions
+from dmnconverter.tools.decisiontable import DecisionTable
+
+from networks import DISH
+
+
+def sample_inputs(dmn_table: DecisionTable, generator: random.Random) -> dict:
+    return {label: generator.randint(-2, 14) if type_ref == 'integer' else
+            generator.choice(conditions.domain_values(type_ref, values))
+            for (label, (type_ref, values)) in dmn_table.input_label_dict.items()}
+
+
+def dish_examples(amount: int) -> (DecisionTable, list):
+    """The dish table and examples of its outputs for random inputs, where a rule is triggered"""
+    dish = read_tables(DISH)[0]
+    # rules 4 and 7 of the unique table overlap, the first of them decides
+    dish.hit_policy = 'first'
+    evaluator = TableEvaluator(dish)
+    generator = random.Random(0)
+    examples = []
+    for _ in range(amount):
+        inputs = sample_inputs(dish, generator)
+        outputs = evaluator.evaluate(inputs)
+        if outputs is not None:
+            examples.append((inputs, outputs))
+    return dish, examples
+
+
+def as_strings(outputs: dict) -> dict:
+    return None if outputs is None else {label: str(value) for (label, value) in outputs.items()}
+
+
+def test_induced_rules_agree_with_examples():
+    (dish, examples) = dish_examples(400)
+    for hit_policy in ['unique', 'first']:
+        given = DecisionTable(dish.ontology, dish.table_name, hit_policy, dish.input_label_dict,
+                              dish.output_label_dict, list(dish.input_rule_comp)[:3], list(dish.output_rule_comp)[:3])
+        (learned, report) = induce_table(given, examples)
+        assert list(learned.input_rule_comp)[:3] == list(given.input_rule_comp)
+        assert report.amount_given == 3
+        evaluator = TableEvaluator(learned)
+        for (inputs, outputs) in examples:
+            assert as_strings(evaluator.evaluate(inputs)) == as_strings(outputs)
+
+
+def test_warm_start_operators():
+    (dish, _) = dish_examples(0)
+    converter = DMNConverter()
+    converter.read(DISH)
+    output = io.StringIO()
+    with pytest.warns(UserWarning):
+        converter.learn_table(output, warm_start=dish)
+    operators = set(re.search(r'Operator constructed from \{(.*)\}', output.getvalue()).group(1).replace(' ', '')
+                    .split(','))
+    (rule_in,) = [line for line in output.getvalue().splitlines() if line.strip().startswith('RuleIn<ct>')]
+    used = {component.split(',')[3] for component in rule_in.split('{')[1].rstrip('} ').split(';')}
+    assert {operator.rstrip('()') for operator in used} <= operators
+    assert 'grt()' in used
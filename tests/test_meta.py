@@ -0,0 +1,65 @@
+import io
+import re
+
+from dmnconverter.converter import DMNConverter
+from dmnconverter.tools.ranges import IntegerRanges
+
+from networks import DISH, network_xml, write_network
+
+
+def print_meta(file_name: str, **options) -> str:
+    converter = DMNConverter(**options)
+    converter.read(file_name)
+    output = io.StringIO()
+    converter.print_meta(output)
+    return output.getvalue()
+
+
+def structure_lines(output: str, predicate: str) -> [str]:
+    return [line.strip() for line in output.splitlines() if line.strip().startswith(predicate + ' =')]
+
+
+def test_model_ints_of_network(tmp_path):
+    file_name = write_network(tmp_path, 'network', 20, 8)
+    converter = DMNConverter()
+    converter.read(file_name)
+    for compress in [False, True]:
+        output = print_meta(file_name, compress=compress)
+        expected = IntegerRanges(converter.dmn_tables).model_ints(compress)
+        assert structure_lines(output, 'ModelInt') == ['ModelInt = {' + ';'.join(expected) + '}']
+        # the structure dictionaries of the incremental conversion are built one table at a time
+        assert print_meta(file_name, compress=compress, incremental=True) == output
+
+
+def test_incremental_encoding(tmp_path):
+    network = network_xml(12, 6)
+    # a label renamed, a table removed and a new value, each changing the codes of the symbols after them
+    changes = [network.replace('label="Level 5"', 'label="Depth 5"'),
+               re.sub(r'<decision id="d3".*?</decision>', '', network, flags=re.DOTALL),
+               network.replace('"Winter","Summer"', '"Winter","Monsoon","Summer"', 1)]
+    incremental = DMNConverter(incremental=True, encode=True)
+    for (number, changed) in enumerate([network] + changes + [network]):
+        file_name = tmp_path / ('network' + str(number) + '.dmn')
+        file_name.write_text(changed)
+        incremental.read(str(file_name))
+        output = io.StringIO()
+        incremental.print_meta(output)
+        assert output.getvalue() == print_meta(str(file_name), incremental=True, encode=True)
+
+
+def test_compressed_domains(tmp_path):
+    for file_name in [write_network(tmp_path, 'network', 6, 8), DISH]:
+        converter = DMNConverter()
+        converter.read(file_name)
+        ranges = IntegerRanges(converter.dmn_tables)
+        output = print_meta(file_name, compress=True)
+        # values of the integer variables allowed by Domain and Range
+        allowed = dict()
+        for predicate in ['Domain', 'Range']:
+            (line,) = structure_lines(output, predicate)
+            for element in line.split('{')[1].rstrip('}').split(';'):
+                (label, *values) = element.strip().split(',')
+                if label.strip('"') in ranges.labels():
+                    allowed.setdefault(label.strip('"'), []).extend(range(int(values[0]), int(values[-1]) + 1))
+        assert allowed == {label: ranges.points(label) for label in ranges.labels()}
+    assert '"Kinderen",1,6' in structure_lines(output, 'Range')[0]
@@ -0,0 +1,30 @@
+from dmnconverter.evaluate.engine import TableEvaluator
+from dmnconverter.read.XML import read_tables
+from dmnconverter.tools.decisiontable import DecisionTable
+from dmnconverter.tools.ranges import IntegerRanges
+from dmnconverter.transform.minimize import minimize_table
+
+from networks import DISH, input_space, write_network
+
+
+def outcome(evaluator: TableEvaluator, inputs: dict):
+    """Outputs of the table, or 'overlap' if rules of a unique table overlap"""
+    try:
+        outputs = evaluator.evaluate(inputs)
+    except ValueError:
+        return 'overlap'
+    return None if outputs is None else {label: str(value) for (label, value) in outputs.items()}
+
+
+def test_minimized_tables_evaluate_the_same(tmp_path):
+    tables = read_tables(DISH) + read_tables(write_network(tmp_path, 'network', 16, 12))
+    for dmn_table in tables:
+        for hit_policy in ['unique', 'first']:
+            table = DecisionTable(dmn_table.ontology, dmn_table.table_name, hit_policy, dmn_table.input_label_dict,
+                                  dmn_table.output_label_dict, list(dmn_table.input_rule_comp),
+                                  list(dmn_table.output_rule_comp))
+            (minimized, report) = minimize_table(table)
+            assert len(minimized.input_rule_comp) <= len(table.input_rule_comp)
+            (original, result) = (TableEvaluator(table), TableEvaluator(minimized))
+            for inputs in input_space(table, IntegerRanges([table])):
+                assert outcome(result, inputs) == outcome(original, inputs), (table.table_name, hit_policy, inputs)
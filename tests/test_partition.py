@@ -0,0 +1,33 @@
+from dmnconverter.evaluate.engine import TableEvaluator
+from dmnconverter.read.XML import read_tables
+from dmnconverter.tools.ranges import IntegerRanges
+from dmnconverter.verify.partition import split_table
+
+from networks import DISH, input_space, write_network
+
+
+def in_partition(partition, value) -> bool:
+    if isinstance(partition.values, tuple):
+        return partition.values[0] <= value <= partition.values[1]
+    return value in partition.values
+
+
+def test_partitions_match_the_same_rules(tmp_path):
+    tables = read_tables(DISH) + read_tables(write_network(tmp_path, 'network', 2, 12))
+    for dmn_table in tables:
+        original = TableEvaluator(dmn_table)
+        space = input_space(dmn_table, IntegerRanges([dmn_table]))
+        for label in dmn_table.input_labels + [None]:
+            plan = split_table(dmn_table, label, parts=3)
+            evaluators = [TableEvaluator(partition.table) for partition in plan.partitions]
+            for inputs in space:
+                parts = [number for (number, partition) in enumerate(plan.partitions)
+                         if in_partition(partition, inputs[plan.label])]
+                if not parts:
+                    # beyond the bounds of the splitting input
+                    continue
+                (part,) = parts
+                partition = plan.partitions[part]
+                matching = [partition.original_rule(rule_nr + 1) - 1
+                            for rule_nr in evaluators[part].matching_rules(inputs)]
+                assert matching == original.matching_rules(inputs), (dmn_table.table_name, plan.label, inputs)
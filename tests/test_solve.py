@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+import time
+
+from dmnconverter.solve.models import amount_models, parse_models, parse_symbol
+from dmnconverter.solve.runner import SolverRunner
+
+FAKE_SOLVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_solver.py')
+
+
+def fake_runner(**options) -> SolverRunner:
+    return SolverRunner(sys.executable, [FAKE_SOLVER], **options)
+
+
+def write_program(directory, name: str, *lines: str) -> str:
+    path = os.path.join(str(directory), name + '.idp')
+    with open(path, 'w') as program_file:
+        program_file.write('\n'.join(lines + ('procedure main(){}',)) + '\n')
+    return path
+
+
+def test_parse_models():
+    output = '\n'.join(['Number of models: 1.',
+                        'Model 1',
+                        '=======',
+                        'structure  : V {',
+                        '  Count = -4',
+                        '  Policy = first',
+                        '  Domain = { "Age"; "Season" }',
+                        '  RuleIn = { 1,1,"Age",geq,-5; 2,1,"Season",eq,"Fall" }',
+                        '  Range = {',
+                        '    "Age",-10,20',
+                        '  }',
+                        '  VarValue = { "Age"->-7; "Season"->"Fall" }',
+                        '  Score = { 1,"Age"->-1; 2,"Age"->3 }',
+                        '}'])
+    (model,) = parse_models(output)
+    assert model['Count'] == -4
+    assert model['Policy'] == 'first'
+    assert model['Domain'] == {'Age', 'Season'}
+    assert model['RuleIn'] == {(1, 1, 'Age', 'geq', -5), (2, 1, 'Season', 'eq', 'Fall')}
+    assert model['Range'] == {('Age', -10, 20)}
+    assert model['VarValue'] == {'Age': -7, 'Season': 'Fall'}
+    assert model['Score'] == {(1, 'Age'): -1, (2, 'Age'): 3}
+    assert amount_models(output) == 1
+
+
+def test_parse_symbol_empty_and_unsatisfiable():
+    assert parse_symbol('{ }') == set()
+    assert parse_models('Number of models: 0.') == []
+    assert amount_models('no models reported') is None
+
+
+def test_done(tmp_path):
+    program = write_program(tmp_path, 'done')
+    with fake_runner(workers=2) as runner:
+        (result,) = runner.run([program])
+    assert result.status == 'done'
+    assert result.returncode == 0
+    assert result.satisfiable
+    assert [model['VarValue'] for model in result.models] == [{'Guest_Count': 9, 'Season': 'Fall'},
+                                                              {'Guest_Count': -3, 'Season': 'Winter'}]
+    assert result.models[1]['CountTriggers'] == -2
+
+
+def test_unsatisfiable_through_pipe(tmp_path):
+    program = write_program(tmp_path, 'unsat', '// unsat')
+    with fake_runner(pipe=True) as runner:
+        (result,) = runner.run([program])
+    assert result.status == 'done'
+    assert result.satisfiable is False
+    assert result.models == []
+
+
+def test_timeout(tmp_path):
+    fast = write_program(tmp_path, 'fast')
+    slow = write_program(tmp_path, 'slow', '// sleep 30')
+    start = time.perf_counter()
+    with fake_runner(workers=2, timeout=1) as runner:
+        results = list(runner.run([fast, slow]))
+    assert time.perf_counter() - start < 20
+    assert [result.status for result in results] == ['done', 'timeout']
+    assert results[1].returncode is None
+    assert results[1].satisfiable is None
+
+
+def test_cancelled(tmp_path):
+    running = write_program(tmp_path, 'running', '// sleep 30')
+    waiting = write_program(tmp_path, 'waiting', '// sleep 30')
+    start = time.perf_counter()
+    with fake_runner(workers=1) as runner:
+        futures = [runner.submit(running), runner.submit(waiting)]
+        time.sleep(0.5)
+        runner.cancel()
+        results = [future.result() for future in futures]
+    assert time.perf_counter() - start < 20
+    assert [result.status for result in results] == ['cancelled', 'cancelled']
+
+
+def test_back_pressure(tmp_path):
+    programs = [write_program(tmp_path, 'program' + str(index), '// sleep 1') for index in range(2)]
+    submitted = []
+    with fake_runner(workers=1, max_pending=1) as runner:
+        def submit_all():
+            for program in programs:
+                runner.submit(program)
+                submitted.append(time.perf_counter())
+
+        start = time.perf_counter()
+        thread = threading.Thread(target=submit_all)
+        thread.start()
+        time.sleep(0.5)
+        # the second program waits for the first one to finish before it can be submitted
+        assert len(submitted) == 1
+        thread.join()
+    assert submitted[1] - start >= 0.9
+
+
+def test_missing_executable(tmp_path):
+    program = write_program(tmp_path, 'missing')
+    with SolverRunner(os.path.join(str(tmp_path), 'no-solver')) as runner:
+        (result,) = runner.run([program])
+    assert result.status == 'error'
+    assert result.satisfiable is None